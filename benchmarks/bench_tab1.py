@@ -0,0 +1,219 @@
+# benchmarks/bench_tab1.py
+# Бенчмарк таблицы инвентаря (Tab1): заполнение, фильтры, сортировки по заголовкам, пакеты продаж.
+#   python benchmarks/bench_tab1.py --sizes 1000,10000,50000 --output tab1.json
+#   python benchmarks/bench_tab1.py --cassette session.cassette
+# Результат - JSON со временем этапов (min/median по --repeat запускам), RSS и числом виджетов.
+import gc
+import sys
+import time
+import random
+import argparse
+
+import harness
+
+FILTERS = {
+    "name": {"name_filter": "ak-47"},
+    "sticker": {"sticker_filter": "crown"},
+    "float": {"float_min_filter": "0.15", "float_max_filter": "0.38"},
+    "rarity": {"selected_rarities": {4}},
+    "condition": {"selected_conditions": {"Field-Tested"}},
+    "collection": {"test_line_edit": "phoenix collection"},
+    "account": {"selected_api_keys": "first"},
+    "combined": {"name_filter": "ak-47", "float_min_filter": "0.15", "selected_rarities": {4, 5}},
+}
+
+SORTS = [(0, "name"), (2, "float"), (3, "days_on_sale"), (4, "price")]
+
+
+def count_widgets(tab):
+    """Число виджетов; стикеры и цены рисуются делегатами, поэтому виджетов в ячейках быть не должно."""
+    from PyQt6.QtWidgets import QApplication
+    table = tab.inventory_table
+    rows = table.rowCount()
+    return {
+        "total": len(QApplication.allWidgets()),
+        "cell_widgets": sum(1 for row in range(rows) for column in range(table.columnCount())
+                            if table.cellWidget(row, column) is not None),
+    }
+
+
+def visible_rows(tab):
+    table = tab.inventory_table
+    return sum(1 for row in range(table.rowCount()) if not table.isRowHidden(row))
+
+
+def set_filter(tab, values, api_keys):
+    """Значения фильтров как после ввода пользователя; таймер отложенной фильтрации не запускается."""
+    for name, value in values.items():
+        if name in ("selected_rarities", "selected_conditions"):
+            setattr(tab, name, set(value))
+        elif name == "selected_api_keys":
+            tab.selected_api_keys = {api_keys[0]}
+        else:
+            getattr(tab, name).setText(value)
+    tab.filter_timer.stop()
+
+
+def clear_filters(tab):
+    for name in ("name_filter", "sticker_filter", "float_min_filter", "float_max_filter", "test_line_edit"):
+        getattr(tab, name).clear()
+    tab.selected_rarities = set()
+    tab.selected_conditions = set()
+    tab.selected_api_keys = None
+    tab.filter_timer.stop()
+
+
+def seed_sticker_pixmaps(tab, accounts):
+    """Заранее готовые картинки стикеров: замер не зависит от сети и кэша картинок."""
+    from PyQt6.QtGui import QPixmap, QColor
+    pixmap = QPixmap(20, 20)
+    pixmap.fill(QColor("gray"))
+    for _, _, inventory, _ in accounts:
+        for raw in inventory:
+            for sticker in raw.get("stickers") or ():
+                if sticker.get("icon_url"):
+                    tab.sticker_pixmaps[sticker["icon_url"]] = pixmap
+
+
+def run(app, accounts, repeat, sold_batches, seed):
+    from modules.ui_tab1 import Tab1
+
+    api_keys = [api_key for api_key, _, _, _ in accounts]
+    result = {
+        "items": sum(len(inventory) for _, _, inventory, _ in accounts),
+        "accounts": len(accounts),
+        "listed": sum(len(stall) for _, _, _, stall in accounts),
+        "stickers": sum(len(raw.get("stickers") or ()) for _, _, inventory, _ in accounts for raw in inventory),
+        "rss_mb": {"start": harness.rss_mb()},
+        "stages": {},
+    }
+    stages = result["stages"]
+
+    tab = Tab1(api_keys, harness.ICON_PATH, None)
+    tab.resize(1400, 900)
+    tab.show()
+    app.processEvents()
+    seed_sticker_pixmaps(tab, accounts)
+    # Итоговое окно операций модальное; в бенчмарке замеряется только обновление строк
+    tab.show_grouped_operations = lambda operations: None
+
+    for api_key, user_info, inventory, stall in accounts:
+        tab.user_infos[api_key] = dict(user_info, api_key=api_key)
+        tab.stalls[api_key] = stall
+        tab.apply_stall(stall)
+        tab.inventory.add_items(inventory, api_key)
+    result["rss_mb"]["data"] = harness.rss_mb()
+
+    # Заполнение: вызов populate_inventory_table и раскладка/отрисовка в цикле событий
+    populate, layout = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        tab.populate_inventory_table()
+        middle = time.perf_counter()
+        app.processEvents()
+        populate.append(middle - started)
+        layout.append(time.perf_counter() - middle)
+    stages["populate"] = harness.summarize(populate)
+    stages["populate_layout"] = harness.summarize(layout)
+    result["rss_mb"]["populated"] = harness.rss_mb()
+    result["widgets"] = count_widgets(tab)
+
+    def filtered(values):
+        set_filter(tab, values, api_keys)
+        tab.apply_filters()
+        app.processEvents()
+
+    def cleared():
+        clear_filters(tab)
+        tab.apply_filters()
+        app.processEvents()
+
+    filters = stages["filters"] = {}
+    for name, values in FILTERS.items():
+        filters[name] = harness.measure(lambda: filtered(values), repeat, setup=cleared)
+        filters[name]["visible"] = visible_rows(tab)
+        filters[name]["clear"] = harness.measure(cleared, repeat, setup=lambda: filtered(values))
+
+    # Каждый щелчок меняет направление сортировки, поэтому повторы чередуют возрастание и убывание
+    sorts = stages["sorts"] = {}
+    for column, name in SORTS:
+        sorts[name] = harness.measure(lambda: (tab.handle_header_click(column), app.processEvents()), repeat)
+
+    # Пакеты продаж: handle_sell_result для ещё не выставленных предметов
+    rng = random.Random(seed)
+    unlisted = [item.asset_id for item in tab.inventory if item.asset_id not in tab.stall_by_asset]
+    rng.shuffle(unlisted)
+    sold = stages["sold_batches"] = {}
+    next_listing = [0]
+
+    def sell(batch):
+        items = []
+        for asset_id in batch:
+            next_listing[0] += 1
+            items.append((asset_id, tab.inventory.get(asset_id).name, 1000 + next_listing[0],
+                          f"bench-listing-{next_listing[0]}"))
+        tab.handle_sell_result({'sold': items, 'error': None, 'already_listed': []})
+        app.processEvents()
+
+    for size in sold_batches:
+        batches = []
+        for _ in range(repeat):
+            if len(unlisted) < size:
+                break
+            batches.append([unlisted.pop() for _ in range(size)])
+        if batches:
+            samples = []
+            for batch in batches:
+                started = time.perf_counter()
+                sell(batch)
+                samples.append(time.perf_counter() - started)
+            sold[str(size)] = harness.summarize(samples)
+
+    result["rss_mb"]["end"] = harness.rss_mb()
+    result["peak_rss_mb"] = harness.peak_rss_mb()
+
+    tab.hide()
+    tab.deleteLater()
+    app.processEvents()
+    gc.collect()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the inventory table (Tab1) under the offscreen platform.")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated synthetic inventory sizes")
+    parser.add_argument("--accounts", type=int, default=5, help="Accounts the synthetic items are split between")
+    parser.add_argument("--listed", type=float, default=0.1, help="Share of synthetic items on sale")
+    parser.add_argument("--stickers", type=int, choices=range(0, 6),
+                        help="Stickers on every synthetic item (default: mixed, 30%% of items with 1-4)")
+    parser.add_argument("--sold-batches", default="100,1000", help="Comma-separated update_item_as_sold batch sizes")
+    harness.add_common_arguments(parser)
+    args = parser.parse_args(argv)
+
+    app = harness.start_qt()
+    sold_batches = [int(size) for size in args.sold_batches.split(",") if size]
+    report = {"benchmark": "tab1", "environment": harness.environment(), "repeat": args.repeat, "runs": []}
+
+    if args.cassette:
+        report["source"] = {"cassette": args.cassette}
+        accounts = [(api_key, user_info, data["inventory"], data["stall"])
+                    for api_key, user_info, data in harness.replayed_accounts(args.cassette)]
+        if not accounts:
+            print("No accounts with recorded data in the cassette.", file=sys.stderr)
+            return 2
+        report["runs"].append(run(app, accounts, args.repeat, sold_batches, args.seed))
+    else:
+        report["source"] = {"synthetic": {"accounts": args.accounts, "listed": args.listed,
+                                          "stickers": args.stickers, "seed": args.seed}}
+        for size in (int(size) for size in args.sizes.split(",") if size):
+            accounts = harness.synthetic_accounts(size, max(min(args.accounts, size), 1), args.listed,
+                                                  args.stickers, args.seed)
+            print(f"Tab1: {size} items...", file=sys.stderr)
+            report["runs"].append(run(app, accounts, args.repeat, sold_batches, args.seed))
+
+    harness.write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+# benchmarks/bench_tab2.py
+# Бенчмарк вкладки Buy Orders (Tab2): разбор выражений, описания ордеров, поиск по справочнику, заполнение модели.
+#   python benchmarks/bench_tab2.py --orders 5000 --output tab2.json
+#   python benchmarks/bench_tab2.py --cassette session.cassette
+# Результат - JSON со временем и скоростью этапов (min/median по --repeat запускам) по видам ордеров и память.
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+import harness
+
+from modules import expressions
+from modules.expressions import DescriptionCache
+from modules.mock_server import ID_BASE, WEARS, iso_time
+
+# Виды ордеров от простых к сложным
+KINDS = ["market_hash_name", "simple", "stickers", "multi_def", "complex"]
+
+
+def skin_condition(pair):
+    return f"(DefIndex == {pair[0]} and PaintIndex == {pair[1]})"
+
+
+def sticker_condition(sticker_id, rng):
+    slot = rng.choice([-1, 0, 1, 2, 3])
+    if rng.random() < 0.3:
+        return f"HasSticker({sticker_id}, {slot}, {rng.randint(2, 4)})"
+    return f"HasSticker({sticker_id}, {slot})" if slot != -1 else f"HasSticker({sticker_id})"
+
+
+def float_condition(rng):
+    low = round(rng.uniform(0, 0.5), 4)
+    return f"FloatValue >= {low} and FloatValue < {round(low + rng.uniform(0.001, 0.2), 4)}"
+
+
+def make_expression(kind, catalog, rng):
+    """Выражение ордера вида kind со скинами и стикерами из справочника."""
+    pairs, sticker_ids = catalog
+    if kind == "simple":
+        return f"{skin_condition(rng.choice(pairs))} and {float_condition(rng)}"
+    if kind == "stickers":
+        stickers = " and ".join(sticker_condition(sticker_id, rng)
+                                for sticker_id in rng.sample(sticker_ids, rng.randint(3, 5)))
+        return f"{skin_condition(rng.choice(pairs))} and {stickers}"
+    if kind == "multi_def":
+        skins = " or ".join(skin_condition(pair) for pair in rng.sample(pairs, rng.randint(5, 12)))
+        stattrak = " and StatTrak" if rng.random() < 0.3 else ""
+        return f"({skins}){stattrak} and {float_condition(rng)}"
+    # complex: несколько скинов, альтернативы стикеров, паттерн, редкость; изредка противоречивые условия
+    skins = " or ".join(skin_condition(pair) for pair in rng.sample(pairs, rng.randint(3, 8)))
+    stickers = " and ".join(
+        "(" + " or ".join(sticker_condition(sticker_id, rng) for sticker_id in rng.sample(sticker_ids, 2)) + ")"
+        for _ in range(rng.randint(2, 4)))
+    flags = " and StatTrak and Souvenir" if rng.random() < 0.05 else ""
+    return (f"({skins}) and {stickers} and PaintSeed == {rng.randint(0, 1000)} and Rarity == {rng.randint(1, 6)}"
+            f" and {float_condition(rng)}{flags}")
+
+
+def synthetic_orders(count, kinds, seed, catalog):
+    """Ордера как из API get_buy_orders: виды kinds поровну, уникальные выражения."""
+    rng = random.Random(seed)
+    skins = list(catalog.skins_by_pair.values())
+    source = (list(catalog.skins_by_pair), list(catalog.stickers_by_id))
+    now = time.time()
+    orders = []
+    for index in range(count):
+        kind = kinds[index % len(kinds)]
+        order = {"id": str(ID_BASE + index), "created_at": iso_time(now - rng.uniform(0, 90 * 86400)),
+                 "qty": rng.randint(1, 5), "price": rng.randint(3, 500000)}
+        if kind == "market_hash_name":
+            order["market_hash_name"] = f"{rng.choice(skins).name} ({rng.choice(WEARS)[0]})"
+        else:
+            order["expression"] = make_expression(kind, source, rng)
+        orders.append(order)
+    rng.shuffle(orders)
+    return orders
+
+
+def order_kind(order):
+    """Вид ордера по содержимому, одинаково для синтетических и записанных ордеров."""
+    expression = order.get("expression")
+    if not expression:
+        return "market_hash_name"
+    skins = expression.count("DefIndex")
+    if "HasSticker" in expression:
+        return "complex" if skins > 1 else "stickers"
+    return "multi_def" if skins > 1 else "simple"
+
+
+def reset_caches(tab, path):
+    """Холодный запуск: пустые кэши разбора выражений и новый дисковый кэш описаний."""
+    expressions.parse.cache_clear()
+    expressions.summarize.cache_clear()
+    if os.path.exists(path):
+        os.remove(path)
+    tab.description_cache = DescriptionCache(tab.catalog.version, path)
+
+
+def summary_references(expression_list):
+    """Пары (DefIndex, PaintIndex) и id стикеров, которые ищутся в справочнике при построении описаний."""
+    pairs, sticker_ids = [], []
+    for expression in expression_list:
+        try:
+            summary = expressions.summarize(expression)
+        except expressions.ExpressionError:
+            continue
+        pairs.extend(summary.skins)
+        sticker_ids.extend(sticker_id for sticker_id, _, _ in summary.stickers)
+    return pairs, sticker_ids
+
+
+def run(app, accounts, repeat):
+    from modules.ui_tab2 import Tab2
+
+    api_keys = [api_key for api_key, _ in accounts]
+    all_orders = [order for _, orders in accounts for order in orders]
+    by_kind = {}
+    for order in all_orders:
+        by_kind.setdefault(order_kind(order), []).append(order)
+    result = {
+        "orders": len(all_orders),
+        "accounts": len(accounts),
+        "kinds": {kind: len(by_kind[kind]) for kind in KINDS if kind in by_kind},
+        "rss_mb": {"start": harness.rss_mb()},
+        "stages": {},
+    }
+    stages = result["stages"]
+
+    tab = Tab2(api_keys, harness.ICON_PATH, None)
+    tab.resize(1400, 900)
+    tab.show()
+    app.processEvents()
+    cache_path = os.path.join(tempfile.mkdtemp(prefix="csfloat-bench-"), "expression_descriptions.json")
+    reset_caches(tab, cache_path)
+    result["rss_mb"]["catalog"] = harness.rss_mb()
+
+    expression_kinds = {kind: [order["expression"] for order in by_kind[kind]]
+                        for kind in KINDS[1:] if kind in by_kind}
+
+    def cold():
+        reset_caches(tab, cache_path)
+
+    # Разбор и описание по видам: холодный (пустые кэши) и повторный (кэш описаний заполнен)
+    parse = stages["parse_expression"] = {}
+    names = stages["generate_item_name"] = {}
+    names_cached = stages["generate_item_name_cached"] = {}
+    for kind, expression_list in expression_kinds.items():
+        parse[kind] = harness.throughput(harness.measure(
+            lambda: [tab.parse_expression(expression) for expression in expression_list], repeat, setup=cold),
+            len(expression_list))
+        names[kind] = harness.throughput(harness.measure(
+            lambda: [tab.generate_item_name(expression) for expression in expression_list], repeat, setup=cold),
+            len(expression_list))
+        names_cached[kind] = harness.throughput(harness.measure(
+            lambda: [tab.generate_item_name(expression) for expression in expression_list], repeat),
+            len(expression_list))
+
+    # Поиск по справочнику: те же обращения, что делает построение описаний
+    pairs, sticker_ids = summary_references(
+        [expression for expression_list in expression_kinds.values() for expression in expression_list])
+    if pairs:
+        stages["find_skin_name"] = harness.throughput(harness.measure(
+            lambda: [tab.find_skin_name(*pair) for pair in pairs], repeat), len(pairs))
+    if sticker_ids:
+        stages["find_sticker_info"] = harness.throughput(harness.measure(
+            lambda: [tab.find_sticker_info(sticker_id) for sticker_id in sticker_ids], repeat), len(sticker_ids))
+
+    # Заполнение модели всеми аккаунтами с отрисовкой таблицы; запись кэша описаний замеряется отдельно
+    def handle_all():
+        for api_key, orders in accounts:
+            tab.handle_buy_orders_result({'api_key': api_key, 'buy_orders': orders})
+        app.processEvents()
+
+    def cold_model():
+        tab.model.clear()
+        cold()
+
+    handle = stages["handle_buy_orders_result"] = harness.throughput(
+        harness.measure(handle_all, repeat, setup=cold_model), len(all_orders))
+    result["rss_mb"]["rows"] = harness.rss_mb()
+    handle["cached"] = harness.throughput(
+        harness.measure(handle_all, repeat, setup=tab.model.clear), len(all_orders))
+    handle["traced_peak_mb"] = harness.traced_peak_mb(handle_all, setup=cold_model)
+    handle["rows"] = tab.model.rowCount()
+    handle["errors"] = sum(1 for row in range(tab.model.rowCount()) if tab.model.order_at(row).has_error)
+
+    # Отложенная запись кэша описаний после загрузки всех аккаунтов
+    stages["save_description_cache"] = harness.measure(tab.save_description_cache, repeat,
+                                                       setup=lambda: (cold_model(), handle_all()))
+    result["description_cache_kb"] = round(os.path.getsize(cache_path) / 1024, 1) if os.path.exists(cache_path) \
+        else 0
+
+    result["rss_mb"]["end"] = harness.rss_mb()
+    result["peak_rss_mb"] = harness.peak_rss_mb()
+
+    tab.hide()
+    tab.deleteLater()
+    app.processEvents()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the buy orders tab (Tab2) under the offscreen platform.")
+    parser.add_argument("--orders", default="5000", help="Comma-separated synthetic order counts per run")
+    parser.add_argument("--accounts", type=int, default=1, help="Accounts the synthetic orders are split between")
+    parser.add_argument("--kinds", default=",".join(KINDS),
+                        help=f"Comma-separated order kinds, mixed evenly (default: {','.join(KINDS)})")
+    harness.add_common_arguments(parser)
+    args = parser.parse_args(argv)
+
+    kinds = [kind for kind in args.kinds.split(",") if kind]
+    unknown = set(kinds) - set(KINDS)
+    if unknown or not kinds:
+        parser.error(f"Unknown order kinds: {', '.join(sorted(unknown))}" if unknown else "No order kinds given")
+
+    app = harness.start_qt()
+    report = {"benchmark": "tab2", "environment": harness.environment(), "repeat": args.repeat, "runs": []}
+
+    if args.cassette:
+        report["source"] = {"cassette": args.cassette}
+        accounts = [(api_key, data["buy_orders"])
+                    for api_key, _, data in harness.replayed_accounts(args.cassette, parts=("buy_orders",))
+                    if data["buy_orders"]]
+        if not accounts:
+            print("No accounts with recorded buy orders in the cassette.", file=sys.stderr)
+            return 2
+        report["runs"].append(run(app, accounts, args.repeat))
+    else:
+        from modules.catalog import get_catalog
+        catalog = get_catalog()
+        report["source"] = {"synthetic": {"accounts": args.accounts, "kinds": kinds, "seed": args.seed}}
+        for count in (int(count) for count in args.orders.split(",") if count):
+            orders = synthetic_orders(count, kinds, args.seed, catalog)
+            account_count = max(min(args.accounts, count), 1)
+            accounts = [(f"bench-key-{number + 1}", orders[number::account_count]) for number in range(account_count)]
+            print(f"Tab2: {count} orders...", file=sys.stderr)
+            report["runs"].append(run(app, accounts, args.repeat))
+
+    harness.write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
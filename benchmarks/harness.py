@@ -0,0 +1,185 @@
+# benchmarks/harness.py
+# Общие части бенчмарков: offscreen Qt, отдельные QSettings, синтетические и записанные данные, замеры и отчёт.
+import os
+import sys
+import json
+import time
+import random
+import platform
+import statistics
+import tempfile
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from modules import api
+from modules.cassette import CassettePlayer, CassetteSettings, REPLAY
+from modules.mock_server import ID_BASE, STICKERS, base_price, iso_time, make_item
+
+ICON_PATH = os.path.join(ROOT, 'utils', 'icons')
+STICKER_ICON_BASE = "bench"  # Картинки стикеров не скачиваются: pixmap подставляется заранее
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def start_qt():
+    """QApplication на платформе offscreen; файловые QSettings (Linux, macOS) - во временном каталоге, не в профиле."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QSettings
+    from PyQt6.QtWidgets import QApplication
+
+    settings_dir = tempfile.mkdtemp(prefix="csfloat-bench-")
+    for scope in (QSettings.Scope.UserScope, QSettings.Scope.SystemScope):
+        QSettings.setPath(QSettings.Format.NativeFormat, scope, settings_dir)
+        QSettings.setPath(QSettings.Format.IniFormat, scope, settings_dir)
+    QSettings.setDefaultFormat(QSettings.Format.IniFormat)
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def rss_mb():
+    """Текущий RSS процесса в МБ (Linux), иначе None."""
+    try:
+        with open("/proc/self/statm") as file:
+            return round(int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb():
+    """Пиковый RSS процесса в МБ с начала запуска, None без модуля resource."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux - килобайты, macOS - байты
+    return round(peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10, 1)
+
+
+def summarize(samples):
+    return {"min": round(min(samples), 5), "median": round(statistics.median(samples), 5),
+            "runs": [round(sample, 5) for sample in samples]}
+
+
+def measure(fn, repeat=1, setup=None):
+    """Секунды выполнения fn; setup выполняется перед каждым повтором и не входит в замер."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def traced_peak_mb(fn, setup=None):
+    """Пик памяти Python-объектов (tracemalloc) за один отдельный запуск fn; время этого запуска не замеряется."""
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def throughput(stats, count):
+    """Добавляет к замеру число операций и их скорость в секунду по медиане."""
+    stats["count"] = count
+    stats["per_second"] = round(count / stats["median"]) if stats["median"] else None
+    return stats
+
+
+def with_stickers(raw, count, rng):
+    """Заменяет стикеры предмета на count случайных (для замера стоимости ячеек со стикерами)."""
+    raw["stickers"] = []
+    for slot in range(count):
+        sticker_id, name = rng.choice(STICKERS)
+        raw["stickers"].append({"stickerId": sticker_id, "slot": slot, "name": name,
+                                "icon_url": f"{STICKER_ICON_BASE}/icons/sticker-{sticker_id}.png"})
+    return raw
+
+
+def synthetic_accounts(items, accounts=1, listed=0.1, stickers=None, seed=1):
+    """
+    Данные аккаунтов как из API: [(api_key, user_info, inventory, stall)]. Предметы те же, что у
+    modules/mock_server.py; stickers - фиксированное число стикеров у каждого предмета вместо смешанного.
+    """
+    rng = random.Random(seed)
+    result = []
+    for number in range(accounts):
+        count = items // accounts + (1 if number < items % accounts else 0)
+        inventory = [make_item(seed, number, index, STICKER_ICON_BASE) for index in range(count)]
+        if stickers is not None:
+            for raw in inventory:
+                with_stickers(raw, stickers, rng)
+        stall = []
+        now = time.time()
+        for raw in inventory:
+            if rng.random() < listed:
+                stall.append({"id": str(ID_BASE + len(stall) + number * 10 ** 7),
+                              "created_at": iso_time(now - rng.uniform(0, 30 * 86400)),
+                              "price": int(base_price(raw["market_hash_name"]) * rng.uniform(0.9, 1.3)),
+                              "type": "buy_now", "state": "listed", "item": raw})
+        user_info = {"steam_id": str(76561198000000000 + number), "username": f"bench{number + 1}"}
+        result.append((f"bench-key-{number + 1}", user_info, inventory, stall))
+    return result
+
+
+def replayed_accounts(path, parts=("inventory", "stall")):
+    """
+    Данные аккаунтов из кассеты modules/cassette.py без задержек: [(псевдоним, user_info, {часть: данные})].
+    Аккаунты без записанного /me пропускаются.
+    """
+    player = CassettePlayer(CassetteSettings(REPLAY, path, 0.0))
+    api.set_cassette(player)
+    try:
+        result = []
+        for api_key in player.api_keys():
+            user_info = api.get_user_info(api_key)
+            if not user_info:
+                continue
+            data = {}
+            if "inventory" in parts:
+                data["inventory"] = api.get_inventory_data(api_key) or []
+            if "stall" in parts:
+                data["stall"] = api.get_stall_data(api_key, user_info.get("steam_id")) or []
+            if "buy_orders" in parts:
+                data["buy_orders"] = api.get_buy_orders(api_key) or []
+            result.append((api_key, user_info, data))
+        return result
+    finally:
+        api.set_cassette(None)
+
+
+def environment():
+    from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+    return {
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "qpa": os.environ.get("QT_QPA_PLATFORM"),
+    }
+
+
+def write_report(report, path=None):
+    """JSON-отчёт в файл или stdout."""
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+def add_common_arguments(parser):
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of every stage; min and median are reported")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cassette", metavar="PATH", help="Use accounts recorded in a cassette instead of synthetic")
+    parser.add_argument("--output", metavar="PATH", help="Write the JSON report here instead of stdout")
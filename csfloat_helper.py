@@ -1,21 +1,42 @@
 # csfloat_helper.py
 import sys
-from PyQt6.QtWidgets import QApplication
-from modules.ui import SteamInventoryApp
+from modules.api import configure_api
 from modules.utils import load_config
+from modules.accounts import load_accounts
 
 def main():
+    # Режим без интерфейса и фоновый процесс синхронизации: PyQt6 не импортируется
+    if "--headless" in sys.argv[1:]:
+        from modules import cli
+        sys.exit(cli.main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+    if "--daemon" in sys.argv[1:]:
+        from modules import daemon
+        sys.exit(daemon.main([arg for arg in sys.argv[1:] if arg != "--daemon"]))
+
+    from PyQt6.QtWidgets import QApplication
+    from modules.ui import SteamInventoryApp
+    from modules.sync import load_sync_settings
+    from modules.watcher import load_watcher_settings
+    from modules.data_engine import load_engine_settings
+    from modules.daemon import load_daemon_settings
+
     app = QApplication(sys.argv)
 
-    # Загрузка конфигурации и API-ключей
+    # Загрузка конфигурации и аккаунтов ("accounts" или старый список "api_keys")
     config = load_config()
-    api_keys = config.get("api_keys", [])
+    configure_api(config)
+    accounts = load_accounts(config)
+    api_keys = [account.api_key for account in accounts]
     if not api_keys:
         print("No API keys found in the config file.")
         sys.exit(1)
 
     # Создание окна и загрузка данных
-    window = SteamInventoryApp(api_keys=api_keys)
+    window = SteamInventoryApp(api_keys=api_keys, accounts=accounts,
+                               sync_settings=load_sync_settings(config),
+                               watcher_settings=load_watcher_settings(config),
+                               engine_settings=load_engine_settings(config),
+                               daemon_settings=load_daemon_settings(config))
     window.show()
 
     sys.exit(app.exec())
@@ -0,0 +1,50 @@
+# modules/accounts.py
+from collections import namedtuple
+
+Account = namedtuple('Account', 'api_key name group tags')
+
+
+def load_accounts(config):
+    """
+    Список аккаунтов из конфигурации.
+
+    Поддерживается новый формат "accounts" (api_key, name, group, tags) и старый список "api_keys".
+    Повторяющиеся ключи пропускаются.
+    """
+    accounts = []
+    seen = set()
+    entries = list((config or {}).get("accounts") or []) + list((config or {}).get("api_keys") or [])
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"api_key": entry}
+        api_key = (entry.get("api_key") or "").strip()
+        if not api_key or api_key in seen:
+            continue
+        seen.add(api_key)
+        tags = entry.get("tags") or ()
+        if isinstance(tags, str):
+            tags = (tags,)
+        accounts.append(Account(
+            api_key=api_key,
+            name=entry.get("name") or f"Account {len(accounts) + 1}",
+            group=entry.get("group") or "",
+            tags=tuple(tags),
+        ))
+    return accounts
+
+
+def accounts_from_keys(api_keys):
+    """Аккаунты без имён и групп для списка API-ключей."""
+    return load_accounts({"api_keys": api_keys})
+
+
+def group_index(accounts):
+    """Группы и теги -> списки API-ключей, в порядке первого появления."""
+    groups = {}
+    tags = {}
+    for account in accounts:
+        if account.group:
+            groups.setdefault(account.group, []).append(account.api_key)
+        for tag in account.tags:
+            tags.setdefault(tag, []).append(account.api_key)
+    return groups, tags
@@ -1,16 +1,157 @@
+import io
 import json
+import threading
+import http.client
+import urllib.parse
 import urllib.request
 import urllib.error
 import logging
 
-# Constants for API endpoints
-API_USER_INFO = "https://csfloat.com/api/v1/me"
-API_INVENTORY = "https://csfloat.com/api/v1/me/inventory"
-API_STALL = "https://csfloat.com/api/v1/users/{steam_id}/stall?limit=999"
-LISTINGS_URL = "https://csfloat.com/api/v1/listings"
-BUY_ORDERS = "https://csfloat.com/api/v1/me/buy-orders?page=0&limit=100&order=desc"
-BUY_ORDERS_URL_TEMPLATE = "https://csfloat.com/api/v1/me/buy-orders?page={page}&limit=100&order=desc"
-BUY_ORDERS_DELETE_URL = "https://csfloat.com/api/v1/buy-orders/{order_id}"
+from modules import json_stream
+from modules.cassette import load_cassette_settings, open_cassette
+
+DEFAULT_API_BASE = "https://csfloat.com/api/v1"
+
+
+def set_api_base(base_url=None):
+    """
+    Адрес API для всех запросов модуля (параметр "api_base_url" в config.json), например локальный
+    modules/mock_server.py. Без значения - csfloat.com.
+    """
+    global API_BASE, API_USER_INFO, API_INVENTORY, API_STALL, API_STALL_PAGE, LISTINGS_URL
+    global BUY_ORDERS, BUY_ORDERS_URL_TEMPLATE, BUY_ORDERS_DELETE_URL, BUY_ORDERS_CREATE_URL
+    API_BASE = (base_url or DEFAULT_API_BASE).rstrip("/")
+    # Constants for API endpoints
+    API_USER_INFO = f"{API_BASE}/me"
+    API_INVENTORY = f"{API_BASE}/me/inventory"
+    API_STALL = f"{API_BASE}/users/{{steam_id}}/stall?limit=999"
+    API_STALL_PAGE = f"{API_BASE}/users/{{steam_id}}/stall?limit={{limit}}"
+    LISTINGS_URL = f"{API_BASE}/listings"
+    BUY_ORDERS = f"{API_BASE}/me/buy-orders?page=0&limit=100&order=desc"
+    BUY_ORDERS_URL_TEMPLATE = f"{API_BASE}/me/buy-orders?page={{page}}&limit=100&order=desc"
+    BUY_ORDERS_DELETE_URL = f"{API_BASE}/buy-orders/{{order_id}}"
+    BUY_ORDERS_CREATE_URL = f"{API_BASE}/buy-orders"
+
+
+def configure_api(config):
+    """Адрес API и кассета запросов из config.json."""
+    set_api_base((config or {}).get("api_base_url"))
+    set_cassette(open_cassette(load_cassette_settings(config)))
+
+
+def set_cassette(cassette):
+    """Запись или воспроизведение ответов (modules/cassette.py); None - обычные запросы."""
+    global _cassette
+    _cassette = cassette
+
+
+def api_config():
+    """Текущие настройки модуля в формате config.json, для configure_api в другом процессе."""
+    return {"api_base_url": API_BASE, "cassette": _cassette.settings._asdict() if _cassette else None}
+
+
+set_api_base()
+_cassette = None
+
+# Постоянные соединения (keep-alive): у каждого потока свои, по одному на хост
+_local = threading.local()
+
+# Ошибки соединения, закрытого сервером между запросами; такой запрос повторяется на новом соединении
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+# После отправки повторяются только идемпотентные запросы: POST/PATCH мог быть выполнен сервером до разрыва.
+# Запрос, который не удалось записать в сокет, повторяется при любом методе
+RETRY_METHODS = ("GET", "HEAD", "DELETE")
+# Тот же User-Agent, что добавляет urllib.request.urlopen
+USER_AGENT = f"Python-urllib/{urllib.request.__version__}"
+
+
+def _open_connection(scheme, netloc):
+    if scheme == "https":
+        return http.client.HTTPSConnection(netloc)
+    return http.client.HTTPConnection(netloc)
+
+
+class _KeepAliveResponse:
+    """Ответ постоянного соединения. Если ответ закрыт недочитанным, соединение закрывается."""
+
+    def __init__(self, response, connection):
+        self.response = response
+        self.connection = connection
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def read(self, *args):
+        return self.response.read(*args)
+
+    def close(self):
+        if not self.response.isclosed():
+            self.connection.close()
+        self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _urlopen(req):
+    if _cassette is not None:
+        return _cassette.urlopen(req, _urlopen_live)
+    return _urlopen_live(req)
+
+
+def _urlopen_live(req):
+    """
+    Замена urllib.request.urlopen, которая не открывает новое TCP/TLS-соединение на каждый запрос.
+    Ошибки те же: HTTPError для ответов вне 2xx и URLError для сетевых ошибок.
+    При настроенном прокси и для перенаправлений используется обычный urlopen.
+    """
+    if urllib.request.getproxies():
+        return urllib.request.urlopen(req)
+
+    parts = urllib.parse.urlsplit(req.full_url)
+    key = (parts.scheme, parts.netloc)
+    path = f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or '/'
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    method = req.get_method()
+    headers = dict(req.header_items())
+    if not req.has_header('User-agent'):
+        headers['User-Agent'] = USER_AGENT
+
+    for attempt in range(2):
+        connection = connections.get(key)
+        reused = connection is not None
+        if connection is None:
+            connection = connections[key] = _open_connection(*key)
+        sent = False
+        try:
+            connection.request(method, path, body=req.data, headers=headers)
+            sent = True
+            response = connection.getresponse()
+        except STALE_CONNECTION_ERRORS as e:
+            connection.close()
+            connections.pop(key, None)
+            if reused and attempt == 0 and (not sent or method in RETRY_METHODS):
+                continue
+            raise urllib.error.URLError(e) from e
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            connections.pop(key, None)
+            raise urllib.error.URLError(e) from e
+        break
+
+    if 300 <= response.status < 400 and response.status != 304:
+        response.read()
+        return urllib.request.urlopen(req)
+    if not 200 <= response.status < 300:
+        body = response.read()
+        raise urllib.error.HTTPError(req.full_url, response.status, response.reason, response.headers,
+                                     io.BytesIO(body))
+    return _KeepAliveResponse(response, connection)
 
 
 def get_user_info(api_key):
@@ -23,8 +164,8 @@ def get_user_info(api_key):
     req = urllib.request.Request(url, headers=headers)
     
     try:
-        with urllib.request.urlopen(req) as response:
-            user_info = json.load(response).get("user", {})
+        with _urlopen(req) as response:
+            user_info = json_stream.load(response).get("user", {})
             return user_info
     except urllib.error.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
@@ -33,28 +174,31 @@ def get_user_info(api_key):
         print(f"Other error occurred: {err}")
         return None
 
-def get_inventory_data(api_key):
-    url = API_INVENTORY
-    headers = {'Authorization': api_key}
-    
-    req = urllib.request.Request(url, headers=headers)
-    
+def _stream_items(response, key):
+    """Элементы массива ответа по мере получения; соединение освобождается после последнего элемента."""
+    with response:
+        yield from json_stream.iter_array(response, key)
+
+def iter_inventory_data(api_key):
+    """
+    Предметы инвентаря по мере получения ответа (массив "items" или корневой массив).
+    Возвращает итератор или None при ошибке запроса.
+    """
+    req = urllib.request.Request(API_INVENTORY, headers={'Authorization': api_key})
+
     try:
-        with urllib.request.urlopen(req) as response:
-            inventory_data = json.load(response)
-            if isinstance(inventory_data, dict) and 'items' in inventory_data:
-                return inventory_data['items']
-            elif isinstance(inventory_data, list):  # Если данные уже в списке
-                return inventory_data
-            else:
-                print("Unexpected response format.")
-                return []
+        response = _urlopen(req)
     except urllib.error.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
         return None
     except urllib.error.URLError as err:
         print(f"Other error occurred: {err}")
         return None
+    return _stream_items(response, "items")
+
+def get_inventory_data(api_key):
+    items = iter_inventory_data(api_key)
+    return list(items) if items is not None else None
 
 def get_stall_data(api_key, steam_id):
     url = API_STALL.format(steam_id=steam_id)
@@ -63,8 +207,8 @@ def get_stall_data(api_key, steam_id):
     req = urllib.request.Request(url, headers=headers)
     
     try:
-        with urllib.request.urlopen(req) as response:
-            stall_data = json.load(response).get("data", [])
+        with _urlopen(req) as response:
+            stall_data = list(json_stream.iter_array(response, "data"))
             return stall_data
     except urllib.error.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
@@ -73,6 +217,86 @@ def get_stall_data(api_key, steam_id):
         print(f"Other error occurred: {err}")
         return None
 
+def get_stall_page(api_key, steam_id, limit=5, etag=None):
+    """
+    Первая страница stall минимального размера для дешёвой проверки изменений.
+    Если передан etag и сервер ответил 304, возвращает {'not_modified': True}.
+    """
+    url = API_STALL_PAGE.format(steam_id=steam_id, limit=limit)
+    headers = {'Authorization': api_key}
+    if etag:
+        headers['If-None-Match'] = etag
+
+    req = urllib.request.Request(url, headers=headers)
+
+    try:
+        with _urlopen(req) as response:
+            page = json_stream.load(response)
+            return {
+                'not_modified': False,
+                'data': page.get("data", []),
+                'total_count': page.get("total_count"),
+                'etag': response.headers.get('ETag'),
+            }
+    except urllib.error.HTTPError as http_err:
+        if http_err.code == 304:
+            return {'not_modified': True, 'etag': etag}
+        print(f"HTTP error occurred: {http_err}")
+        return None
+    except urllib.error.URLError as err:
+        print(f"Other error occurred: {err}")
+        return None
+
+def get_listing(api_key, listing_id):
+    """
+    Лот по id, в том числе завершённый: поле "state" - "listed", "sold", "delisted" и т.д.
+    {} если лота нет (404), None при ошибке запроса.
+    """
+    url = f"{LISTINGS_URL}/{listing_id}"
+    headers = {'Authorization': api_key}
+
+    req = urllib.request.Request(url, headers=headers)
+
+    try:
+        with _urlopen(req) as response:
+            return json_stream.load(response)
+    except urllib.error.HTTPError as http_err:
+        if http_err.code == 404:
+            return {}
+        print(f"HTTP error occurred: {http_err}")
+        return None
+    except urllib.error.URLError as err:
+        print(f"Other error occurred: {err}")
+        return None
+
+def get_lowest_listings(api_key, market_hash_name, limit=3):
+    """
+    Самые дешёвые лоты buy_now с указанным market_hash_name.
+    """
+    query = urllib.parse.urlencode({
+        "market_hash_name": market_hash_name,
+        "sort_by": "lowest_price",
+        "type": "buy_now",
+        "limit": limit,
+    })
+    url = f"{LISTINGS_URL}?{query}"
+    headers = {'Authorization': api_key}
+
+    req = urllib.request.Request(url, headers=headers)
+
+    try:
+        with _urlopen(req) as response:
+            listings = json_stream.load(response)
+            if isinstance(listings, dict):
+                listings = listings.get("data", [])
+            return listings
+    except urllib.error.HTTPError as http_err:
+        print(f"HTTP error occurred: {http_err}")
+        return None
+    except urllib.error.URLError as err:
+        print(f"Other error occurred: {err}")
+        return None
+
 def sell_item(api_key, asset_id, price, marketplace="steam"):
     url = LISTINGS_URL
     data = {
@@ -88,8 +312,8 @@ def sell_item(api_key, asset_id, price, marketplace="steam"):
     req = urllib.request.Request(url, data=json.dumps(data).encode('utf-8'), headers=headers)
     
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.load(response)
+        with _urlopen(req) as response:
+            return json_stream.load(response)
     except urllib.error.HTTPError as http_err:
         if http_err.code == 400:
             error_data = json.load(http_err)
@@ -106,8 +330,8 @@ def delete_item(api_key, listing_id):
     req = urllib.request.Request(url, headers=headers, method='DELETE')
     
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.load(response)
+        with _urlopen(req) as response:
+            return json_stream.load(response)
     except urllib.error.HTTPError as http_err:
         print(f"HTTP error occurred: {http_err}")
         return None
@@ -126,8 +350,8 @@ def change_price(api_key, listing_id, new_price):
     req = urllib.request.Request(url, data=data, headers=headers, method='PATCH')
 
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.load(response)
+        with _urlopen(req) as response:
+            return json_stream.load(response)
     except urllib.error.HTTPError as http_err:
         if http_err.code == 400:
             error_data = json.load(http_err)
@@ -150,9 +374,8 @@ def get_buy_orders(api_key):
         req = urllib.request.Request(url, headers=headers)
 
         try:
-            with urllib.request.urlopen(req) as response:
-                data = json.load(response)
-                orders = data.get("orders", [])
+            with _urlopen(req) as response:
+                orders = list(json_stream.iter_array(response, "orders"))
                 all_orders.extend(orders)
 
                 # Если меньше 100 ордеров, прекращаем пагинацию
@@ -185,7 +408,7 @@ def delete_order_by_id(order_id, api_key):
     req = urllib.request.Request(url, headers=headers, method='DELETE')
 
     try:
-        with urllib.request.urlopen(req) as response:
+        with _urlopen(req) as response:
             if response.status == 200:
                 return True  # Успешное удаление
             else:
@@ -196,3 +419,35 @@ def delete_order_by_id(order_id, api_key):
     except urllib.error.URLError as err:
         print(f"Other error occurred: {err}")
         return False
+
+
+def create_buy_order(api_key, price, qty, expression=None, market_hash_name=None):
+    """
+    Создание buy order по выражению или market_hash_name. price - максимальная цена в центах.
+    Ошибки поднимаются как ValueError; у ответа 429 текст начинается с "Rate limited".
+    """
+    data = {"max_price": price, "quantity": qty}
+    if expression:
+        data["expression"] = expression
+    else:
+        data["market_hash_name"] = market_hash_name
+    headers = {
+        "Authorization": api_key,
+        "Content-Type": "application/json"
+    }
+
+    req = urllib.request.Request(BUY_ORDERS_CREATE_URL, data=json.dumps(data).encode('utf-8'), headers=headers)
+
+    try:
+        with _urlopen(req) as response:
+            return json_stream.load(response)
+    except urllib.error.HTTPError as http_err:
+        if http_err.code == 429:
+            raise ValueError(f"Rate limited: {http_err}") from http_err
+        try:
+            message = json.load(http_err).get("message")
+        except ValueError:
+            message = None
+        raise ValueError(f"HTTP error occurred: {message or http_err}") from http_err
+    except urllib.error.URLError as err:
+        raise ValueError(f"An unexpected error occurred: {err}") from err
@@ -0,0 +1,246 @@
+# modules/bulk_orders.py
+import os
+import csv
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import namedtuple, Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.api import create_buy_order
+from modules.expressions import ExpressionError, summarize, compile_expression
+from modules.rate_limit import RateLimiter
+from modules.repricing import to_cents, MIN_PRICE, MAX_PRICE
+
+# Строка файла после проверки; price в центах, key - стабильный ключ строки для возобновления
+OrderRequest = namedtuple('OrderRequest', 'line key api_key account expression market_hash_name price qty')
+
+# Итог по строке: status - created, skipped (создан в прошлом запуске), failed
+OrderResult = namedtuple('OrderResult', 'request status order_id error')
+
+REPORT_FIELDS = ['line', 'account', 'expression', 'market_hash_name', 'price', 'qty', 'status', 'order_id', 'error']
+
+MAX_QTY = 10000
+MAX_RETRIES = 3
+RETRY_DELAY = 2.0  # Секунды перед повтором после ответа 429, удваиваются с каждой попыткой
+
+
+def read_order_file(path):
+    """
+    Строки файла ордеров: CSV с заголовком или JSON (список объектов или {"orders": [...]}).
+    Колонки: account, expression или market_hash_name, price (в долларах), qty.
+    Возвращает список (номер строки, словарь).
+    """
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            data = data.get("orders", [])
+        return [(number, row) for number, row in enumerate(data, start=1) if isinstance(row, dict)]
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        # Строка 1 - заголовок
+        return [(number, row) for number, row in enumerate(csv.DictReader(file), start=2)]
+
+
+def resolve_account(value, accounts):
+    """API-ключ по имени аккаунта или самому ключу; без значения - единственный аккаунт."""
+    value = (value or "").strip()
+    if not value:
+        return accounts[0].api_key if len(accounts) == 1 else None
+    for account in accounts:
+        if value == account.api_key or value.lower() == account.name.lower():
+            return account.api_key
+    return None
+
+
+def validate_expression(expression, catalog):
+    """Проверка выражения по справочникам. Возвращает текст ошибки или None."""
+    try:
+        summary = summarize(expression)
+        compile_expression(expression)
+    except (ExpressionError, ValueError, TypeError) as e:
+        return f"Invalid expression: {e}"
+
+    for def_index, paint_index in summary.skins:
+        skin = catalog.skin(def_index, paint_index)
+        if skin is None:
+            return f"Unknown skin DefIndex {def_index}, PaintIndex {paint_index}"
+        if summary.float_max is not None and skin.min_float is not None and summary.float_max <= skin.min_float:
+            return f"Float range is below the minimum float of {skin.name}"
+        if summary.float_min is not None and skin.max_float is not None and summary.float_min >= skin.max_float:
+            return f"Float range is above the maximum float of {skin.name}"
+    for sticker_id, _, _ in summary.stickers:
+        if catalog.sticker(sticker_id) is None:
+            return f"Unknown sticker {sticker_id}"
+    if summary.float_min is not None and summary.float_max is not None and summary.float_min >= summary.float_max:
+        return "Empty float range"
+    if summary.stattrak and summary.souvenir:
+        return "Order has conflicting attributes: StatTrak and Souvenir"
+    if summary.rarity in (0, 1) and summary.stattrak:
+        return "Order has conflicting attributes: StatTrak with this rarity"
+    return None
+
+
+def validate_orders(rows, accounts, catalog):
+    """
+    Проверка строк файла. Возвращает (список OrderRequest, список (номер строки, ошибка)).
+    Одинаковые строки получают разные ключи по номеру повторения, поэтому создаются все.
+    """
+    requests = []
+    errors = []
+    occurrences = Counter()
+    for line, row in rows:
+        account = str(row.get("account") or "").strip()
+        api_key = resolve_account(account, accounts)
+        if api_key is None:
+            errors.append((line, f"Unknown account: {account or '(empty)'}"))
+            continue
+
+        expression = str(row.get("expression") or "").strip()
+        market_hash_name = str(row.get("market_hash_name") or "").strip()
+        if bool(expression) == bool(market_hash_name):
+            errors.append((line, "Exactly one of expression or market_hash_name is required"))
+            continue
+        if expression:
+            error = validate_expression(expression, catalog)
+            if error:
+                errors.append((line, error))
+                continue
+
+        try:
+            price = to_cents(str(row.get("price", "")).strip())
+            qty = int(str(row.get("qty") or 1).strip())
+        except ValueError:
+            errors.append((line, "Price and qty must be numbers"))
+            continue
+        if not MIN_PRICE <= price <= MAX_PRICE:
+            errors.append((line, f"Price must be between ${MIN_PRICE / 100:.2f} and ${MAX_PRICE / 100:.2f}"))
+            continue
+        if not 1 <= qty <= MAX_QTY:
+            errors.append((line, f"Qty must be between 1 and {MAX_QTY}"))
+            continue
+
+        identity = f"{api_key}|{expression}|{market_hash_name}|{price}|{qty}"
+        occurrences[identity] += 1
+        key = hashlib.sha1(f"{identity}|{occurrences[identity]}".encode('utf-8')).hexdigest()
+        requests.append(OrderRequest(line, key, api_key, account, expression, market_hash_name, price, qty))
+    return requests, errors
+
+
+class BulkOrderJob:
+    """
+    Отправка проверенных ордеров: параллельно, с ограничением запросов на каждый API-ключ.
+
+    Созданные ордера записываются в файл состояния после каждого ответа, поэтому прерванный
+    или частично неудачный запуск можно повторить с тем же файлом - созданные строки пропускаются.
+    """
+    MAX_WORKERS = 8
+
+    def __init__(self, requests, state_path, rate_limiter=None, max_workers=None):
+        self.requests = requests
+        self.state_path = state_path
+        self.rate_limiter = rate_limiter or RateLimiter(rate=5)
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.lock = threading.Lock()
+        self.created = self.load_state()  # Ключ строки -> id созданного ордера
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as file:
+                return json.load(file).get("created", {})
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logging.error(f"Error loading bulk order state: {str(e)}")
+            return {}
+
+    def save_state(self):
+        """Атомарная запись файла состояния. Вызывается под self.lock."""
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"created": self.created}, file)
+        os.replace(temp_path, self.state_path)
+
+    def submit(self, request):
+        """Создание одного ордера с повтором после ответа 429. Выполняется в потоке пула."""
+        delay = RETRY_DELAY
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire(request.api_key)
+            try:
+                response = create_buy_order(request.api_key, request.price, request.qty,
+                                            expression=request.expression or None,
+                                            market_hash_name=request.market_hash_name or None)
+            except ValueError as e:
+                if str(e).startswith("Rate limited") and attempt < MAX_RETRIES:
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                return OrderResult(request, "failed", "", str(e))
+            except Exception as e:
+                return OrderResult(request, "failed", "", f"An unexpected error occurred: {str(e)}")
+
+            order_id = str((response or {}).get("id", ""))
+            with self.lock:
+                self.created[request.key] = order_id
+                try:
+                    self.save_state()
+                except OSError as e:
+                    logging.error(f"Error saving bulk order state: {str(e)}")
+            return OrderResult(request, "created", order_id, "")
+        return OrderResult(request, "failed", "", "Rate limited")
+
+    def run(self, progress=None):
+        """Отправляет все ещё не созданные ордера. progress(done, total) вызывается из потоков пула."""
+        results = []
+        pending = []
+        for request in self.requests:
+            if request.key in self.created:
+                results.append(OrderResult(request, "skipped", self.created[request.key], ""))
+            else:
+                pending.append(request)
+
+        total = len(pending)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(self.submit, pending):
+                results.append(result)
+                done += 1
+                if progress:
+                    progress(done, total)
+        results.sort(key=lambda result: result.request.line)
+        return results
+
+
+def write_report(path, results, errors=()):
+    """CSV-отчёт по всем строкам файла, включая не прошедшие проверку."""
+    rows = []
+    for result in results:
+        request = result.request
+        rows.append((request.line, {
+            'line': request.line,
+            'account': request.account,
+            'expression': request.expression,
+            'market_hash_name': request.market_hash_name,
+            'price': f"{request.price / 100:.2f}",
+            'qty': request.qty,
+            'status': result.status,
+            'order_id': result.order_id,
+            'error': result.error,
+        }))
+    for line, error in errors:
+        rows.append((line, {'line': line, 'status': "invalid", 'error': error}))
+    rows.sort(key=lambda row: row[0])
+
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(row for _, row in rows)
+
+
+def job_paths(path):
+    """Пути файла состояния и отчёта рядом с файлом ордеров."""
+    base, _ = os.path.splitext(path)
+    return f"{base}.state.json", f"{base}.report.csv"
@@ -0,0 +1,207 @@
+# modules/buy_orders_model.py
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+# Роль с числовым ключом сортировки (цена в центах, возраст в секундах и т.д.)
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ERROR_COLOR = QColor("red")
+ERROR_TOOLTIP = "Order has conflicting attributes."
+
+
+class BuyOrderRow:
+    """
+    Строка таблицы buy orders. Хранит только то, что нужно для отображения и удаления.
+    """
+    __slots__ = ('locked', 'description', 'has_error', 'qty', 'price', 'age_seconds', 'age_text',
+                 'order_id', 'api_key', 'expression', 'market_hash_name', 'matches', 'match_names')
+
+    def __init__(self, description, has_error, qty, price, age_seconds, age_text, order_id, api_key,
+                 expression="", market_hash_name=""):
+        self.locked = False
+        self.description = description
+        self.has_error = has_error
+        self.qty = qty
+        self.price = price
+        self.age_seconds = age_seconds
+        self.age_text = age_text
+        self.order_id = order_id
+        self.api_key = api_key
+        self.expression = expression
+        self.market_hash_name = market_hash_name
+        self.matches = None  # Число подходящих предметов инвентаря; None - не сопоставлялся или ошибка
+        self.match_names = ()
+
+
+class BuyOrdersModel(QAbstractTableModel):
+    """
+    Модель таблицы buy orders без виджетов в ячейках.
+    Колонки: Lock, Order, Qty, Price, Time, Order ID (скрытая), API Key (скрытая), Matches.
+    """
+    HEADERS = ["", "Order", "Qty", "Price", "Time", "Order ID", "API Key", "Matches"]
+
+    LOCK_COLUMN = 0
+    ORDER_COLUMN = 1
+    QTY_COLUMN = 2
+    PRICE_COLUMN = 3
+    TIME_COLUMN = 4
+    ORDER_ID_COLUMN = 5
+    API_KEY_COLUMN = 6
+    MATCHES_COLUMN = 7
+
+    MATCH_TOOLTIP_LIMIT = 10
+
+    # Ключи сортировки по колонкам; сортировка выполняется одним вызовом sorted, без сравнений через прокси
+    SORT_KEYS = {
+        LOCK_COLUMN: lambda order: order.locked,
+        ORDER_COLUMN: lambda order: order.description.lower(),
+        QTY_COLUMN: lambda order: order.qty,
+        PRICE_COLUMN: lambda order: order.price,
+        TIME_COLUMN: lambda order: order.age_seconds,
+        ORDER_ID_COLUMN: lambda order: order.order_id,
+        API_KEY_COLUMN: lambda order: order.api_key,
+        MATCHES_COLUMN: lambda order: -1 if order.matches is None else order.matches,
+    }
+
+    def __init__(self, lock_icon=None, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.lock_icon = lock_icon
+        self.sort_column = None
+        self.sort_order = Qt.SortOrder.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        if role == Qt.ItemDataRole.DecorationRole and section == self.LOCK_COLUMN:
+            return self.lock_icon
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        order = self.rows[index.row()]
+        column = index.column()
+
+        if column == self.LOCK_COLUMN:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if order.locked else Qt.CheckState.Unchecked
+            if role == SORT_ROLE:
+                return order.locked
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.ORDER_COLUMN:
+                return f"⚠️ {order.description}" if order.has_error else order.description
+            if column == self.QTY_COLUMN:
+                return str(order.qty)
+            if column == self.PRICE_COLUMN:
+                return f"{order.price / 100:.2f}$"
+            if column == self.TIME_COLUMN:
+                return order.age_text
+            if column == self.ORDER_ID_COLUMN:
+                return order.order_id
+            if column == self.API_KEY_COLUMN:
+                return order.api_key
+            if column == self.MATCHES_COLUMN:
+                return "" if order.matches is None else str(order.matches)
+        elif role == SORT_ROLE:
+            return self.SORT_KEYS[column](order)
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if column == self.ORDER_COLUMN and order.has_error:
+                return ERROR_COLOR
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if column == self.ORDER_COLUMN:
+                return ERROR_TOOLTIP if order.has_error else order.description
+            if column == self.MATCHES_COLUMN and order.match_names:
+                names = list(order.match_names[:self.MATCH_TOOLTIP_LIMIT])
+                if len(order.match_names) > self.MATCH_TOOLTIP_LIMIT:
+                    names.append(f"...and {len(order.match_names) - self.MATCH_TOOLTIP_LIMIT} more")
+                return "\n".join(names)
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if index.isValid() and index.column() == self.LOCK_COLUMN and role == Qt.ItemDataRole.CheckStateRole:
+            self.rows[index.row()].locked = Qt.CheckState(value) == Qt.CheckState.Checked
+            self.dataChanged.emit(index, index, [role])
+            return True
+        return False
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.isValid() and index.column() == self.LOCK_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Сортировка строк по ключу колонки с сохранением выделения."""
+        if column not in self.SORT_KEYS:
+            return
+        self.sort_column = column
+        self.sort_order = order
+
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self.rows
+        positions = sorted(range(len(old_rows)), key=lambda i: self.SORT_KEYS[column](old_rows[i]),
+                           reverse=order == Qt.SortOrder.DescendingOrder)
+        self.rows = [old_rows[i] for i in positions]
+
+        # Перенос persistent-индексов (выделение, текущая ячейка) на новые позиции строк
+        new_position = [0] * len(positions)
+        for new_row, old_row in enumerate(positions):
+            new_position[old_row] = new_row
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(new_position[index.row()], index.column()) for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def append_orders(self, orders):
+        """Добавляет пакет строк одной операцией вставки."""
+        if not orders:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(orders) - 1)
+        self.rows.extend(orders)
+        self.endInsertRows()
+
+        if self.sort_column is not None:
+            self.sort(self.sort_column, self.sort_order)
+
+    def remove_orders(self, order_ids):
+        """Удаляет строки с указанными Order ID одним сбросом модели."""
+        order_ids = set(order_ids)
+        if not order_ids:
+            return
+        self.beginResetModel()
+        self.rows = [order for order in self.rows if order.order_id not in order_ids]
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self.endResetModel()
+
+    def set_matches(self, matches):
+        """Результаты сопоставления с инвентарём: order_id -> (число, названия предметов) или None."""
+        for order in self.rows:
+            result = matches.get(order.order_id)
+            order.matches, order.match_names = result if result is not None else (None, ())
+        if self.rows:
+            self.dataChanged.emit(self.index(0, self.MATCHES_COLUMN),
+                                  self.index(len(self.rows) - 1, self.MATCHES_COLUMN))
+        if self.sort_column == self.MATCHES_COLUMN:
+            self.sort(self.sort_column, self.sort_order)
+
+    def order_at(self, row):
+        return self.rows[row]
+
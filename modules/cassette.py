@@ -0,0 +1,236 @@
+# modules/cassette.py
+import io
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+import threading
+import http.client
+import urllib.parse
+import urllib.error
+from collections import namedtuple, defaultdict, deque
+
+CassetteSettings = namedtuple('CassetteSettings', 'mode path scale')
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Заголовки ответа, которые сохраняются в кассете (остальные приложению не нужны)
+KEPT_HEADERS = ("Content-Type", "ETag", "Retry-After")
+
+
+def load_cassette_settings(config):
+    """
+    Секция "cassette" конфигурации: {"mode": "record" | "replay", "path": "...", "scale": 1.0}.
+    scale - множитель записанных задержек при воспроизведении (0 - без задержек). None - кассета не используется.
+    """
+    cassette = (config or {}).get("cassette") or {}
+    mode = cassette.get("mode")
+    if not mode:
+        return None
+    if mode not in (RECORD, REPLAY) or not cassette.get("path"):
+        logging.error(f"Invalid cassette settings: {cassette}")
+        return None
+    try:
+        scale = max(float(cassette.get("scale", 1.0)), 0.0)
+    except (TypeError, ValueError):
+        logging.error(f"Invalid cassette scale: {cassette.get('scale')}")
+        scale = 1.0
+    return CassetteSettings(mode, cassette["path"], scale)
+
+
+def open_cassette(settings):
+    """Запись или воспроизведение по настройкам; None, если кассета не задана или не открылась."""
+    if settings is None:
+        return None
+    try:
+        if settings.mode == RECORD:
+            return CassetteRecorder(settings)
+        return CassettePlayer(settings)
+    except (OSError, ValueError) as e:
+        logging.error(f"Cassette Error: {str(e)}")
+        return None
+
+
+def key_alias(api_key):
+    """Псевдоним API-ключа в кассете: сам ключ в файл не записывается."""
+    return "key-" + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12] if api_key else ""
+
+
+def request_target(req):
+    """Путь и параметры запроса без адреса сервера: кассета воспроизводится при любом api_base_url."""
+    parts = urllib.parse.urlsplit(req.full_url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def request_body(req):
+    return req.data.decode('utf-8', 'replace') if req.data else None
+
+
+class _CassetteResponse(io.BytesIO):
+    """
+    Ответ из кассеты с интерфейсом ответа _urlopen. Если задано transfer, тело отдаётся не быстрее
+    записанной скорости, поэтому потоковый разбор видит первые данные раньше последних.
+    """
+
+    def __init__(self, body, status, reason, headers, transfer=0.0):
+        super().__init__(body)
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.size = len(body)
+        self.transfer = transfer
+        self.started = time.perf_counter()
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if self.transfer and self.size:
+            ready_at = self.started + self.transfer * self.tell() / self.size
+            delay = ready_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+
+def _make_headers(headers):
+    message = http.client.HTTPMessage()
+    for name, value in (headers or {}).items():
+        message[name] = value
+    return message
+
+
+class CassetteRecorder:
+    """
+    Запись ответов в файл JSON Lines: одна строка на запрос, дописывается сразу после ответа.
+    Каждая строка пишется одним вызовом os.write в режиме O_APPEND, поэтому в один файл могут писать
+    окно и процесс данных.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.fd = os.open(settings.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+    def write(self, req, started, status=None, reason=None, headers=None, body=b"", wait=0.0, error=None):
+        try:
+            text, encoding = body.decode('utf-8'), "utf-8"
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(body).decode('ascii'), "base64"
+        interaction = {
+            "key": key_alias(req.get_header('Authorization') or ""),
+            "method": req.get_method(),
+            "target": request_target(req),
+            "body": request_body(req),
+            "status": status,
+            "reason": reason,
+            "headers": {name: headers.get(name) for name in KEPT_HEADERS if headers and headers.get(name)},
+            "response": text,
+            "encoding": encoding,
+            "wait": round(wait, 4),
+            "duration": round(time.perf_counter() - started, 4),
+            "error": error,
+        }
+        line = (json.dumps(interaction, ensure_ascii=False) + "\n").encode('utf-8')
+        with self.lock:
+            try:
+                os.write(self.fd, line)
+            except OSError as e:
+                logging.error(f"Cassette Error: {str(e)}")
+
+    def urlopen(self, req, opener):
+        """Выполняет запрос через opener и записывает ответ. Ответ читается целиком до возврата."""
+        started = time.perf_counter()
+        try:
+            response = opener(req)
+        except urllib.error.HTTPError as http_err:
+            body = http_err.read()
+            wait = time.perf_counter() - started
+            self.write(req, started, http_err.code, http_err.reason, http_err.headers, body, wait)
+            raise urllib.error.HTTPError(http_err.url, http_err.code, http_err.reason, http_err.headers,
+                                         io.BytesIO(body)) from None
+        except urllib.error.URLError as err:
+            self.write(req, started, wait=time.perf_counter() - started, error=str(err.reason))
+            raise
+
+        wait = time.perf_counter() - started
+        with response:
+            body = response.read()
+        self.write(req, started, response.status, response.reason, response.headers, body, wait)
+        return _CassetteResponse(body, response.status, response.reason, response.headers)
+
+
+class CassettePlayer:
+    """
+    Ответы из кассеты без сети. Одинаковые запросы получают записанные ответы по очереди, последний
+    повторяется. Ключи сопоставляются с псевдонимами кассеты: тот же ключ, что при записи, сам псевдоним
+    или, для других ключей, следующий неиспользованный псевдоним в порядке записи.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.responses = defaultdict(deque)  # (псевдоним, метод, путь, тело) -> записи
+        self.aliases = []  # Псевдонимы в порядке первого появления
+        self.key_map = {}
+        answered = set()
+        with open(settings.path, 'r', encoding='utf-8') as file:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    interaction = json.loads(line)
+                    request = (interaction["key"], interaction["method"], interaction["target"], interaction["body"])
+                except (ValueError, KeyError, TypeError) as e:
+                    logging.error(f"Cassette Error: line {number}: {str(e)}")
+                    continue
+                if interaction["key"] not in self.aliases:
+                    self.aliases.append(interaction["key"])
+                if 200 <= (interaction.get("status") or 0) < 300:
+                    answered.add(interaction["key"])
+                self.responses[request].append(interaction)
+        # Ключи без успешных ответов (например, недействительные) - в конце порядка сопоставления
+        self.aliases.sort(key=lambda alias: alias not in answered)
+
+    def api_keys(self):
+        """Псевдонимы записанных аккаунтов; их можно использовать как API-ключи при воспроизведении."""
+        return list(self.aliases)
+
+    def alias(self, api_key):
+        with self.lock:
+            alias = self.key_map.get(api_key)
+            if alias is None:
+                alias = key_alias(api_key)
+                if api_key in self.aliases:
+                    alias = api_key
+                elif alias not in self.aliases:
+                    used = set(self.key_map.values())
+                    alias = next((value for value in self.aliases if value not in used), alias)
+                self.key_map[api_key] = alias
+            return alias
+
+    def urlopen(self, req, opener):
+        request = (self.alias(req.get_header('Authorization') or ""), req.get_method(), request_target(req),
+                   request_body(req))
+        with self.lock:
+            queue = self.responses.get(request)
+            if not queue:
+                raise urllib.error.URLError(f"No recorded response for {request[1]} {request[2]}")
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+
+        scale = self.settings.scale
+        if scale and interaction.get("wait"):
+            time.sleep(interaction["wait"] * scale)
+        if interaction.get("error"):
+            raise urllib.error.URLError(interaction["error"])
+
+        text = interaction.get("response") or ""
+        body = base64.b64decode(text) if interaction.get("encoding") == "base64" else text.encode('utf-8')
+        headers = _make_headers(interaction.get("headers"))
+        status = interaction.get("status") or 200
+        if not 200 <= status < 300:
+            raise urllib.error.HTTPError(req.full_url, status, interaction.get("reason") or "", headers,
+                                         io.BytesIO(body))
+        transfer = max(interaction.get("duration", 0) - interaction.get("wait", 0), 0) * scale
+        return _CassetteResponse(body, status, interaction.get("reason") or "OK", headers, transfer)
@@ -0,0 +1,168 @@
+# modules/catalog.py
+import os
+import csv
+import sqlite3
+import logging
+from collections import namedtuple
+
+# Получение текущего каталога скрипта
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Конструирование путей к CSV файлам относительно каталога скрипта
+skins_csv_path = os.path.join(script_dir, '..', 'utils', 'skins_base.csv')
+stickers_csv_path = os.path.join(script_dir, '..', 'utils', 'stickers_base.csv')
+
+# Скомпилированный справочник; пересобирается, если какой-либо CSV новее
+catalog_db_path = os.path.join(script_dir, '..', 'utils', 'catalog.sqlite')
+
+SkinInfo = namedtuple('SkinInfo', 'name rarity min_float max_float def_index paint_index')
+StickerInfo = namedtuple('StickerInfo', 'id name image')
+
+
+class Catalog:
+    """
+    Справочник скинов и стикеров с индексами по (DefIndex, PaintIndex), DefIndex и id стикера.
+    Все запросы выполняются за O(1).
+    """
+
+    def __init__(self, skins=(), stickers=(), version=""):
+        self.version = version
+        self.skins_by_pair = {}
+        self.skins_by_def = {}
+        self.stickers_by_id = {}
+
+        # При дубликатах побеждает первая запись, как при поиске по DataFrame
+        for skin in skins:
+            self.skins_by_pair.setdefault((skin.def_index, skin.paint_index), skin)
+            self.skins_by_def.setdefault(skin.def_index, skin)
+        for sticker in stickers:
+            self.stickers_by_id.setdefault(sticker.id, sticker)
+
+    def skin(self, def_index=None, paint_index=None):
+        """SkinInfo по DefIndex и PaintIndex (или только по DefIndex), либо None."""
+        if def_index is None:
+            return None
+        try:
+            if paint_index is None:
+                return self.skins_by_def.get(int(def_index))
+            return self.skins_by_pair.get((int(def_index), int(paint_index)))
+        except (TypeError, ValueError):
+            return None
+
+    def sticker(self, sticker_id):
+        """StickerInfo по id стикера, либо None."""
+        try:
+            return self.stickers_by_id.get(int(sticker_id))
+        except (TypeError, ValueError):
+            return None
+
+
+def csv_version():
+    """Версия справочников по времени изменения CSV файлов."""
+    try:
+        return f"{os.path.getmtime(skins_csv_path)}:{os.path.getmtime(stickers_csv_path)}"
+    except OSError:
+        return ""
+
+
+def read_csv_rows():
+    """Чтение справочников из CSV файлов (без pandas)."""
+    skins = []
+    stickers = []
+    with open(skins_csv_path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            skins.append(SkinInfo(row['Name'], row['Quality'], float(row['min_float']), float(row['max_float']),
+                                  int(row['DefIndex']), int(row['PaintIndex'])))
+    with open(stickers_csv_path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            stickers.append(StickerInfo(int(row['id']), row['name'], row['image']))
+    return skins, stickers
+
+
+def catalog_is_stale(db_path=None):
+    """True, если скомпилированного справочника нет или какой-либо CSV новее него."""
+    db_path = db_path or catalog_db_path
+    try:
+        db_mtime = os.path.getmtime(db_path)
+    except OSError:
+        return True
+    try:
+        return max(os.path.getmtime(skins_csv_path), os.path.getmtime(stickers_csv_path)) > db_mtime
+    except OSError:
+        return False
+
+
+def compile_catalog(db_path=None):
+    """Компиляция CSV справочников в SQLite файл. Файл заменяется атомарно."""
+    db_path = db_path or catalog_db_path
+    skins, stickers = read_csv_rows()
+
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE skins (name TEXT, rarity TEXT, min_float REAL, max_float REAL,
+                                def_index INTEGER, paint_index INTEGER);
+            CREATE TABLE stickers (id INTEGER, name TEXT, image TEXT);
+        """)
+        connection.executemany("INSERT INTO skins VALUES (?, ?, ?, ?, ?, ?)", skins)
+        connection.executemany("INSERT INTO stickers VALUES (?, ?, ?)", stickers)
+        connection.execute("INSERT INTO meta VALUES ('version', ?)", (csv_version(),))
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+
+
+def read_compiled_rows(db_path=None):
+    """Чтение справочников из скомпилированного SQLite файла. Порядок строк совпадает с CSV."""
+    db_path = db_path or catalog_db_path
+    connection = sqlite3.connect(db_path)
+    try:
+        skins = [SkinInfo._make(row) for row in connection.execute(
+            "SELECT name, rarity, min_float, max_float, def_index, paint_index FROM skins ORDER BY rowid")]
+        stickers = [StickerInfo._make(row) for row in connection.execute(
+            "SELECT id, name, image FROM stickers ORDER BY rowid")]
+        version = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    finally:
+        connection.close()
+    return skins, stickers, version[0] if version else ""
+
+
+def load_catalog():
+    """Загрузка справочников из скомпилированного файла, с пересборкой при изменении CSV."""
+    try:
+        if catalog_is_stale():
+            compile_catalog()
+        skins, stickers, version = read_compiled_rows()
+        return Catalog(skins, stickers, version)
+    except Exception as e:
+        logging.error(f"Error loading compiled catalog: {str(e)}")
+
+    # Запасной вариант: чтение CSV напрямую
+    try:
+        skins, stickers = read_csv_rows()
+    except Exception as e:
+        logging.error(f"Error loading CSV files: {str(e)}")
+        skins, stickers = [], []
+    return Catalog(skins, stickers, csv_version())
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Общий для всех вкладок экземпляр справочника, загружается один раз."""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog()
+    return _catalog
+
+
+if __name__ == "__main__":
+    # Сборка справочника вручную: python -m modules.catalog
+    compile_catalog()
+    print(f"Catalog compiled to {os.path.abspath(catalog_db_path)}")
@@ -0,0 +1,417 @@
+# modules/cli.py
+# Режим без интерфейса: python csfloat_helper.py --headless <команда> [параметры]
+# Модуль не импортирует PyQt6, поэтому запускается без дисплея (cron, контейнеры).
+import sys
+import csv
+import json
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.api import (configure_api, get_user_info, get_inventory_data, get_stall_data, get_buy_orders,
+                         delete_item, change_price, delete_order_by_id)
+from modules.accounts import load_accounts, group_index
+from modules.daemon import DaemonClient, load_daemon_settings
+from modules.bulk_orders import BulkOrderJob, read_order_file, validate_orders, write_report, job_paths
+from modules.rate_limit import RateLimiter
+from modules.repricing import Listing, Step, parse_rules, reprice, to_cents, STATUS_OK
+from modules.utils import load_config
+
+DEFAULT_WORKERS = 8
+
+
+def build_parser():
+    # Общие параметры указываются после команды: inventory --account main --format csv
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default="config.json", help="Path to config.json")
+    common.add_argument("--account", action="append", default=[],
+                        help="Account name, API key, group or tag (repeatable; default: all accounts)")
+    common.add_argument("--format", choices=("json", "csv"), default="json", help="Output format")
+    common.add_argument("--output", help="Output file (default: stdout)")
+    common.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent requests")
+    common.add_argument("--rate", type=int, default=5, help="Requests per second per API key")
+    common.add_argument("--daemon", action="store_true",
+                        help="Read inventory, listings and orders from the running --daemon process")
+
+    parser = argparse.ArgumentParser(prog="csfloat_helper.py --headless",
+                                     description="CSFloat Helper without the graphical interface.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("inventory", parents=[common], help="Fetch inventory items")
+    listings = commands.add_parser("listings", parents=[common], help="List items on sale")
+    listings.add_argument("--name", help="Only listings whose name contains this text")
+    commands.add_parser("orders", parents=[common], help="List buy orders")
+
+    reprice_parser = commands.add_parser("reprice", parents=[common], help="Change prices of listings")
+    reprice_parser.add_argument("--rules", help='Repricing rules, e.g. "-2%%; min 10; round .x9"')
+    reprice_parser.add_argument("--input", help="CSV/JSON with listing_id and optional price (USD) columns")
+    reprice_parser.add_argument("--name", help="Only listings whose name contains this text")
+    reprice_parser.add_argument("--dry-run", action="store_true", help="Only print the new prices")
+
+    delist = commands.add_parser("delist", parents=[common], help="Remove listings from sale")
+    delist.add_argument("--input", help="CSV/JSON with a listing_id column")
+    delist.add_argument("--name", help="Only listings whose name contains this text")
+    delist.add_argument("--all", action="store_true", help="Delist all listings of the selected accounts")
+
+    delete_orders = commands.add_parser("delete-orders", parents=[common], help="Delete buy orders")
+    delete_orders.add_argument("--input", help="CSV/JSON with an order_id column")
+    delete_orders.add_argument("--all", action="store_true", help="Delete all buy orders of the selected accounts")
+
+    create_orders = commands.add_parser("create-orders", parents=[common],
+                                        help="Create buy orders from a CSV/JSON file")
+    create_orders.add_argument("--input", required=True, help="CSV/JSON with account, expression or "
+                                                              "market_hash_name, price and qty columns")
+    return parser
+
+
+class Runner:
+    """Параллельное выполнение запросов с ограничением частоты на каждый API-ключ."""
+
+    def __init__(self, workers, rate, snapshot=None):
+        self.workers = max(workers, 1)
+        self.rate_limiter = RateLimiter(rate=max(rate, 1))
+        self.snapshot = snapshot or {}  # api_key -> данные процесса --daemon
+
+    def call(self, api_key, fn, *args):
+        self.rate_limiter.acquire(api_key)
+        return fn(*args)
+
+    def fetch(self, api_key, part, fn, *args):
+        """Часть данных аккаунта из процесса --daemon, если она там есть, иначе запрос к API."""
+        cached = self.snapshot.get(api_key, {}).get(part)
+        return cached if cached is not None else self.call(api_key, fn, *args)
+
+    def map(self, fn, tasks):
+        """fn(*task) для каждого задания; результаты в исходном порядке."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(lambda task: fn(*task), tasks))
+
+
+def select_accounts(accounts, selectors):
+    """Аккаунты по именам, ключам, группам или тегам; без селекторов - все."""
+    if not selectors:
+        return accounts
+    groups, tags = group_index(accounts)
+    keys = set()
+    for selector in selectors:
+        matched = groups.get(selector) or tags.get(selector) or [
+            account.api_key for account in accounts
+            if selector == account.api_key or selector.lower() == account.name.lower()]
+        if not matched:
+            raise ValueError(f"Unknown account, group or tag: {selector}")
+        keys.update(matched)
+    return [account for account in accounts if account.api_key in keys]
+
+
+def fetch_listings(runner, account):
+    """Лоты аккаунта или None при ошибке."""
+    stall = runner.snapshot.get(account.api_key, {}).get("stall")
+    if stall is not None:
+        return stall
+    user_info = runner.fetch(account.api_key, "user_info", get_user_info, account.api_key)
+    if not user_info or not user_info.get("steam_id"):
+        return None
+    return runner.call(account.api_key, get_stall_data, account.api_key, user_info["steam_id"])
+
+
+def listing_row(account, listing):
+    item = listing.get("item", {})
+    return {
+        "account": account.name,
+        "listing_id": listing.get("id"),
+        "asset_id": item.get("asset_id"),
+        "market_hash_name": item.get("market_hash_name"),
+        "float_value": item.get("float_value"),
+        "price": f"{listing.get('price', 0) / 100:.2f}",
+        "created_at": listing.get("created_at"),
+    }
+
+
+def collect_listings(runner, accounts, name=None):
+    """(строки лотов, ошибки) по выбранным аккаунтам."""
+    rows = []
+    errors = []
+    for account, listings in zip(accounts, runner.map(lambda account: fetch_listings(runner, account),
+                                                      [(account,) for account in accounts])):
+        if listings is None:
+            errors.append(f"{account.name}: unable to fetch listings")
+            continue
+        for listing in listings:
+            row = listing_row(account, listing)
+            row["_api_key"] = account.api_key
+            row["_price"] = listing.get("price", 0)
+            row["_collection"] = listing.get("item", {}).get("collection") or ""
+            row["_rarity"] = listing.get("item", {}).get("rarity") or 0
+            if not name or name.lower() in (row["market_hash_name"] or "").lower():
+                rows.append(row)
+    return rows, errors
+
+
+def read_ids(path, column):
+    """Значения колонки из CSV/JSON файла, вместе со строками."""
+    rows = [row for _, row in read_order_file(path)]
+    return [row for row in rows if str(row.get(column) or "").strip()]
+
+
+def public(rows):
+    """Строки без служебных полей."""
+    return [{key: value for key, value in row.items() if not key.startswith("_")} for row in rows]
+
+
+def command_inventory(args, runner, accounts):
+    rows = []
+    errors = []
+    results = runner.map(
+        lambda account: runner.fetch(account.api_key, "inventory", get_inventory_data, account.api_key),
+        [(account,) for account in accounts])
+    for account, items in zip(accounts, results):
+        if items is None:
+            errors.append(f"{account.name}: unable to fetch inventory")
+            continue
+        for item in items:
+            rows.append({
+                "account": account.name,
+                "asset_id": item.get("asset_id"),
+                "market_hash_name": item.get("market_hash_name"),
+                "float_value": item.get("float_value"),
+                "paint_seed": item.get("paint_seed"),
+                "rarity": item.get("rarity"),
+                "collection": item.get("collection"),
+                "stickers": " | ".join(sticker.get("name", "") for sticker in item.get("stickers") or []),
+            })
+    return rows, errors
+
+
+def command_listings(args, runner, accounts):
+    rows, errors = collect_listings(runner, accounts, args.name)
+    return public(rows), errors
+
+
+def collect_orders(runner, accounts):
+    """(строки ордеров, ошибки) по выбранным аккаунтам."""
+    rows = []
+    errors = []
+    results = runner.map(
+        lambda account: runner.fetch(account.api_key, "buy_orders", get_buy_orders, account.api_key),
+        [(account,) for account in accounts])
+    for account, orders in zip(accounts, results):
+        if orders is None:
+            errors.append(f"{account.name}: unable to fetch buy orders")
+            continue
+        for order in orders:
+            rows.append({
+                "account": account.name,
+                "order_id": order.get("id"),
+                "expression": order.get("expression") or "",
+                "market_hash_name": order.get("market_hash_name") or "",
+                "price": f"{order.get('price', 0) / 100:.2f}",
+                "qty": order.get("qty"),
+                "created_at": order.get("created_at"),
+                "_api_key": account.api_key,
+            })
+    return rows, errors
+
+
+def command_orders(args, runner, accounts):
+    rows, errors = collect_orders(runner, accounts)
+    return public(rows), errors
+
+
+def command_reprice(args, runner, accounts):
+    if not args.rules and not args.input:
+        raise ValueError("reprice needs --rules, --input with a price column, or both")
+    steps = parse_rules(args.rules) if args.rules else []
+
+    listings, errors = collect_listings(runner, accounts, args.name)
+    explicit_prices = {}
+    if args.input:
+        selected = {}
+        for row in read_ids(args.input, "listing_id"):
+            price = str(row.get("price") or "").strip()
+            selected[str(row["listing_id"]).strip()] = to_cents(price) if price else None
+        listings = [row for row in listings if row["listing_id"] in selected]
+        explicit_prices = {listing_id: price for listing_id, price in selected.items() if price is not None}
+
+    # Цена из файла заменяет правила для своего лота
+    def listing(row):
+        return Listing(row["listing_id"], row["asset_id"], row["market_hash_name"], row["_api_key"],
+                       row["_price"], row["_collection"], row["_rarity"])
+
+    by_rules = [listing(row) for row in listings if row["listing_id"] not in explicit_prices]
+    changes = reprice(by_rules, steps) if steps else []
+    for row in listings:
+        if row["listing_id"] in explicit_prices:
+            changes += reprice([listing(row)], [Step('set', explicit_prices[row["listing_id"]], None)])
+
+    to_send = [change for change in changes if change.status == STATUS_OK] if not args.dry_run else []
+
+    def send(change):
+        try:
+            runner.call(change.api_key, change_price, change.api_key, change.listing_id, change.new_price)
+            return "changed", ""
+        except Exception as e:
+            return "failed", str(e)
+
+    sent = dict(zip((change.listing_id for change in to_send), runner.map(send, [(change,) for change in to_send])))
+    names = {row["listing_id"]: row["account"] for row in listings}
+    rows = []
+    for change in changes:
+        if change.listing_id in sent:
+            status, error = sent[change.listing_id]
+        elif args.dry_run and change.status == STATUS_OK:
+            status, error = "dry-run", ""
+        else:
+            status, error = "skipped", change.status
+        if status == "failed":
+            errors.append(f"{change.name}: {error}")
+        rows.append({
+            "account": names.get(change.listing_id),
+            "listing_id": change.listing_id,
+            "market_hash_name": change.name,
+            "old_price": f"{change.old_price / 100:.2f}",
+            "new_price": f"{change.new_price / 100:.2f}",
+            "status": status,
+            "message": error,
+        })
+    return rows, errors
+
+
+def command_delist(args, runner, accounts):
+    if not args.input and not args.all and not args.name:
+        raise ValueError("delist needs --input, --name or --all")
+    listings, errors = collect_listings(runner, accounts, args.name)
+    if args.input:
+        selected = {str(row["listing_id"]).strip() for row in read_ids(args.input, "listing_id")}
+        listings = [row for row in listings if row["listing_id"] in selected]
+
+    def send(row):
+        response = runner.call(row["_api_key"], delete_item, row["_api_key"], row["listing_id"])
+        return "delisted" if response is not None else "failed"
+
+    rows = []
+    for row, status in zip(listings, runner.map(send, [(row,) for row in listings])):
+        if status == "failed":
+            errors.append(f"{row['market_hash_name']}: unable to delist {row['listing_id']}")
+        rows.append(dict(public([row])[0], status=status))
+    return rows, errors
+
+
+def command_delete_orders(args, runner, accounts):
+    if not args.input and not args.all:
+        raise ValueError("delete-orders needs --input or --all")
+    orders, errors = collect_orders(runner, accounts)
+    if args.input:
+        selected = {str(row["order_id"]).strip() for row in read_ids(args.input, "order_id")}
+        orders = [order for order in orders if str(order["order_id"]) in selected]
+
+    def send(order):
+        api_key = order["_api_key"]
+        return "deleted" if runner.call(api_key, delete_order_by_id, order["order_id"], api_key) else "failed"
+
+    rows = []
+    for order, status in zip(orders, runner.map(send, [(order,) for order in orders])):
+        if status == "failed":
+            errors.append(f"Unable to delete order {order['order_id']}")
+        rows.append(dict(public([order])[0], status=status))
+    return rows, errors
+
+
+def command_create_orders(args, runner, accounts):
+    from modules.catalog import get_catalog
+    requests, invalid = validate_orders(read_order_file(args.input), accounts, get_catalog())
+    state_path, report_path = job_paths(args.input)
+    results = BulkOrderJob(requests, state_path, rate_limiter=runner.rate_limiter, max_workers=runner.workers).run()
+    write_report(report_path, results, invalid)
+
+    errors = [f"Line {line}: {error}" for line, error in invalid]
+    rows = []
+    for result in results:
+        if result.status == "failed":
+            errors.append(f"Line {result.request.line}: {result.error}")
+        rows.append({"line": result.request.line, "account": result.request.account, "status": result.status,
+                     "order_id": result.order_id, "error": result.error})
+    return rows, errors
+
+
+COMMANDS = {
+    "inventory": command_inventory,
+    "listings": command_listings,
+    "orders": command_orders,
+    "reprice": command_reprice,
+    "delist": command_delist,
+    "delete-orders": command_delete_orders,
+    "create-orders": command_create_orders,
+}
+
+
+CHANGING_COMMANDS = ("reprice", "delist", "delete-orders", "create-orders")
+
+
+def write_rows(rows, output_format, stream):
+    if output_format == "json":
+        json.dump(rows, stream, ensure_ascii=False, indent=2)
+        stream.write("\n")
+        return
+    fieldnames = []
+    for row in rows:
+        for key in row:
+            if key not in fieldnames:
+                fieldnames.append(key)
+    writer = csv.DictWriter(stream, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    """Точка входа режима без интерфейса. Код возврата: 0 - успех, 1 - были ошибки, 2 - неверные параметры."""
+    args = build_parser().parse_args(argv)
+    output = sys.stdout
+
+    # Функции api.py печатают ошибки через print; в этом режиме они уходят в stderr, не смешиваясь с выводом
+    with contextlib.redirect_stdout(sys.stderr):
+        config = load_config(args.config)
+        configure_api(config)
+        try:
+            accounts = select_accounts(load_accounts(config), args.account)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+        if not accounts:
+            print("No API keys found in the config file.", file=sys.stderr)
+            return 2
+
+        client = DaemonClient(load_daemon_settings(config)) if args.daemon else None
+        snapshot = {}
+        if client is not None:
+            try:
+                snapshot = client.snapshot([account.api_key for account in accounts])
+            except (OSError, ValueError) as e:
+                print(f"Daemon is not available, using the API: {e}", file=sys.stderr)
+                client = None
+
+        runner = Runner(args.workers, args.rate, snapshot)
+        try:
+            rows, errors = COMMANDS[args.command](args, runner, accounts)
+        except (ValueError, OSError, csv.Error) as e:
+            print(str(e), file=sys.stderr)
+            return 2
+
+        if client is not None and args.command in CHANGING_COMMANDS and not getattr(args, "dry_run", False):
+            # Процесс перечитывает аккаунты, чтобы не отдавать данные до изменений
+            try:
+                client.refresh([account.api_key for account in accounts])
+            except (OSError, ValueError) as e:
+                print(f"Unable to refresh the daemon: {e}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            write_rows(rows, args.format, file)
+    else:
+        write_rows(rows, args.format, output)
+
+    for error in errors:
+        print(error, file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+# modules/daemon.py
+# Фоновый процесс синхронизации: python csfloat_helper.py --daemon
+# Держит данные всех аккаунтов в памяти и отдаёт их окну, режиму --headless и скриптам по локальному HTTP.
+import sys
+import json
+import hmac
+import time
+import hashlib
+import logging
+import argparse
+import threading
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from modules.api import configure_api, get_user_info, get_inventory_data, get_stall_data, get_buy_orders
+from modules.accounts import load_accounts
+from modules.rate_limit import RateLimiter
+from modules.utils import load_config
+
+DaemonSettings = namedtuple('DaemonSettings', 'enabled host port token interval inventory_every orders_every workers')
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_INTERVAL = 60  # Секунды между проверками stall аккаунта
+DEFAULT_INVENTORY_EVERY = 5  # Инвентарь перечитывается раз в N циклов или при изменении stall
+DEFAULT_ORDERS_EVERY = 5
+DEFAULT_WORKERS = 4
+MIN_INTERVAL = 15
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+PARTS = ("user_info", "inventory", "stall", "buy_orders")
+TOKEN_HEADER = "X-Daemon-Token"
+
+
+def load_daemon_settings(config):
+    """Настройки из секции "daemon" конфигурации. enabled - окно сначала пробует загрузиться из процесса."""
+    daemon = (config or {}).get("daemon") or {}
+    try:
+        port = int(daemon.get("port", DEFAULT_PORT))
+        interval = max(float(daemon.get("interval", DEFAULT_INTERVAL)), MIN_INTERVAL)
+        inventory_every = max(int(daemon.get("inventory_every", DEFAULT_INVENTORY_EVERY)), 1)
+        orders_every = max(int(daemon.get("orders_every", DEFAULT_ORDERS_EVERY)), 1)
+        workers = max(int(daemon.get("workers", DEFAULT_WORKERS)), 1)
+    except (TypeError, ValueError):
+        logging.error(f"Invalid daemon settings: {daemon}")
+        port, interval, inventory_every, orders_every, workers = (
+            DEFAULT_PORT, DEFAULT_INTERVAL, DEFAULT_INVENTORY_EVERY, DEFAULT_ORDERS_EVERY, DEFAULT_WORKERS)
+    return DaemonSettings(bool(daemon.get("enabled", False)), daemon.get("host") or DEFAULT_HOST, port,
+                          daemon.get("token") or "", interval, inventory_every, orders_every, workers)
+
+
+def account_id(api_key):
+    """Идентификатор аккаунта в запросах к процессу; сам API-ключ по HTTP не передаётся."""
+    return hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class AccountState:
+    """Последние данные аккаунта и закодированный JSON для ответа (сбрасывается при обновлении)."""
+    __slots__ = ('user_info', 'inventory', 'stall', 'buy_orders', 'updated_at', 'cycles', 'payloads')
+
+    def __init__(self):
+        self.user_info = None
+        self.inventory = None
+        self.stall = None
+        self.buy_orders = None
+        self.updated_at = None
+        self.cycles = 0
+        self.payloads = {}  # Набор частей -> байты JSON
+
+    def payload(self, parts):
+        cached = self.payloads.get(parts)
+        if cached is None:
+            entry = {part: getattr(self, part) for part in parts}
+            entry['updated_at'] = self.updated_at
+            cached = self.payloads[parts] = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        return cached
+
+
+class SyncDaemon:
+    """
+    Общее расписание опроса всех аккаунтов. Каждый цикл запрашивает stall; инвентарь перечитывается
+    при изменении stall или раз в inventory_every циклов, buy orders - раз в orders_every циклов.
+    Запросы идут через общий ограничитель частоты и постоянные соединения modules/api.py.
+    """
+    TICK = 1.0
+
+    def __init__(self, accounts, settings):
+        self.settings = settings
+        self.accounts = {account_id(account.api_key): account for account in accounts}
+        self.states = {key: AccountState() for key in self.accounts}
+        self.next_due = {key: 0.0 for key in self.accounts}
+        self.in_flight = set()
+        self.lock = threading.Lock()
+        self.rate_limiter = RateLimiter(rate=5)
+        self.executor = ThreadPoolExecutor(max_workers=settings.workers)
+        self.stop_event = threading.Event()
+
+    def call(self, api_key, fn, *args):
+        self.rate_limiter.acquire(api_key)
+        try:
+            return fn(*args)
+        except Exception as e:
+            logging.error(f"Daemon Error: {str(e)}")
+            return None
+
+    def refresh(self, key, full=False):
+        """Обновление аккаунта. Выполняется в потоке пула; неудачные части сохраняют прошлые данные."""
+        api_key = self.accounts[key].api_key
+        state = self.states[key]
+        cycle = state.cycles + 1
+        full = full or state.updated_at is None
+
+        user_info = self.call(api_key, get_user_info, api_key) if full or state.user_info is None else None
+        steam_id = (user_info or state.user_info or {}).get("steam_id")
+        stall = self.call(api_key, get_stall_data, api_key, steam_id) if steam_id else None
+
+        inventory = None
+        if full or stall is not None and stall != state.stall or cycle % self.settings.inventory_every == 0:
+            inventory = self.call(api_key, get_inventory_data, api_key)
+        buy_orders = None
+        if full or cycle % self.settings.orders_every == 0:
+            buy_orders = self.call(api_key, get_buy_orders, api_key)
+
+        with self.lock:
+            for part, value in zip(PARTS, (user_info, inventory, stall, buy_orders)):
+                if value is not None:
+                    setattr(state, part, value)
+            state.cycles = cycle
+            state.updated_at = time.time()
+            state.payloads = {}
+            self.in_flight.discard(key)
+
+    def request_refresh(self, keys):
+        """Внеочередное полное обновление (например, после действий в окне или в --headless)."""
+        for key in keys:
+            if key in self.accounts:
+                self.schedule(key, full=True)
+
+    def schedule(self, key, full=False):
+        with self.lock:
+            if key in self.in_flight:
+                return
+            self.in_flight.add(key)
+            self.next_due[key] = time.monotonic() + self.settings.interval
+        self.executor.submit(self.refresh, key, full)
+
+    def run(self):
+        while not self.stop_event.wait(self.TICK):
+            now = time.monotonic()
+            for key, due in list(self.next_due.items()):
+                if due <= now:
+                    self.schedule(key)
+
+    def stop(self):
+        self.stop_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self, keys, parts):
+        """Байты JSON {"accounts": {id: {...}}} только по уже загруженным аккаунтам."""
+        entries = []
+        with self.lock:
+            for key in keys or self.accounts:
+                state = self.states.get(key)
+                if state is not None and state.updated_at is not None:
+                    entries.append(json.dumps(key).encode('utf-8') + b":" + state.payload(parts))
+        return b'{"accounts":{' + b",".join(entries) + b'}}'
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    """
+    GET /health, GET /snapshot?accounts=id,id&parts=inventory,stall, POST /refresh?accounts=id,id.
+    Если задан token, он передаётся в заголовке X-Daemon-Token.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def authorized(self):
+        token = self.server.daemon.settings.token
+        if token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+            self.send_json(403, b'{"error":"Invalid token"}')
+            return False
+        return True
+
+    def send_json(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def query(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = urllib.parse.parse_qs(url.query)
+        keys = [key for value in params.get("accounts", []) for key in value.split(",") if key]
+        parts = tuple(part for value in params.get("parts", []) for part in value.split(",") if part in PARTS)
+        return url.path, keys, parts or PARTS
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        path, keys, parts = self.query()
+        daemon = self.server.daemon
+        if path == "/health":
+            ready = sum(1 for state in daemon.states.values() if state.updated_at is not None)
+            self.send_json(200, json.dumps({"status": "ok", "accounts": len(daemon.accounts),
+                                            "ready": ready}).encode('utf-8'))
+        elif path == "/snapshot":
+            self.send_json(200, daemon.snapshot(keys, parts))
+        else:
+            self.send_json(404, b'{"error":"Not found"}')
+
+    def do_POST(self):
+        if not self.authorized():
+            return
+        path, keys, _ = self.query()
+        if path == "/refresh":
+            self.server.daemon.request_refresh(keys or list(self.server.daemon.accounts))
+            self.send_json(202, b'{"status":"scheduled"}')
+        else:
+            self.send_json(404, b'{"error":"Not found"}')
+
+
+class DaemonClient:
+    """Подключение к запущенному процессу. Ошибки соединения поднимаются как OSError, ответа - как ValueError."""
+    TIMEOUT = 5
+
+    def __init__(self, settings):
+        self.base_url = f"http://{settings.host}:{settings.port}"
+        self.token = settings.token
+        # Локальные запросы не должны идти через системный прокси
+        self.opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+    def request(self, path, method="GET"):
+        req = urllib.request.Request(f"{self.base_url}{path}", method=method,
+                                     headers={TOKEN_HEADER: self.token} if self.token else {})
+        with self.opener.open(req, timeout=self.TIMEOUT) as response:
+            return json.load(response)
+
+    def snapshot(self, api_keys, parts=None):
+        """api_key -> {часть: данные, 'updated_at': ...} для аккаунтов, уже загруженных процессом."""
+        ids = {account_id(api_key): api_key for api_key in api_keys}
+        query = urllib.parse.urlencode({"accounts": ",".join(ids), "parts": ",".join(parts or PARTS)})
+        accounts = self.request(f"/snapshot?{query}").get("accounts", {})
+        return {ids[key]: entry for key, entry in accounts.items() if key in ids}
+
+    def refresh(self, api_keys):
+        query = urllib.parse.urlencode({"accounts": ",".join(account_id(api_key) for api_key in api_keys)})
+        return self.request(f"/refresh?{query}", method="POST")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="csfloat_helper.py --daemon",
+                                     description="Keep account data warm for the window and --headless.")
+    parser.add_argument("--config", default="config.json", help="Path to config.json")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    configure_api(config)
+    accounts = load_accounts(config)
+    if not accounts:
+        print("No API keys found in the config file.", file=sys.stderr)
+        return 2
+    settings = load_daemon_settings(config)
+    if settings.host not in LOOPBACK_HOSTS and not settings.token:
+        print("A token is required when the daemon listens on a non-local address.", file=sys.stderr)
+        return 2
+
+    daemon = SyncDaemon(accounts, settings)
+    try:
+        server = ThreadingHTTPServer((settings.host, settings.port), DaemonHandler)
+    except OSError as e:
+        print(f"Unable to listen on {settings.host}:{settings.port}: {e}", file=sys.stderr)
+        return 1
+    server.daemon_threads = True
+    server.daemon = daemon
+    threading.Thread(target=daemon.run, name="daemon-sync", daemon=True).start()
+    print(f"Serving {len(accounts)} accounts on http://{settings.host}:{settings.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
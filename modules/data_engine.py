@@ -0,0 +1,242 @@
+# modules/data_engine.py
+import time
+import queue
+import logging
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from modules import api
+from modules.api import get_user_info, iter_inventory_data, get_stall_data
+from modules.item_store import ItemStore
+from modules.sync import AutoSync
+
+EngineSettings = namedtuple('EngineSettings', 'enabled workers batch_rows')
+
+DEFAULT_WORKERS = 4  # Аккаунты, загружаемые процессом одновременно
+DEFAULT_BATCH_ROWS = 1000  # Записей инвентаря в одном сообщении
+
+# Сообщения процесса данных: (вид, поколение загрузки, api_key, данные...)
+USER_INFO = "user_info"  # информация о пользователе или None
+ROWS = "rows"  # список InventoryItem.to_row()
+STALL = "stall"  # сокращённые лоты (compact_listing)
+LOADED = "loaded"  # текст ошибки или None
+SYNCED = "synced"  # AccountDelta или None, отпечаток stall
+
+
+def load_engine_settings(config):
+    """Настройки процесса данных из секции "data_engine" конфигурации. По умолчанию выключен."""
+    engine = (config or {}).get("data_engine") or {}
+    try:
+        workers = max(int(engine.get("workers", DEFAULT_WORKERS)), 1)
+        batch_rows = max(int(engine.get("batch_rows", DEFAULT_BATCH_ROWS)), 1)
+    except (TypeError, ValueError):
+        logging.error(f"Invalid data engine settings: {engine}")
+        workers, batch_rows = DEFAULT_WORKERS, DEFAULT_BATCH_ROWS
+    return EngineSettings(bool(engine.get("enabled", False)), workers, batch_rows)
+
+
+def compact_listing(listing):
+    """Лот без полного JSON предмета: только поля, которые используют таблица, синхронизация и наблюдатель."""
+    item = listing.get('item') or {}
+    return {
+        'id': listing.get('id'),
+        'price': listing.get('price', 0),
+        'created_at': listing.get('created_at'),
+        'item': {'asset_id': item.get('asset_id'), 'market_hash_name': item.get('market_hash_name')},
+    }
+
+
+def load_account(send, generation, api_key, steam_id, batch_rows):
+    """
+    Загрузка аккаунта в процессе данных. Информация о пользователе, инвентарь и лоты (по сохранённому
+    Steam ID) запрашиваются параллельно; инвентарь разбирается по мере получения ответа и отправляется
+    пакетами готовых записей, не дожидаясь конца ответа.
+    """
+    errors = []
+
+    def fetch(part, fn, *args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            logging.error(f"API Error ({part}): {str(e)}")
+            errors.append(str(e))
+            return None
+
+    def stream_inventory():
+        items = iter_inventory_data(api_key)
+        if items is None:
+            return
+        batch = []
+        for raw in items:
+            batch.append(ItemStore.make_item(raw, 0).to_row())
+            if len(batch) >= batch_rows:
+                send((ROWS, generation, api_key, batch))
+                batch = []
+        if batch:
+            send((ROWS, generation, api_key, batch))
+
+    with ThreadPoolExecutor(max_workers=3) as parts:
+        user_future = parts.submit(fetch, "user_info", get_user_info, api_key)
+        inventory_future = parts.submit(fetch, "inventory", stream_inventory)
+        stall_future = parts.submit(fetch, "stall", get_stall_data, api_key, steam_id) if steam_id else None
+
+        user_info = user_future.result()
+        send((USER_INFO, generation, api_key, user_info))
+        actual_steam_id = (user_info or {}).get("steam_id")
+        if actual_steam_id and actual_steam_id != steam_id:
+            # Steam ID ещё не сохранён или аккаунт сменился
+            stall_future = parts.submit(fetch, "stall", get_stall_data, api_key, actual_steam_id)
+
+        inventory_future.result()
+        stall = stall_future.result() if stall_future else None
+        if stall is not None:
+            send((STALL, generation, api_key, [compact_listing(listing) for listing in stall]))
+
+    send((LOADED, generation, api_key, errors[0] if errors else None))
+
+
+def sync_account(send, api_key, steam_id, local, fingerprint, inventory_due):
+    """Запросы и сравнение синхронизации (AutoSync.fetch_delta) в процессе данных."""
+    try:
+        delta, fingerprint = AutoSync.fetch_delta(api_key, steam_id, local, fingerprint, inventory_due)
+    except Exception as e:
+        logging.error(f"Sync Error: {str(e)}")
+        delta = None
+    if delta is not None:
+        delta = delta._replace(listed=[compact_listing(listing) for listing in delta.listed],
+                               stall=[compact_listing(listing) for listing in delta.stall])
+    send((SYNCED, 0, api_key, delta, fingerprint))
+
+
+def run_engine(commands, results, settings, api_settings):
+    """Главный цикл процесса данных: команды выполняются в пуле потоков, None завершает процесс."""
+    # Процесс запускается заново, поэтому адрес API и кассета из конфигурации передаются явно
+    api.configure_api(api_settings)
+    executor = ThreadPoolExecutor(max_workers=settings.workers)
+    while True:
+        command = commands.get()
+        if command is None:
+            break
+        kind, generation, api_key, *args = command
+        if kind == "load":
+            executor.submit(load_account, results.put, generation, api_key, *args, settings.batch_rows)
+        elif kind == "sync":
+            executor.submit(sync_account, results.put, api_key, *args)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class DataEngine(QObject):
+    """
+    Отдельный процесс для запросов к API, разбора JSON, подготовки записей таблицы и сравнения при
+    синхронизации. Эта работа не делит GIL с потоком GUI: в GUI приходят только компактные пакеты
+    записей, которые разбираются по таймеру с ограничением времени на тик.
+    """
+    user_info_ready = pyqtSignal(str, object)  # api_key, информация о пользователе или None
+    rows_ready = pyqtSignal(str, object)  # api_key, записи InventoryItem.to_row()
+    stall_ready = pyqtSignal(str, object)  # api_key, лоты
+    account_loaded = pyqtSignal(str, object)  # api_key, текст ошибки или None
+    sync_ready = pyqtSignal(object)  # результат в формате AutoSync.sync_account
+
+    POLL_MS = 15
+    POLL_BUDGET = 0.01  # Секунды GUI-потока на разбор сообщений за один тик
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        # fork скопировал бы в дочерний процесс состояние Qt, поэтому процесс запускается заново
+        self.context = multiprocessing.get_context("spawn")
+        self.commands = None
+        self.results = None
+        self.process = None
+        self.generation = 0
+        self.loading = set()  # Аккаунты текущей загрузки, ещё не завершённые
+        self.syncing = set()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.POLL_MS)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        """Запускает процесс, если он ещё не работает. False - процесс недоступен, нужна загрузка в потоках."""
+        if self.process is not None:
+            return True
+        try:
+            self.commands = self.context.Queue()
+            self.results = self.context.Queue()
+            self.process = self.context.Process(target=run_engine, name="data-engine", daemon=True,
+                                                args=(self.commands, self.results, self.settings, api.api_config()))
+            self.process.start()
+        except (OSError, RuntimeError) as e:
+            logging.error(f"Data Engine Error: {str(e)}")
+            self.process = None
+            return False
+        self.timer.start()
+        return True
+
+    def stop(self):
+        self.timer.stop()
+        if self.process is None:
+            return
+        self.commands.put(None)
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+
+    def load_accounts(self, accounts):
+        """accounts: список (api_key, сохранённый Steam ID); результаты прошлой загрузки отбрасываются."""
+        self.generation += 1
+        self.loading = set()
+        for api_key, steam_id in accounts:
+            self.loading.add(api_key)
+            self.commands.put(("load", self.generation, api_key, steam_id))
+
+    def sync(self, api_key, steam_id, local, fingerprint, inventory_due):
+        self.syncing.add(api_key)
+        self.commands.put(("sync", 0, api_key, steam_id, local, fingerprint, inventory_due))
+
+    @pyqtSlot()
+    def poll(self):
+        deadline = time.perf_counter() + self.POLL_BUDGET
+        while time.perf_counter() < deadline:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                if not self.process.is_alive():
+                    self.handle_exit()
+                return
+            self.dispatch(message)
+
+    def dispatch(self, message):
+        kind, generation, api_key, *payload = message
+        if kind == SYNCED:
+            self.syncing.discard(api_key)
+            delta, fingerprint = payload
+            self.sync_ready.emit({'api_key': api_key, 'delta': delta, 'fingerprint': fingerprint})
+            return
+        if generation != self.generation:
+            return
+        if kind == USER_INFO:
+            self.user_info_ready.emit(api_key, payload[0])
+        elif kind == ROWS:
+            self.rows_ready.emit(api_key, payload[0])
+        elif kind == STALL:
+            self.stall_ready.emit(api_key, payload[0])
+        elif kind == LOADED:
+            self.loading.discard(api_key)
+            self.account_loaded.emit(api_key, payload[0])
+
+    def handle_exit(self):
+        """Процесс завершился сам: незавершённые загрузки и синхронизации закрываются с ошибкой."""
+        logging.error(f"Data Engine Error: process exited with code {self.process.exitcode}")
+        self.timer.stop()
+        self.process = None
+        for api_key in sorted(self.loading):
+            self.account_loaded.emit(api_key, "Data engine process stopped")
+        self.loading = set()
+        for api_key in sorted(self.syncing):
+            self.sync_ready.emit({'api_key': api_key, 'delta': None, 'fingerprint': None})
+        self.syncing = set()
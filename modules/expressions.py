@@ -0,0 +1,472 @@
+# modules/expressions.py
+# Разбор языка выражений buy orders CSFloat в AST за один проход токенизатора.
+# Пример: (DefIndex == 7 and PaintIndex == 474) and FloatValue < 0.07 and HasSticker(3942, -1, 1)
+import os
+import re
+import json
+import hashlib
+import logging
+import itertools
+import operator
+from collections import namedtuple
+from functools import lru_cache
+
+from modules.utils import CACHE_DIR
+
+# Узлы AST
+Compare = namedtuple('Compare', 'field op value')  # FloatValue < 0.07
+Call = namedtuple('Call', 'name args')  # HasSticker(3942, -1, 1)
+And = namedtuple('And', 'terms')
+Or = namedtuple('Or', 'terms')
+Not = namedtuple('Not', 'term')
+
+# Сводка по выражению: то, что нужно для текстового описания ордера
+ExpressionSummary = namedtuple('ExpressionSummary', [
+    'float_min', 'float_max', 'items', 'skins', 'stickers',
+    'paint_seed', 'stattrak', 'souvenir', 'rarity'
+])
+
+KEYWORDS = {'and': 'and', 'or': 'or', 'not': 'not', 'true': True, 'false': False}
+OPERATOR_ALIASES = {'&&': 'and', '||': 'or', '!': 'not'}
+COMPARISON_OPERATORS = {'==', '!=', '<', '<=', '>', '>='}
+# Зеркальный оператор для записи вида "0.07 > FloatValue"
+MIRRORED_OPERATORS = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+# Оператор сравнения под "not": not (FloatValue < 0.07) -> FloatValue >= 0.07
+NEGATED_OPERATORS = {'<': '>=', '<=': '>', '>': '<=', '>=': '<', '==': '!=', '!=': '=='}
+
+TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<op>==|!=|<=|>=|<|>|&&|\|\||!)
+      | (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<comma>,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )''', re.VERBOSE)
+
+
+class ExpressionError(ValueError):
+    """Синтаксическая ошибка в выражении."""
+
+
+def _number(value, convert, name):
+    """Значение из выражения как int/float; ExpressionError вместо ValueError/TypeError."""
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise ExpressionError(f"Invalid value for {name}: {value!r}") from None
+
+
+def _flag(value):
+    """Значение флага (StatTrak, Souvenir): true/false, в том числе строкой, или 1/0; иначе ValueError."""
+    if isinstance(value, str):
+        value = value.lower()
+        if value in ('true', 'false'):
+            return value == 'true'
+    elif value in (0, 1):
+        return bool(value)
+    raise ValueError(value)
+
+
+def tokenize(expression):
+    """Разбивает выражение на список токенов (тип, значение) за один проход."""
+    tokens = []
+    position = 0
+    length = len(expression)
+    while position < length:
+        match = TOKEN_RE.match(expression, position)
+        if not match:
+            if expression[position:].strip():
+                raise ExpressionError(f"Unexpected character at {position}: {expression[position:position + 10]!r}")
+            break
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'number':
+            value = float(value) if any(c in value for c in '.eE') else int(value)
+        elif kind == 'string':
+            value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        elif kind == 'op' and value in OPERATOR_ALIASES:
+            kind, value = 'keyword', OPERATOR_ALIASES[value]
+        elif kind == 'name' and value.lower() in KEYWORDS:
+            keyword = KEYWORDS[value.lower()]
+            kind, value = ('bool', keyword) if isinstance(keyword, bool) else ('keyword', keyword)
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """Рекурсивный спуск: or -> and -> not -> primary."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None or (kind and token[0] != kind) or (value is not None and token[1] != value):
+            raise ExpressionError(f"Expected {value or kind}, got {token[1]!r}")
+        self.position += 1
+        return token
+
+    def accept(self, kind, value=None):
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self.parse_or()
+        if self.position != len(self.tokens):
+            raise ExpressionError(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.accept('keyword', 'or'):
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else Or(tuple(_flatten(terms, Or)))
+
+    def parse_and(self):
+        terms = [self.parse_not()]
+        while self.accept('keyword', 'and'):
+            terms.append(self.parse_not())
+        return terms[0] if len(terms) == 1 else And(tuple(_flatten(terms, And)))
+
+    def parse_not(self):
+        if self.accept('keyword', 'not'):
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_literal(self):
+        kind, value = self.peek()
+        if kind in ('number', 'string', 'bool'):
+            self.position += 1
+            return value
+        raise ExpressionError(f"Expected value, got {value!r}")
+
+    def parse_primary(self):
+        kind, value = self.peek()
+        if kind == 'lparen':
+            self.position += 1
+            node = self.parse_or()
+            self.take('rparen')
+            return node
+
+        if kind == 'name':
+            self.position += 1
+            if self.accept('lparen'):
+                args = []
+                if not self.accept('rparen'):
+                    args.append(self.parse_literal())
+                    while self.accept('comma'):
+                        args.append(self.parse_literal())
+                    self.take('rparen')
+                return Call(value, tuple(args))
+            op_kind, op = self.peek()
+            if op_kind == 'op' and op in COMPARISON_OPERATORS:
+                self.position += 1
+                return Compare(value, op, self.parse_literal())
+            # Поле без сравнения, например "StatTrak"
+            return Compare(value, '==', True)
+
+        if kind in ('number', 'string', 'bool'):
+            # Запись вида "0.07 > FloatValue"
+            literal = self.parse_literal()
+            _, op = self.take('op')
+            if op not in COMPARISON_OPERATORS:
+                raise ExpressionError(f"Expected comparison, got {op!r}")
+            _, field = self.take('name')
+            return Compare(field, MIRRORED_OPERATORS[op], literal)
+
+        raise ExpressionError(f"Unexpected token {value!r}")
+
+
+def _flatten(terms, node_type):
+    """Раскрывает вложенные And/Or одного типа: a and (b and c) -> And(a, b, c)."""
+    for term in terms:
+        if isinstance(term, node_type):
+            yield from term.terms
+        else:
+            yield term
+
+
+@lru_cache(maxsize=8192)
+def parse(expression):
+    """Разбирает выражение в AST. Результат кэшируется по тексту выражения."""
+    return _Parser(tokenize(expression)).parse()
+
+
+def walk(node):
+    """Обход всех узлов AST в глубину."""
+    yield node
+    if isinstance(node, (And, Or)):
+        for term in node.terms:
+            yield from walk(term)
+    elif isinstance(node, Not):
+        yield from walk(node.term)
+
+
+def _positive(node):
+    """
+    Обход узлов, которые действуют как условия на предмет. Под "not" учитывается только сравнение
+    с обратным оператором; остальное содержимое "not" в сводку не попадает.
+    """
+    if isinstance(node, Not):
+        term = node.term
+        if isinstance(term, Not):
+            yield from _positive(term.term)
+        elif isinstance(term, Compare):
+            yield Compare(term.field, NEGATED_OPERATORS[term.op], term.value)
+        return
+    yield node
+    if isinstance(node, (And, Or)):
+        for term in node.terms:
+            yield from _positive(term)
+
+
+def _skin_pair(node):
+    """(DefIndex, PaintIndex) для узла And, содержащего оба равенства."""
+    def_index = paint_index = None
+    for term in node.terms:
+        if isinstance(term, Compare) and term.op == '==':
+            if term.field == 'DefIndex':
+                def_index = _number(term.value, int, 'DefIndex')
+            elif term.field == 'PaintIndex':
+                paint_index = _number(term.value, int, 'PaintIndex')
+    if def_index is not None and paint_index is not None:
+        return def_index, paint_index
+    return None
+
+
+def _sticker_args(node):
+    """(id, слот, количество) вызова HasSticker; слот -1 - любой."""
+    args = [_number(arg, int, 'HasSticker') for arg in node.args[:3]]
+    return args[0], args[1] if len(args) > 1 else -1, args[2] if len(args) > 2 else 1
+
+
+@lru_cache(maxsize=8192)
+def summarize(expression):
+    """Сводка условий выражения для описания ордера. Поднимает ExpressionError."""
+    float_min = float_max = None
+    items = []
+    skins = []
+    stickers = []
+    paint_seed = None
+    stattrak = souvenir = False
+    rarity = None
+
+    for node in _positive(parse(expression)):
+        if isinstance(node, And):
+            pair = _skin_pair(node)
+            if pair and pair not in skins:
+                skins.append(pair)
+        elif isinstance(node, Call) and node.name == 'HasSticker' and node.args:
+            stickers.append(_sticker_args(node))
+        elif isinstance(node, Compare):
+            field, op, value = node
+            if field == 'FloatValue':
+                value = _number(value, float, field)
+                if op in ('<', '<='):
+                    float_max = value if float_max is None else min(float_max, value)
+                elif op in ('>', '>='):
+                    float_min = value if float_min is None else max(float_min, value)
+            elif field == 'Item' and op == '==':
+                items.append(value)
+            elif field == 'PaintSeed' and op == '==' and paint_seed is None:
+                paint_seed = str(value)
+            elif field == 'StatTrak' and op == '==' and _number(value, _flag, field):
+                stattrak = True
+            elif field == 'Souvenir' and op == '==' and _number(value, _flag, field):
+                souvenir = True
+            elif field == 'Rarity' and op == '==' and rarity is None:
+                rarity = _number(value, int, field)
+
+    return ExpressionSummary(float_min, float_max, tuple(items), tuple(skins), tuple(stickers),
+                             paint_seed, stattrak, souvenir, rarity)
+
+
+# Поля выражения -> атрибуты InventoryItem и приведение значения из выражения
+FIELD_ATTRIBUTES = {
+    'FloatValue': ('float_value', float),
+    'DefIndex': ('def_index', int),
+    'PaintIndex': ('paint_index', int),
+    'PaintSeed': ('paint_seed', int),
+    'Rarity': ('rarity', int),
+    'StatTrak': ('stattrak', _flag),
+    'Souvenir': ('souvenir', _flag),
+    'Item': ('name', str),
+}
+COMPARATORS = {'==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+               '>': operator.gt, '>=': operator.ge}
+
+# Скомпилированное выражение: предикат над InventoryItem и варианты ключей индекса инвентаря
+CompiledExpression = namedtuple('CompiledExpression', 'predicate index_options')
+
+# Равенства, по которым индексируется инвентарь: поле выражения -> вид ключа
+INDEXED_FIELDS = {'DefIndex': 'def', 'PaintIndex': 'paint', 'PaintSeed': 'seed', 'Rarity': 'rarity', 'Item': 'name'}
+
+
+def _all(terms):
+    """Конъюнкция предикатов цепочкой замыканий, без генератора на каждый предмет."""
+    first = terms[0]
+    if len(terms) == 1:
+        return first
+    rest = _all(terms[1:])
+    return lambda item: first(item) and rest(item)
+
+
+def _any(terms):
+    first = terms[0]
+    if len(terms) == 1:
+        return first
+    rest = _any(terms[1:])
+    return lambda item: first(item) or rest(item)
+
+
+def _compile_node(node):
+    """AST -> функция item -> bool. Поднимает ExpressionError для неподдерживаемых полей и функций."""
+    if isinstance(node, And):
+        return _all([_compile_node(term) for term in node.terms])
+    if isinstance(node, Or):
+        return _any([_compile_node(term) for term in node.terms])
+    if isinstance(node, Not):
+        term = _compile_node(node.term)
+        return lambda item: not term(item)
+    if isinstance(node, Call):
+        if node.name != 'HasSticker' or not node.args:
+            raise ExpressionError(f"Unsupported function {node.name!r}")
+        sticker_id, slot, qty = _sticker_args(node)
+        return lambda item: sum(1 for sticker in item.stickers
+                                if sticker[0] == sticker_id and (slot == -1 or sticker[1] == slot)) >= qty
+
+    field = FIELD_ATTRIBUTES.get(node.field)
+    if field is None:
+        raise ExpressionError(f"Unsupported field {node.field!r}")
+    attribute, convert = field
+    compare = COMPARATORS[node.op]
+    try:
+        value = convert(node.value)
+    except (TypeError, ValueError):
+        raise ExpressionError(f"Invalid value for {node.field}: {node.value!r}")
+    get = operator.attrgetter(attribute)
+    if attribute in ('stattrak', 'souvenir', 'name'):
+        # Поля без пропусков в InventoryItem
+        return lambda item: compare(get(item), value)
+    return lambda item: (actual := get(item)) is not None and compare(actual, value)
+
+
+def _index_options(node):
+    """
+    Варианты ключей индекса: подходящий предмет обязан попасть в корзину хотя бы одного ключа
+    каждого варианта. Ключи: ('skin', DefIndex, PaintIndex), ('def', DefIndex), ('name', ...) и т.д.
+    Пустой список - выражение не ограничивает предметы по индексу.
+    """
+    if isinstance(node, Compare):
+        kind = INDEXED_FIELDS.get(node.field)
+        if kind and node.op == '==':
+            value = node.value if kind == 'name' else _number(node.value, int, node.field)
+            return [frozenset({(kind, value)})]
+        return []
+    if isinstance(node, Call):
+        if node.name == 'HasSticker' and node.args:
+            return [frozenset({('sticker', _number(node.args[0], int, 'HasSticker'))})]
+        return []
+    if isinstance(node, And):
+        options = []
+        pair = _skin_pair(node)
+        if pair:
+            options.append(frozenset({('skin',) + pair}))
+        for term in node.terms:
+            options.extend(_index_options(term))
+        return options
+    if isinstance(node, Or):
+        keys = set()
+        for term in node.terms:
+            term_options = _index_options(term)
+            if not term_options:
+                return []
+            keys |= term_options[0]
+        return [frozenset(keys)]
+    return []
+
+
+@lru_cache(maxsize=8192)
+def compile_expression(expression):
+    """Компиляция выражения в предикат для сопоставления с инвентарём. Поднимает ExpressionError."""
+    node = parse(expression)
+    return CompiledExpression(_compile_node(node), _index_options(node))
+
+
+# Предел числа описаний в дисковом кэше
+MAX_DESCRIPTIONS = 20000
+
+
+def expression_hash(expression):
+    return hashlib.sha1(expression.encode('utf-8')).hexdigest()
+
+
+class DescriptionCache:
+    """
+    Дисковый кэш готовых описаний ордеров: hash(выражения) -> (описание, ошибка).
+    Кэш сбрасывается, если изменилась версия справочников скинов/стикеров. Хранится не больше
+    max_entries описаний: при переполнении вытесняются те, что дольше всего не запрашивались.
+    """
+
+    def __init__(self, version="", path=None, max_entries=MAX_DESCRIPTIONS):
+        self.path = path or os.path.join(CACHE_DIR, "expression_descriptions.json")
+        self.version = str(version)
+        self.max_entries = max_entries
+        self.entries = {}  # Порядок вставки - порядок последнего использования, последние в конце
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("version") == self.version:
+                self.entries = data.get("entries", {})
+                self.evict()
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            logging.error(f"Error loading expression cache: {str(e)}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump({"version": self.version, "entries": self.entries}, file, ensure_ascii=False)
+            self.dirty = False
+        except OSError as e:
+            logging.error(f"Error saving expression cache: {str(e)}")
+
+    def evict(self):
+        """Удаление самых старых описаний сверх max_entries."""
+        excess = len(self.entries) - self.max_entries
+        if excess > 0:
+            for key in list(itertools.islice(self.entries, excess)):
+                del self.entries[key]
+            self.dirty = True
+
+    def get(self, expression):
+        key = expression_hash(expression)
+        entry = self.entries.pop(key, None)
+        if not entry:
+            return None
+        self.entries[key] = entry
+        return tuple(entry)
+
+    def put(self, expression, description, has_error):
+        key = expression_hash(expression)
+        self.entries.pop(key, None)
+        self.entries[key] = [description, has_error]
+        self.dirty = True
+        self.evict()
@@ -0,0 +1,88 @@
+# modules/inventory_delegates.py
+from PyQt6.QtCore import Qt, QEvent, QRect, QSize
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem, QToolTip
+
+# Данные ячеек, которые рисуют делегаты вместо виджетов в ячейках
+STICKERS_ROLE = Qt.ItemDataRole.UserRole + 1  # Кортеж (название, url картинки) стикеров предмета
+SUGGESTION_ROLE = Qt.ItemDataRole.UserRole + 2  # Текст подсказки цены
+
+ICON_SIZE = 20
+SPACING = 4
+SUGGESTION_COLOR = QColor("gray")
+
+
+class StickerDelegate(QStyledItemDelegate):
+    """
+    Картинки стикеров в ячейке. pixmap_for(url) возвращает готовую картинку или None, если она ещё
+    загружается; рисуются только видимые ячейки, поэтому число строк не влияет на раскладку таблицы.
+    """
+
+    def __init__(self, pixmap_for, parent=None):
+        super().__init__(parent)
+        self.pixmap_for = pixmap_for
+
+    @staticmethod
+    def sticker_rects(rect, count):
+        top = rect.top() + (rect.height() - ICON_SIZE) // 2
+        return [QRect(rect.left() + SPACING + number * (ICON_SIZE + SPACING), top, ICON_SIZE, ICON_SIZE)
+                for number in range(count)]
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)  # Фон и выделение; текста в ячейке нет
+        stickers = index.data(STICKERS_ROLE)
+        if not stickers:
+            return
+        painter.save()
+        painter.setClipRect(option.rect)
+        for (_, url), rect in zip(stickers, self.sticker_rects(option.rect, len(stickers))):
+            pixmap = self.pixmap_for(url)
+            if pixmap is not None:
+                painter.drawPixmap(rect.left() + (ICON_SIZE - pixmap.width()) // 2,
+                                   rect.top() + (ICON_SIZE - pixmap.height()) // 2, pixmap)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        stickers = index.data(STICKERS_ROLE) or ()
+        return QSize(SPACING + len(stickers) * (ICON_SIZE + SPACING), ICON_SIZE)
+
+    def helpEvent(self, event, view, option, index):
+        """Подсказка с названием стикера под курсором."""
+        stickers = index.data(STICKERS_ROLE)
+        if event.type() != QEvent.Type.ToolTip or not stickers:
+            return super().helpEvent(event, view, option, index)
+        for (name, _), rect in zip(stickers, self.sticker_rects(option.rect, len(stickers))):
+            if rect.contains(event.pos()):
+                QToolTip.showText(event.globalPos(), name, view)
+                return True
+        QToolTip.hideText()
+        return True
+
+
+class PriceDelegate(QStyledItemDelegate):
+    """Цена лота с логотипом (иконка и текст ячейки) и серая подсказка цены после неё."""
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.decorationSize = QSize(ICON_SIZE, ICON_SIZE)
+        option.textElideMode = Qt.TextElideMode.ElideNone  # Узкая колонка обрезает "$", а не цифры цены
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        suggestion = index.data(SUGGESTION_ROLE)
+        if not suggestion:
+            return
+        style_option = QStyleOptionViewItem(option)
+        self.initStyleOption(style_option, index)
+        widget = style_option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        text_rect = style.subElementRect(QStyle.SubElement.SE_ItemViewItemText, style_option, widget)
+        metrics = style_option.fontMetrics
+        if style_option.text:
+            text_rect.setLeft(text_rect.left() + metrics.horizontalAdvance(style_option.text) + SPACING * 2)
+        painter.save()
+        painter.setFont(style_option.font)
+        painter.setPen(SUGGESTION_COLOR)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                         metrics.elidedText(suggestion, Qt.TextElideMode.ElideRight, text_rect.width()))
+        painter.restore()
@@ -0,0 +1,166 @@
+# modules/item_store.py
+import re
+import sys
+
+COLLECTION_PREFIX_RE = re.compile(r'^The\s+')
+WEAR_RE = re.compile(r'\((.*?)\)')
+
+
+def _intern(value):
+    return sys.intern(value) if value else ""
+
+
+class InventoryItem:
+    """
+    Компактная запись предмета инвентаря: только поля, которые используют таблица, фильтры и действия.
+    Повторяющиеся строки (название, коллекция, износ, стикеры) интернированы, аккаунт хранится кодом.
+    """
+    __slots__ = ('asset_id', 'name', 'float_value', 'rarity', 'account', 'collection', 'wear',
+                 'def_index', 'paint_index', 'paint_seed', 'stattrak', 'souvenir', 'stickers')
+
+    def __init__(self, asset_id, name, float_value, rarity, account, collection, wear,
+                 def_index, paint_index, paint_seed, stattrak, souvenir, stickers):
+        self.asset_id = asset_id
+        self.name = name
+        self.float_value = float_value
+        self.rarity = rarity
+        self.account = account
+        self.collection = collection
+        self.wear = wear
+        self.def_index = def_index
+        self.paint_index = paint_index
+        self.paint_seed = paint_seed
+        self.stattrak = stattrak
+        self.souvenir = souvenir
+        self.stickers = stickers  # Кортеж (sticker_id, slot, name, icon_url)
+
+    def sticker_names(self):
+        return " ".join(sticker[2] for sticker in self.stickers)
+
+    def to_row(self):
+        """Кортеж полей без кода аккаунта - для передачи между процессами (modules/data_engine.py)."""
+        return (self.asset_id, self.name, self.float_value, self.rarity, self.collection, self.wear,
+                self.def_index, self.paint_index, self.paint_seed, self.stattrak, self.souvenir, self.stickers)
+
+
+class ItemStore:
+    """
+    Хранилище предметов инвентаря всех аккаунтов по asset_id.
+    Полный JSON предмета не хранится: записи содержат только поля, нужные интерфейсу.
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.accounts = []  # Код аккаунта -> API-ключ
+        self.account_codes = {}
+        self.account_items = {}  # Код аккаунта -> множество asset_id
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def clear(self):
+        self.items.clear()
+        self.account_items.clear()
+
+    def account_code(self, api_key):
+        code = self.account_codes.get(api_key)
+        if code is None:
+            code = len(self.accounts)
+            self.accounts.append(api_key)
+            self.account_codes[api_key] = code
+        return code
+
+    def api_key(self, item):
+        """API-ключ аккаунта, которому принадлежит предмет."""
+        return self.accounts[item.account]
+
+    def get(self, asset_id):
+        return self.items.get(asset_id)
+
+    def account_assets(self, api_key):
+        """asset_id предметов аккаунта."""
+        code = self.account_codes.get(api_key)
+        return self.account_items.get(code, set()) if code is not None else set()
+
+    def remove(self, asset_id):
+        item = self.items.pop(asset_id, None)
+        if item is not None:
+            self.account_items.get(item.account, set()).discard(asset_id)
+        return item
+
+    def add_items(self, raw_items, api_key):
+        """Преобразует JSON предметов аккаунта в записи и возвращает их в исходном порядке."""
+        account = self.account_code(api_key)
+        assets = self.account_items.setdefault(account, set())
+        records = []
+        for raw in raw_items:
+            record = self.make_item(raw, account)
+            self.items[record.asset_id] = record
+            assets.add(record.asset_id)
+            records.append(record)
+        return records
+
+    def add_rows(self, rows, api_key):
+        """Добавляет записи, подготовленные процессом данных (InventoryItem.to_row), в исходном порядке."""
+        account = self.account_code(api_key)
+        assets = self.account_items.setdefault(account, set())
+        records = []
+        for (asset_id, name, float_value, rarity, collection, wear, def_index, paint_index, paint_seed,
+             stattrak, souvenir, stickers) in rows:
+            # После передачи между процессами строки снова интернируются
+            record = InventoryItem(
+                asset_id, _intern(name), float_value, rarity, account, _intern(collection), _intern(wear),
+                def_index, paint_index, paint_seed, stattrak, souvenir,
+                tuple((sticker_id, slot, _intern(sticker_name), _intern(icon_url))
+                      for sticker_id, slot, sticker_name, icon_url in stickers))
+            self.items[asset_id] = record
+            assets.add(asset_id)
+            records.append(record)
+        return records
+
+    @staticmethod
+    def make_rows(raw_items):
+        """Записи для add_rows из JSON предметов (можно передать поток). Вызывается вне потока GUI."""
+        return [ItemStore.make_item(raw, 0).to_row() for raw in raw_items]
+
+    @staticmethod
+    def make_item(raw, account):
+        name = raw.get("market_hash_name", "")
+
+        collection = COLLECTION_PREFIX_RE.sub('', raw.get("collection") or "N/A")
+
+        # Износ из поля 'wear_name', иначе из названия предмета
+        wear = raw.get("wear_name")
+        if not wear:
+            match = WEAR_RE.search(name)
+            wear = match.group(1) if match else "N/A"
+
+        stickers = tuple(
+            (sticker.get("stickerId"), sticker.get("slot", -1), _intern(sticker.get("name", "Unknown")),
+             _intern(sticker.get("icon_url")))
+            for sticker in raw.get("stickers") or ()
+        )
+
+        try:
+            rarity = int(raw.get("rarity", 1))
+        except (TypeError, ValueError):
+            rarity = 1
+
+        return InventoryItem(
+            asset_id=raw.get("asset_id"),
+            name=_intern(name),
+            float_value=raw.get("float_value"),
+            rarity=rarity,
+            account=account,
+            collection=_intern(collection),
+            wear=_intern(wear),
+            def_index=raw.get("def_index"),
+            paint_index=raw.get("paint_index"),
+            paint_seed=raw.get("paint_seed"),
+            stattrak=bool(raw.get("is_stattrak")),
+            souvenir=bool(raw.get("is_souvenir")),
+            stickers=stickers,
+        )
@@ -0,0 +1,122 @@
+# modules/json_stream.py
+import re
+import json
+import codecs
+
+try:
+    import orjson  # Необязательный быстрый декодер: pip install orjson
+except ImportError:
+    orjson = None
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+_decoder = json.JSONDecoder()
+
+
+def loads(data):
+    """Разбор JSON (bytes или str) через orjson, если он установлен, иначе через json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load(fp):
+    """Замена json.load для ответов небольшого размера."""
+    return loads(fp.read())
+
+
+class _Reader:
+    """Текстовый буфер поверх потока байтов: дочитывается блоками, прочитанное начало отбрасывается."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Дочитывает следующий блок. False - поток закончился."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if self.pos > len(self.buffer) // 2:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        if not chunk:
+            self.eof = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.text_decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Первый непробельный символ с текущей позиции или '' в конце потока."""
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, characters):
+        character = self.peek()
+        if character not in characters:
+            raise ValueError(f"Expected one of {characters!r} at position {self.pos}, got {character!r}")
+        self.pos += 1
+        return character
+
+    def value(self):
+        """Следующее JSON-значение целиком; недостающие байты дочитываются."""
+        while True:
+            self.peek()  # raw_decode не пропускает пробелы перед значением
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Число на границе блока могло быть обрезано ("12" вместо "123")
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def find_key(self, key):
+        """Переходит к значению key корневого объекта; False - ключа нет."""
+        self.expect('{')
+        if self.peek() == '}':
+            return False
+        while True:
+            name = self.value()
+            self.expect(':')
+            if name == key:
+                return True
+            self.value()
+            if self.expect(',}') == '}':
+                return False
+
+
+def iter_array(fp, key=None, chunk_size=CHUNK_SIZE):
+    """
+    Элементы JSON-массива по мере чтения потока fp: корневого массива или массива key корневого объекта.
+    В памяти одновременно находится один блок ответа, а не весь ответ и его копия в str.
+    Если массива нет, ничего не возвращает. Ошибки разбора поднимаются как ValueError.
+    """
+    reader = _Reader(fp, chunk_size)
+    first = reader.peek()
+    if first == '{' and key is not None:
+        if not reader.find_key(key) or reader.peek() != '[':
+            return
+    elif first != '[':
+        return
+
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(',]') == ']':
+            return
@@ -0,0 +1,526 @@
+# modules/mock_server.py
+# Локальная замена csfloat.com для нагрузочной проверки без сети и настоящих ключей:
+#   python -m modules.mock_server --accounts 50 --items 10000 --write-config mock_config.json
+#   python csfloat_helper.py  (config.json с "api_base_url" и ключами из mock_config.json)
+# Инвентарь генерируется детерминированно при каждом запросе, в памяти хранятся только лоты и ордера.
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import urllib.parse
+from collections import namedtuple, Counter
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from modules.rate_limit import RateLimiter
+
+MockSettings = namedtuple('MockSettings', 'accounts items listed orders latency jitter bandwidth error_rate rate '
+                                          'kyc_limit seed')
+
+DEFAULT_PORT = 8780
+API_PREFIX = "/api/v1"
+ASSET_BASE = 20000000000  # asset_id = ASSET_BASE + (номер аккаунта << 24) + номер предмета
+ID_BASE = 900000000000000000
+STREAM_BATCH = 500  # Предметов инвентаря в одном блоке chunked-ответа
+WRITE_BLOCK = 64 * 1024
+
+WEAPONS = [(7, "AK-47"), (16, "M4A4"), (60, "M4A1-S"), (9, "AWP"), (1, "Desert Eagle"), (61, "USP-S"),
+           (4, "Glock-18"), (3, "Five-SeveN"), (13, "Galil AR"), (10, "FAMAS"), (8, "AUG"), (39, "SG 553")]
+SKINS = [(282, "Redline", "The Phoenix Collection", 4), (44, "Case Hardened", "The Arms Deal Collection", 5),
+         (38, "Fade", "The Assault Collection", 6), (12, "Crimson Web", "The Arms Deal 2 Collection", 4),
+         (180, "Fire Serpent", "The Bravo Collection", 6), (430, "Hyper Beast", "The Falchion Collection", 5),
+         (2, "Groundwater", "The Lake Collection", 1), (5, "Forest DDPAT", "The Safehouse Collection", 1),
+         (17, "Urban DDPAT", "The Dust 2 Collection", 2), (232, "Blue Laminate", "The Mirage Collection", 3)]
+WEARS = [("Factory New", 0.0, 0.07), ("Minimal Wear", 0.07, 0.15), ("Field-Tested", 0.15, 0.38),
+         ("Well-Worn", 0.38, 0.45), ("Battle-Scarred", 0.45, 1.0)]
+STICKERS = [(1, "Shooter"), (76, "Crown (Foil)"), (85, "Headhunter (Foil)"), (359, "Titan | Katowice 2014"),
+            (4682, "Natus Vincere | Stockholm 2021"), (5006, "Battle Scarred")]
+
+# Прозрачная картинка 1x1 для аватаров и наклеек
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082")
+
+
+def iso_time(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def make_item(seed, account, index, icon_base):
+    """Предмет инвентаря: одно и то же значение для (seed, account, index) при каждом запросе."""
+    rng = random.Random((seed << 40) | (account << 24) | index)
+    def_index, weapon = rng.choice(WEAPONS)
+    paint_index, skin, collection, rarity = rng.choice(SKINS)
+    wear, min_float, max_float = rng.choice(WEARS)
+    stattrak = rng.random() < 0.1
+    souvenir = not stattrak and rng.random() < 0.03
+    prefix = "StatTrak™ " if stattrak else "Souvenir " if souvenir else ""
+    stickers = []
+    if rng.random() < 0.3:
+        for slot in range(rng.randint(1, 4)):
+            sticker_id, name = rng.choice(STICKERS)
+            stickers.append({"stickerId": sticker_id, "slot": slot, "name": name,
+                             "icon_url": f"{icon_base}/icons/sticker-{sticker_id}.png"})
+    return {
+        "asset_id": str(ASSET_BASE + (account << 24) + index),
+        "market_hash_name": f"{prefix}{weapon} | {skin} ({wear})",
+        "wear_name": wear,
+        "float_value": rng.uniform(min_float, max_float),
+        "paint_seed": rng.randint(0, 1000),
+        "def_index": def_index,
+        "paint_index": paint_index,
+        "rarity": rarity,
+        "collection": collection,
+        "is_stattrak": stattrak,
+        "is_souvenir": souvenir,
+        "stickers": stickers,
+    }
+
+
+def base_price(market_hash_name):
+    """Условная рыночная цена в центах, одинаковая для одного названия."""
+    digest = hashlib.sha1(market_hash_name.encode('utf-8')).digest()
+    return 50 + int.from_bytes(digest[:4], 'big') % 50000
+
+
+class MockAccount:
+    """Синтетический аккаунт. Лоты хранятся как [id, номер предмета, цена, created_at]."""
+
+    def __init__(self, number, settings):
+        self.number = number
+        self.api_key = "mock_" + hashlib.sha1(f"{settings.seed}:{number}".encode('utf-8')).hexdigest()[:24]
+        self.steam_id = str(76561198000000000 + number)
+        self.listings = {}  # id лота -> [id, номер предмета, цена, created_at]
+        self.listed = {}  # номер предмета -> id лота
+        self.closed = {}  # id снятого лота -> [id, номер предмета, цена, created_at]
+        self.orders = []  # Новые первыми
+        self.version = 0  # Меняется при каждом изменении stall (ETag)
+
+
+class MockState:
+    """Аккаунты, счётчики id и статистика запросов. Изменения выполняются под self.lock."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.next_id = ID_BASE
+        self.rate_limiter = RateLimiter(rate=settings.rate) if settings.rate else None
+        self.stats = Counter()
+        self.accounts = [MockAccount(number, settings) for number in range(settings.accounts)]
+        self.by_key = {account.api_key: account for account in self.accounts}
+        for account in self.accounts:
+            self.populate(account)
+
+    def new_id(self):
+        self.next_id += 1
+        return str(self.next_id)
+
+    def populate(self, account):
+        """Начальные лоты (доля listed инвентаря) и buy orders."""
+        rng = random.Random(f"{self.settings.seed}:{account.number}")
+        for index in range(0, self.settings.items):
+            if rng.random() < self.settings.listed:
+                item = make_item(self.settings.seed, account.number, index, "")
+                created_at = iso_time(self.started - rng.uniform(0, 30 * 86400))
+                price = int(base_price(item["market_hash_name"]) * rng.uniform(0.9, 1.3))
+                self.add_listing(account, index, price, created_at)
+        for _ in range(self.settings.orders):
+            item = make_item(self.settings.seed, account.number, rng.randrange(max(self.settings.items, 1)), "")
+            price = int(base_price(item["market_hash_name"]) * rng.uniform(0.6, 0.9))
+            created_at = iso_time(self.started - rng.uniform(0, 30 * 86400))
+            account.orders.append(self.make_order(item["market_hash_name"], None, price, rng.randint(1, 5),
+                                                  created_at))
+        account.orders.sort(key=lambda order: order["created_at"], reverse=True)
+
+    def add_listing(self, account, index, price, created_at):
+        listing = [self.new_id(), index, price, created_at]
+        account.listings[listing[0]] = listing
+        account.listed[index] = listing[0]
+        account.version += 1
+        return listing
+
+    def make_order(self, market_hash_name, expression, price, qty, created_at):
+        order = {"id": self.new_id(), "created_at": created_at, "qty": qty, "price": price}
+        if expression:
+            order["expression"] = expression
+        else:
+            order["market_hash_name"] = market_hash_name
+        return order
+
+    def listing_json(self, account, listing, icon_base):
+        listing_id, index, price, created_at = listing
+        return {"id": listing_id, "created_at": created_at, "type": "buy_now", "price": price, "state": "listed",
+                "item": make_item(self.settings.seed, account.number, index, icon_base)}
+
+    def item_index(self, account, asset_id):
+        """Номер предмета аккаунта по asset_id или None."""
+        try:
+            value = int(asset_id) - ASSET_BASE
+        except (TypeError, ValueError):
+            return None
+        if value < 0 or value >> 24 != account.number or (value & 0xFFFFFF) >= self.settings.items:
+            return None
+        return value & 0xFFFFFF
+
+
+class MockError(Exception):
+    """Ответ с ошибкой: статус и JSON-тело."""
+
+    def __init__(self, status, message, code=None, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"message": message} if code is None else {"code": code, "message": message}
+        self.headers = headers or {}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Эндпоинты, которые использует modules/api.py, с задержкой, ошибками и ответами 429 из настроек."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        ("GET", re.compile(r"/me"), "user_info"),
+        ("GET", re.compile(r"/me/inventory"), "inventory"),
+        ("GET", re.compile(r"/users/(?P<steam_id>[^/]+)/stall"), "stall"),
+        ("GET", re.compile(r"/listings"), "market_listings"),
+        ("GET", re.compile(r"/listings/(?P<listing_id>[^/]+)"), "get_listing"),
+        ("POST", re.compile(r"/listings"), "create_listing"),
+        ("PATCH", re.compile(r"/listings/(?P<listing_id>[^/]+)"), "change_listing"),
+        ("DELETE", re.compile(r"/listings/(?P<listing_id>[^/]+)"), "delete_listing"),
+        ("GET", re.compile(r"/me/buy-orders"), "buy_orders"),
+        ("POST", re.compile(r"/buy-orders"), "create_order"),
+        ("DELETE", re.compile(r"/buy-orders/(?P<order_id>[^/]+)"), "delete_order"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def handle_request(self, method):
+        url = urllib.parse.urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            if url.path.startswith("/icons/"):
+                self.send_body(200, [PIXEL_PNG], content_type="image/png")
+                return
+            if url.path == "/mock/stats":
+                self.send_json(200, self.stats())
+                return
+            route, params = self.match(method, url.path)
+            self.state.stats[f"{method} {route}"] += 1
+            account = self.check_request()
+            handler = getattr(self, f"route_{route}")
+            handler(account, urllib.parse.parse_qs(url.query), self.parse_body(body), **params)
+        except MockError as e:
+            self.state.stats[f"status {e.status}"] += 1
+            self.send_json(e.status, e.body, e.headers)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def match(self, method, path):
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):]
+            for route_method, pattern, route in self.ROUTES:
+                match = pattern.fullmatch(path)
+                if match and route_method == method:
+                    return route, match.groupdict()
+        raise MockError(404, "Not found")
+
+    def check_request(self):
+        """Задержка, ключ, ограничение частоты и случайные ошибки - в таком порядке, до изменения данных."""
+        settings = self.state.settings
+        if settings.latency or settings.jitter:
+            time.sleep(settings.latency + random.uniform(0, settings.jitter))
+        account = self.state.by_key.get(self.headers.get("Authorization", ""))
+        if account is None:
+            raise MockError(401, "Invalid API key")
+        if self.state.rate_limiter is not None:
+            wait = self.state.rate_limiter.try_acquire(account.api_key)
+            if wait:
+                raise MockError(429, "Too many requests", headers={"Retry-After": str(max(int(wait + 0.999), 1))})
+        if settings.error_rate and random.random() < settings.error_rate:
+            raise MockError(random.choice((500, 502, 503)), "Internal server error")
+        return account
+
+    @staticmethod
+    def parse_body(body):
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise MockError(400, "Invalid JSON body")
+        if not isinstance(data, dict):
+            raise MockError(400, "Invalid JSON body")
+        return data
+
+    @staticmethod
+    def int_param(query, name, default):
+        try:
+            return int((query.get(name) or [default])[0])
+        except ValueError:
+            raise MockError(400, f"Invalid {name}")
+
+    def icon_base(self):
+        return f"http://{self.headers.get('Host') or '127.0.0.1'}"
+
+    def stats(self):
+        with self.state.lock:
+            return {"uptime": round(time.time() - self.state.started, 1), "accounts": len(self.state.accounts),
+                    "requests": dict(sorted(self.state.stats.items()))}
+
+    # Ответы
+
+    def send_body(self, status, chunks, content_type="application/json", headers=None, chunked=False):
+        """Тело по блокам с ограничением скорости bandwidth (МБ/с); chunked - без Content-Length."""
+        if not chunked:
+            chunks = [b"".join(chunks)]
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(chunks[0])))
+        self.end_headers()
+
+        bandwidth = self.state.settings.bandwidth * 1024 * 1024
+        for chunk in chunks:
+            for start in range(0, len(chunk), WRITE_BLOCK):
+                block = chunk[start:start + WRITE_BLOCK]
+                if chunked:
+                    block = b"%x\r\n" % len(block) + block + b"\r\n"
+                self.wfile.write(block)
+                if bandwidth:
+                    time.sleep(len(block) / bandwidth)
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+    def send_json(self, status, data, headers=None):
+        self.send_body(status, [json.dumps(data).encode('utf-8')], headers=headers)
+
+    # Эндпоинты
+
+    def route_user_info(self, account, query, data):
+        self.send_json(200, {"user": {
+            "steam_id": account.steam_id,
+            "username": f"mock{account.number + 1}",
+            "avatar": f"{self.icon_base()}/icons/avatar-{account.number}.png",
+            "balance": 100000 + account.number * 137,
+            "know_your_customer": "verified",
+            "statistics": {"total_sales": 0, "total_purchases": 0, "median_trade_time": 0,
+                           "total_avoided_trades": 0, "total_failed_trades": 0, "total_verified_trades": 0,
+                           "total_trades": 0},
+        }})
+
+    def route_inventory(self, account, query, data):
+        """Корневой массив предметов, отправляемый блоками по мере генерации."""
+        seed, items, icon_base = self.state.settings.seed, self.state.settings.items, self.icon_base()
+
+        def chunks():
+            yield b"["
+            for start in range(0, items, STREAM_BATCH):
+                batch = [make_item(seed, account.number, index, icon_base)
+                         for index in range(start, min(start + STREAM_BATCH, items))]
+                yield (b"," if start else b"") + json.dumps(batch).encode('utf-8')[1:-1]
+            yield b"]"
+
+        self.send_body(200, chunks(), chunked=True)
+
+    def route_stall(self, account, query, data, steam_id):
+        if steam_id != account.steam_id:
+            raise MockError(403, "Stall of another user")
+        limit = self.int_param(query, "limit", 999)
+        with self.state.lock:
+            etag = f'"{account.number}-{account.version}"'
+            listings = sorted(account.listings.values(), key=lambda listing: listing[3], reverse=True)[:limit]
+            total = len(account.listings)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_body(304, [], headers={"ETag": etag})
+            return
+        icon_base = self.icon_base()
+        self.send_json(200, {"data": [self.state.listing_json(account, listing, icon_base) for listing in listings],
+                             "total_count": total}, headers={"ETag": etag})
+
+    def route_market_listings(self, account, query, data):
+        name = (query.get("market_hash_name") or [""])[0]
+        limit = self.int_param(query, "limit", 3)
+        price = base_price(name)
+        now = time.time()
+        self.send_json(200, {"data": [
+            {"id": str(ID_BASE - index - 1), "created_at": iso_time(now - index * 3600), "type": "buy_now",
+             "price": price + index * max(price // 50, 1), "state": "listed",
+             "item": {"market_hash_name": name}}
+            for index in range(limit)]})
+
+    def check_price(self, price):
+        settings = self.state.settings
+        if not isinstance(price, int) or price < 3:
+            raise MockError(400, "Invalid price", code=1)
+        if settings.kyc_limit and price > settings.kyc_limit:
+            raise MockError(400, "Item overpriced, complete KYC", code=4)
+
+    def route_create_listing(self, account, query, data):
+        index = self.state.item_index(account, data.get("asset_id"))
+        if index is None:
+            raise MockError(400, "Item is not in your inventory", code=2)
+        self.check_price(data.get("price"))
+        with self.state.lock:
+            if index in account.listed:
+                raise MockError(400, "Item is already listed", code=3)
+            listing = self.state.add_listing(account, index, data["price"], iso_time(time.time()))
+        self.send_json(200, self.state.listing_json(account, listing, self.icon_base()))
+
+    def route_change_listing(self, account, query, data, listing_id):
+        self.check_price(data.get("price"))
+        with self.state.lock:
+            listing = account.listings.get(listing_id)
+            if listing is None:
+                raise MockError(404, "Listing not found")
+            listing[2] = data["price"]
+            account.version += 1
+        self.send_json(200, self.state.listing_json(account, listing, self.icon_base()))
+
+    def route_delete_listing(self, account, query, data, listing_id):
+        with self.state.lock:
+            listing = account.listings.pop(listing_id, None)
+            if listing is None:
+                raise MockError(404, "Listing not found")
+            account.listed.pop(listing[1], None)
+            account.closed[listing_id] = listing
+            account.version += 1
+        self.send_json(200, {"message": "successfully delisted the item"})
+
+    def route_get_listing(self, account, query, data, listing_id):
+        with self.state.lock:
+            listing = account.listings.get(listing_id)
+            closed = account.closed.get(listing_id)
+        if listing is not None:
+            self.send_json(200, self.state.listing_json(account, listing, self.icon_base()))
+        elif closed is not None:
+            self.send_json(200, dict(self.state.listing_json(account, closed, self.icon_base()), state="delisted"))
+        else:
+            raise MockError(404, "Listing not found")
+
+    def route_buy_orders(self, account, query, data):
+        page = self.int_param(query, "page", 0)
+        limit = self.int_param(query, "limit", 100)
+        with self.state.lock:
+            orders = account.orders[page * limit:(page + 1) * limit]
+            count = len(account.orders)
+        self.send_json(200, {"orders": orders, "count": count})
+
+    def route_create_order(self, account, query, data):
+        expression, market_hash_name = data.get("expression"), data.get("market_hash_name")
+        if bool(expression) == bool(market_hash_name):
+            raise MockError(400, "Either expression or market_hash_name is required")
+        price, qty = data.get("max_price"), data.get("quantity")
+        if not isinstance(price, int) or price < 3 or not isinstance(qty, int) or not 1 <= qty <= 10000:
+            raise MockError(400, "Invalid max_price or quantity")
+        with self.state.lock:
+            order = self.state.make_order(market_hash_name, expression, price, qty, iso_time(time.time()))
+            account.orders.insert(0, order)
+        self.send_json(200, order)
+
+    def route_delete_order(self, account, query, data, order_id):
+        with self.state.lock:
+            remaining = [order for order in account.orders if order["id"] != order_id]
+            if len(remaining) == len(account.orders):
+                raise MockError(404, "Order not found")
+            account.orders = remaining
+        self.send_json(200, {"message": "successfully removed the order"})
+
+
+def write_config(path, state, base_url):
+    """config.json для запуска helper против сервера: адрес API и ключи синтетических аккаунтов."""
+    config = {
+        "api_base_url": base_url,
+        "accounts": [{"api_key": account.api_key, "name": f"Mock {account.number + 1}", "group": "mock"}
+                     for account in state.accounts],
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(config, file, indent=4)
+
+
+def start_server(settings, host="127.0.0.1", port=DEFAULT_PORT):
+    """Сервер в фоновом потоке (для скриптов нагрузочной проверки). Возвращает (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(settings)
+    threading.Thread(target=server.serve_forever, name="mock-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{API_PREFIX}"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m modules.mock_server",
+                                     description="Local stand-in for the CSFloat API with synthetic accounts.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--accounts", type=int, default=3, help="Number of synthetic accounts")
+    parser.add_argument("--items", type=int, default=1000, help="Inventory items per account")
+    parser.add_argument("--listed", type=float, default=0.1, help="Share of the inventory listed at start")
+    parser.add_argument("--orders", type=int, default=20, help="Buy orders per account at start")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="Response speed limit in MB/s (0 - none)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 5xx")
+    parser.add_argument("--rate", type=int, default=0, help="Requests per second per key before 429 (0 - none)")
+    parser.add_argument("--kyc-limit", type=int, default=0,
+                        help="Prices above this many cents fail with the KYC error (0 - none)")
+    parser.add_argument("--seed", type=int, default=1, help="Same seed - same keys and items")
+    parser.add_argument("--write-config", metavar="PATH", help="Write a config.json for these accounts")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.accounts < 1 or args.items < 0 or args.items > 0xFFFFFF:
+        print("--accounts must be positive and --items between 0 and 16777215.", file=sys.stderr)
+        return 2
+    settings = MockSettings(args.accounts, args.items, min(max(args.listed, 0.0), 1.0), max(args.orders, 0),
+                            max(args.latency, 0.0), max(args.jitter, 0.0), max(args.bandwidth, 0.0),
+                            min(max(args.error_rate, 0.0), 1.0), max(args.rate, 0), max(args.kyc_limit, 0),
+                            args.seed)
+    try:
+        server, base_url = start_server(settings, args.host, args.port)
+    except OSError as e:
+        print(f"Unable to listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 1
+    if args.write_config:
+        write_config(args.write_config, server.state, base_url)
+        print(f"Config written to {args.write_config}", file=sys.stderr)
+    print(f"Serving {settings.accounts} mock accounts x {settings.items} items on {base_url}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# modules/order_matcher.py
+from collections import defaultdict
+
+from modules.expressions import ExpressionError, compile_expression
+
+
+class InventoryIndex:
+    """
+    Индекс предметов инвентаря по DefIndex/PaintIndex, паре (DefIndex, PaintIndex), PaintSeed, редкости,
+    market_hash_name и стикерам. Выражение ордера проверяется только на предметах самой маленькой
+    подходящей корзины, а не на всём инвентаре.
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.buckets = buckets = defaultdict(list)
+        for item in self.items:
+            buckets[('skin', item.def_index, item.paint_index)].append(item)
+            buckets[('def', item.def_index)].append(item)
+            buckets[('paint', item.paint_index)].append(item)
+            buckets[('seed', item.paint_seed)].append(item)
+            buckets[('rarity', item.rarity)].append(item)
+            buckets[('name', item.name)].append(item)
+            for sticker_id in {sticker[0] for sticker in item.stickers}:
+                buckets[('sticker', sticker_id)].append(item)
+
+    def candidates(self, options):
+        """Предметы самого маленького из вариантов ключей; без вариантов - весь инвентарь."""
+        if not options:
+            return self.items
+        keys = min(options, key=lambda option: sum(len(self.buckets.get(key, ())) for key in option))
+        if len(keys) == 1:
+            return self.buckets.get(next(iter(keys)), ())
+        seen = set()
+        candidates = []
+        for key in keys:
+            for item in self.buckets.get(key, ()):
+                if item.asset_id not in seen:
+                    seen.add(item.asset_id)
+                    candidates.append(item)
+        return candidates
+
+    def match(self, expression=None, market_hash_name=None):
+        """Предметы, подходящие под выражение ордера или его market_hash_name. Поднимает ExpressionError."""
+        if expression:
+            compiled = compile_expression(expression)
+            predicate = compiled.predicate
+            return [item for item in self.candidates(compiled.index_options) if predicate(item)]
+        if market_hash_name:
+            return list(self.buckets.get(('name', market_hash_name), ()))
+        return []
+
+
+def match_orders(orders, items):
+    """
+    Сопоставление ордеров с инвентарём.
+    orders: (order_id, expression, market_hash_name); возвращает order_id -> список предметов,
+    или None, если выражение не удалось разобрать.
+    """
+    index = InventoryIndex(items)
+    matches = {}
+    for order_id, expression, market_hash_name in orders:
+        try:
+            matches[order_id] = index.match(expression, market_hash_name)
+        except (ExpressionError, ValueError, TypeError):
+            matches[order_id] = None
+    return matches
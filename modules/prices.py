@@ -0,0 +1,75 @@
+# modules/prices.py
+import time
+import logging
+
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal, pyqtSlot
+
+from modules.api import get_lowest_listings
+from modules.rate_limit import RateLimiter
+from modules.scheduler import TaskScheduler, VISIBLE
+
+
+class PriceSuggestions(QObject):
+    """
+    Самая низкая цена конкурирующих лотов по market_hash_name.
+
+    Одинаковые названия объединяются в один запрос, результаты кэшируются на ttl секунд.
+    Запросы распределяются по API-ключам по кругу и выполняются в собственном пуле потоков,
+    чтобы не занимать потоки загрузки инвентаря.
+    """
+    price_ready = pyqtSignal(str, object)  # market_hash_name, цена в центах или None
+
+    DEFAULT_TTL = 120
+    MAX_CONCURRENT = 8
+
+    def __init__(self, api_keys, ttl=None, rate_limiter=None, parent=None):
+        super().__init__(parent)
+        self.api_keys = list(api_keys)
+        self.next_key = 0
+        self.ttl = ttl or self.DEFAULT_TTL
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cache = {}  # market_hash_name -> (время, цена)
+        self.in_flight = set()
+        self.scheduler = TaskScheduler(QThreadPool(self), lane_limits={VISIBLE: self.MAX_CONCURRENT},
+                                       key_limit=self.MAX_CONCURRENT, parent=self)
+
+    def cached_price(self, name):
+        """(True, цена), если в кэше есть свежее значение, иначе (False, None)."""
+        entry = self.cache.get(name)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return True, entry[1]
+        return False, None
+
+    def request(self, names):
+        """Свежие цены из кэша отдаются сразу, остальные запрашиваются; уже запрошенные не повторяются."""
+        for name in dict.fromkeys(names):
+            found, price = self.cached_price(name)
+            if found:
+                self.price_ready.emit(name, price)
+                continue
+            if name in self.in_flight or not self.api_keys:
+                continue
+            self.in_flight.add(name)
+            api_key = self.api_keys[self.next_key % len(self.api_keys)]
+            self.next_key += 1
+            self.scheduler.run(self.fetch_price, api_key, name, lane=VISIBLE, api_key=api_key,
+                               on_result=self.handle_result)
+
+    def fetch_price(self, api_key, name):
+        """Выполняется в потоке пула."""
+        self.rate_limiter.acquire(api_key)
+        try:
+            listings = get_lowest_listings(api_key, name)
+        except Exception as e:
+            logging.error(f"Price Lookup Error: {str(e)}")
+            listings = None
+        prices = [listing.get("price") for listing in listings or [] if listing.get("price")]
+        return {'name': name, 'price': min(prices) if prices else None, 'ok': listings is not None}
+
+    @pyqtSlot(object)
+    def handle_result(self, result):
+        name = result['name']
+        self.in_flight.discard(name)
+        if result['ok']:
+            self.cache[name] = (time.monotonic(), result['price'])
+        self.price_ready.emit(name, result['price'])
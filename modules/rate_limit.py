@@ -0,0 +1,34 @@
+# modules/rate_limit.py
+import time
+import threading
+from collections import defaultdict, deque
+
+
+class RateLimiter:
+    """Не больше rate запросов за period секунд на каждый API-ключ (скользящее окно). Потокобезопасен."""
+
+    def __init__(self, rate=10, period=1.0):
+        self.rate = rate
+        self.period = period
+        self.lock = threading.Lock()
+        self.calls = defaultdict(deque)
+
+    def try_acquire(self, api_key):
+        """Запрос без ожидания: 0, если право получено, иначе секунды до освобождения окна."""
+        with self.lock:
+            now = time.monotonic()
+            calls = self.calls[api_key]
+            while calls and now - calls[0] >= self.period:
+                calls.popleft()
+            if len(calls) < self.rate:
+                calls.append(now)
+                return 0
+            return self.period - (now - calls[0])
+
+    def acquire(self, api_key):
+        """Блокирует поток пула, пока ключ не получит право на запрос."""
+        while True:
+            wait = self.try_acquire(api_key)
+            if not wait:
+                return
+            time.sleep(wait)
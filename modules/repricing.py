@@ -0,0 +1,179 @@
+# modules/repricing.py
+import re
+import shlex
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+MIN_PRICE = 3  # Ограничения API, в центах
+MAX_PRICE = 10000000
+
+# Лот для пересчёта цены; price в центах
+Listing = namedtuple('Listing', 'listing_id asset_id name api_key price collection rarity')
+
+# Результат пересчёта; цены в центах, status - одно из STATUS_*
+PriceChange = namedtuple('PriceChange', 'listing_id asset_id name api_key old_price new_price status')
+
+STATUS_OK = "OK"
+STATUS_UNCHANGED = "Price will not change"
+STATUS_BELOW_MIN = f"Below minimum ${MIN_PRICE / 100:.2f}"
+STATUS_ABOVE_MAX = f"Above maximum ${MAX_PRICE / 100:.2f}"
+
+SCALE = 10000  # Проценты и множители хранятся в десятитысячных долях
+
+NUMBER_RE = re.compile(r'^[+-]?\d+(\.\d+)?$')
+PERCENT_RE = re.compile(r'^[+-]?\d+(\.\d+)?%$')
+MULTIPLIER_RE = re.compile(r'^[*x]\d+(\.\d+)?$')
+ROUND_RE = re.compile(r'^\.(x|\d)(\d)$')
+COLLECTION_RE = re.compile(r'^(the\s+)?(.*?)(\s+collection)?$')
+
+# Шаг правила: (вид, значение, условие) - условие ('collection'|'rarity', значение) или None
+Step = namedtuple('Step', 'kind value condition')
+
+
+def to_cents(text):
+    """Строка с суммой в долларах -> целые центы без ошибок округления float."""
+    negative = text.startswith('-')
+    whole, _, fraction = text.lstrip('+-').partition('.')
+    cents = int(whole or 0) * 100 + int((fraction + "00")[:2] or 0)
+    if len(fraction) > 2 and int(fraction[2]) >= 5:
+        cents += 1
+    return -cents if negative else cents
+
+
+def to_scaled(text):
+    """Строка с числом -> целое в единицах 1/SCALE."""
+    whole, _, fraction = text.lstrip('+-').partition('.')
+    value = int(whole or 0) * SCALE + int((fraction + "0000")[:4] or 0)
+    return -value if text.startswith('-') else value
+
+
+def parse_rules(text):
+    """
+    Разбор правил пересчёта цены. Правила разделяются ";" и применяются по порядку:
+
+        12.50            точная цена
+        +1 / -0.5        изменение на сумму
+        -2% / +5%        изменение в процентах
+        min 10 / max 99  не ниже / не выше
+        round .x9        вниз до цены с последней цифрой 9 (.99 - вниз до X.99)
+        collection:"Dust 2" *1.1   множитель для коллекции
+        rarity:6 *0.95            множитель для редкости
+
+    Коллекция сравнивается целиком без учёта регистра, "The" и "Collection" можно не писать:
+    "Dust 2" совпадает с "The Dust 2 Collection", но "Arms Deal" не совпадает с "Arms Deal 2".
+
+    Неверное правило вызывает ValueError с текстом для пользователя.
+    """
+    steps = []
+    for clause in text.split(';'):
+        clause = clause.strip()
+        if not clause:
+            continue
+        try:
+            tokens = shlex.split(clause)
+        except ValueError:
+            raise ValueError(f"Invalid rule: {clause}")
+
+        condition = None
+        if tokens and ':' in tokens[0] and tokens[0].split(':', 1)[0].lower() in ('collection', 'rarity'):
+            field, _, value = tokens[0].partition(':')
+            field = field.lower()
+            if field == 'rarity':
+                if not value.isdigit():
+                    raise ValueError(f"Rarity must be a number: {clause}")
+                value = int(value)
+            condition = (field, value)
+            tokens = tokens[1:]
+            if len(tokens) != 1 or not MULTIPLIER_RE.match(tokens[0]):
+                raise ValueError(f"Expected a multiplier like *1.1 after {field}: {clause}")
+
+        if len(tokens) == 1 and PERCENT_RE.match(tokens[0]):
+            # Процент сводится к множителю: -2% -> *0.98
+            steps.append(Step('multiply', SCALE + to_scaled(tokens[0][:-1]) // 100, None))
+        elif len(tokens) == 1 and MULTIPLIER_RE.match(tokens[0]):
+            steps.append(Step('multiply', to_scaled(tokens[0][1:]), condition))
+        elif len(tokens) == 1 and NUMBER_RE.match(tokens[0]):
+            kind = 'add' if tokens[0][0] in '+-' else 'set'
+            steps.append(Step(kind, to_cents(tokens[0]), None))
+        elif len(tokens) == 2 and tokens[0].lower() in ('min', 'max') and NUMBER_RE.match(tokens[1]):
+            steps.append(Step(tokens[0].lower(), to_cents(tokens[1]), None))
+        elif len(tokens) == 2 and tokens[0].lower() == 'round' and ROUND_RE.match(tokens[1]):
+            tens, units = ROUND_RE.match(tokens[1]).groups()
+            steps.append(Step('round', (None if tens == 'x' else int(tens), int(units)), None))
+        else:
+            raise ValueError(f"Invalid rule: {clause}")
+
+    if not steps:
+        raise ValueError("Price field must be filled.")
+    return steps
+
+
+@lru_cache(maxsize=1024)
+def collection_key(name):
+    """Название коллекции для сравнения: нижний регистр, без "The" в начале и "Collection" в конце."""
+    return COLLECTION_RE.match(' '.join(name.lower().split())).group(2)
+
+
+def scale(value, factor):
+    """value * factor / SCALE с округлением до ближайшего цента."""
+    product = value * factor
+    return (product + SCALE // 2) // SCALE if product >= 0 else -((-product + SCALE // 2) // SCALE)
+
+
+def round_down_to(price, tens, units):
+    """Наибольшая цена не выше price, оканчивающаяся на заданные цифры центов."""
+    modulus, ending = (10, units) if tens is None else (100, tens * 10 + units)
+    rounded = price - (price - ending) % modulus
+    return rounded if rounded > 0 else price
+
+
+def apply_step(prices, step, listings):
+    """Один шаг правила сразу для всего столбца цен."""
+    kind, value, condition = step
+    if kind == 'set':
+        return array('q', [value] * len(prices))
+    if kind == 'add':
+        return array('q', [price + value for price in prices])
+    if kind == 'multiply':
+        if condition is None:
+            return array('q', [scale(price, value) for price in prices])
+        field, expected = condition
+        if field == 'collection':
+            expected = collection_key(expected)
+            matches = [collection_key(listing.collection) == expected for listing in listings]
+        else:
+            matches = [listing.rarity == expected for listing in listings]
+        return array('q', [scale(price, value) if match else price for price, match in zip(prices, matches)])
+    if kind == 'min':
+        return array('q', [max(price, value) for price in prices])
+    if kind == 'max':
+        return array('q', [min(price, value) for price in prices])
+    if kind == 'round':
+        return array('q', [round_down_to(price, *value) for price in prices])
+    raise ValueError(f"Unknown rule: {kind}")
+
+
+def reprice(listings, steps):
+    """
+    Новые цены для всех лотов. Каждое правило применяется одним проходом по столбцу целых центов,
+    затем результаты проверяются без прерывания: у каждого лота свой статус.
+    """
+    old_prices = array('q', [listing.price for listing in listings])
+    prices = old_prices
+    for step in steps:
+        prices = apply_step(prices, step, listings)
+
+    changes = []
+    for listing, old_price, new_price in zip(listings, old_prices, prices):
+        if new_price < MIN_PRICE:
+            status = STATUS_BELOW_MIN
+        elif new_price > MAX_PRICE:
+            status = STATUS_ABOVE_MAX
+        elif new_price == old_price:
+            status = STATUS_UNCHANGED
+        else:
+            status = STATUS_OK
+        changes.append(PriceChange(listing.listing_id, listing.asset_id, listing.name, listing.api_key,
+                                   old_price, new_price, status))
+    return changes
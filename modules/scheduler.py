@@ -0,0 +1,145 @@
+# modules/scheduler.py
+import time
+from collections import deque, defaultdict
+
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal, pyqtSlot
+
+from modules.workers import ApiWorker
+
+# Полосы приоритета, от высшего к низшему
+INTERACTIVE = 0  # действия пользователя: продажа, смена цены, снятие, удаление ордеров
+VISIBLE = 1  # данные, которые пользователь видит прямо сейчас (аккаунт по умолчанию)
+BACKGROUND = 2  # фоновое обновление остальных аккаунтов
+PREFETCH = 3  # предзагрузка: вкладка Buy Orders, картинки стикеров
+
+LANES = (INTERACTIVE, VISIBLE, BACKGROUND, PREFETCH)
+LANE_NAMES = {INTERACTIVE: "interactive", VISIBLE: "visible", BACKGROUND: "background", PREFETCH: "prefetch"}
+
+# Приоритет задачи в очереди QThreadPool
+POOL_PRIORITY = {INTERACTIVE: 3, VISIBLE: 2, BACKGROUND: 1, PREFETCH: 0}
+
+
+class TaskScheduler(QObject):
+    """
+    Планировщик задач поверх QThreadPool с полосами приоритета.
+
+    Для каждой полосы (кроме интерактивной) и для каждого API-ключа ограничено число одновременно
+    выполняемых задач. Пул потоков больше суммы лимитов фоновых полос, поэтому для интерактивных
+    задач всегда остаётся свободный поток и они не ждут фоновый трафик.
+    """
+    queue_changed = pyqtSignal(dict)  # Метрики очередей после каждого изменения
+
+    DEFAULT_LANE_LIMITS = {VISIBLE: 4, BACKGROUND: 4, PREFETCH: 2}
+    DEFAULT_KEY_LIMIT = 2
+    INTERACTIVE_THREADS = 2  # Потоки, зарезервированные под интерактивные задачи
+
+    def __init__(self, threadpool=None, lane_limits=None, key_limit=None, parent=None):
+        super().__init__(parent)
+        self.threadpool = threadpool or QThreadPool()
+        self.lane_limits = dict(self.DEFAULT_LANE_LIMITS)
+        if lane_limits:
+            self.lane_limits.update(lane_limits)
+        self.key_limit = key_limit or self.DEFAULT_KEY_LIMIT
+
+        # Интерактивным задачам всегда должен оставаться свободный поток
+        required_threads = sum(self.lane_limits.values()) + self.INTERACTIVE_THREADS
+        if self.threadpool.maxThreadCount() < required_threads:
+            self.threadpool.setMaxThreadCount(required_threads)
+
+        self.queues = {lane: deque() for lane in LANES}
+        self.running = {lane: 0 for lane in LANES}
+        self.running_per_key = defaultdict(int)
+        self.active = {}  # WorkerSignals -> (worker, lane, api_key)
+
+        # Метрики
+        self.submitted = {lane: 0 for lane in LANES}
+        self.completed = {lane: 0 for lane in LANES}
+        self.max_depth = {lane: 0 for lane in LANES}
+        self.total_wait = {lane: 0.0 for lane in LANES}
+
+    def submit(self, worker, lane=BACKGROUND, api_key=None):
+        """Ставит ApiWorker в очередь полосы. api_key используется для лимита на ключ."""
+        worker.signals.finished.connect(self.on_worker_finished)
+        queue = self.queues[lane]
+        queue.append((worker, api_key, time.perf_counter()))
+        self.submitted[lane] += 1
+        self.max_depth[lane] = max(self.max_depth[lane], len(queue))
+        self.dispatch()
+        return worker
+
+    def run(self, fn, *args, lane=BACKGROUND, api_key=None, on_result=None, on_error=None, **kwargs):
+        """Создаёт ApiWorker для fn(*args, **kwargs), подключает обработчики и ставит его в очередь."""
+        worker = ApiWorker(fn, *args, **kwargs)
+        if on_result:
+            worker.signals.result.connect(on_result)
+        if on_error:
+            worker.signals.error.connect(on_error)
+        return self.submit(worker, lane, api_key)
+
+    def can_start(self, lane, api_key):
+        if lane == INTERACTIVE:
+            return True
+        if self.running[lane] >= self.lane_limits.get(lane, 1):
+            return False
+        return api_key is None or self.running_per_key[api_key] < self.key_limit
+
+    def dispatch(self):
+        """Запускает задачи из очередей в порядке приоритета полос, пока позволяют лимиты."""
+        for lane in LANES:
+            queue = self.queues[lane]
+            if not queue:
+                continue
+            blocked = deque()
+            while queue:
+                if lane != INTERACTIVE and self.running[lane] >= self.lane_limits.get(lane, 1):
+                    break
+                worker, api_key, queued_at = queue.popleft()
+                if not self.can_start(lane, api_key):
+                    # Ключ занят - задача ждёт, следующие задачи полосы могут идти
+                    blocked.append((worker, api_key, queued_at))
+                    continue
+                self.start_worker(worker, lane, api_key, queued_at)
+            blocked.extend(queue)
+            self.queues[lane] = blocked
+        self.queue_changed.emit(self.metrics())
+
+    def start_worker(self, worker, lane, api_key, queued_at):
+        self.running[lane] += 1
+        if api_key is not None:
+            self.running_per_key[api_key] += 1
+        self.total_wait[lane] += time.perf_counter() - queued_at
+        self.active[worker.signals] = (worker, lane, api_key)
+        self.threadpool.start(worker, POOL_PRIORITY[lane])
+
+    @pyqtSlot()
+    def on_worker_finished(self):
+        entry = self.active.pop(self.sender(), None)
+        if entry is None:
+            return
+        _, lane, api_key = entry
+        self.running[lane] -= 1
+        self.completed[lane] += 1
+        if api_key is not None:
+            self.running_per_key[api_key] -= 1
+            if not self.running_per_key[api_key]:
+                del self.running_per_key[api_key]
+        self.dispatch()
+
+    def queue_depths(self):
+        """Число ожидающих задач по полосам."""
+        return {LANE_NAMES[lane]: len(self.queues[lane]) for lane in LANES}
+
+    def metrics(self):
+        """Метрики по полосам: в очереди, выполняется, отправлено, завершено, макс. глубина, среднее ожидание."""
+        result = {}
+        for lane in LANES:
+            started = self.submitted[lane] - len(self.queues[lane])
+            result[LANE_NAMES[lane]] = {
+                'queued': len(self.queues[lane]),
+                'running': self.running[lane],
+                'submitted': self.submitted[lane],
+                'completed': self.completed[lane],
+                'max_depth': self.max_depth[lane],
+                'avg_wait': self.total_wait[lane] / started if started else 0.0,
+            }
+        return result
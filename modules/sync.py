@@ -0,0 +1,177 @@
+# modules/sync.py
+import time
+import random
+import hashlib
+import logging
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from modules.api import get_inventory_data, get_stall_data
+from modules.scheduler import BACKGROUND
+
+SyncSettings = namedtuple('SyncSettings', 'enabled interval jitter inventory_every')
+
+# Изменения аккаунта относительно таблицы:
+# removed - asset_id проданных/выведенных предметов, added - JSON новых предметов,
+# listed - лоты, выставленные или с изменённой ценой, unlisted - asset_id снятых с продажи, stall - весь stall
+AccountDelta = namedtuple('AccountDelta', 'removed added listed unlisted stall')
+
+DEFAULT_INTERVAL = 300  # Секунды между синхронизациями аккаунта
+DEFAULT_JITTER = 30
+DEFAULT_INVENTORY_EVERY = 4  # Инвентарь запрашивается раз в N синхронизаций или при изменении stall
+MIN_INTERVAL = 30
+
+
+def load_sync_settings(config):
+    """Настройки автосинхронизации из секции "sync" конфигурации. По умолчанию выключена."""
+    sync = (config or {}).get("sync") or {}
+    try:
+        interval = max(float(sync.get("interval", DEFAULT_INTERVAL)), MIN_INTERVAL)
+        jitter = min(max(float(sync.get("jitter", DEFAULT_JITTER)), 0), interval / 2)
+        inventory_every = max(int(sync.get("inventory_every", DEFAULT_INVENTORY_EVERY)), 1)
+    except (TypeError, ValueError):
+        logging.error(f"Invalid sync settings: {sync}")
+        interval, jitter, inventory_every = DEFAULT_INTERVAL, DEFAULT_JITTER, DEFAULT_INVENTORY_EVERY
+    return SyncSettings(bool(sync.get("enabled", False)), interval, jitter, inventory_every)
+
+
+def stall_fingerprint(stall):
+    """Хэш состояния stall: набор лотов и их цен."""
+    digest = hashlib.sha1()
+    for listing_id, price in sorted((item['id'], item['price']) for item in stall):
+        digest.update(f"{listing_id}:{price};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def compute_delta(local, inventory, stall):
+    """
+    Сравнение состояния таблицы аккаунта с ответами API.
+    local: asset_id -> (listing_id, price в центах) для строк аккаунта в таблице; проданные предметы,
+    которые инвентарь ещё возвращает, передаются как (None, None) и не считаются новыми.
+    """
+    stall_by_asset = {item['item']['asset_id']: item for item in stall}
+    inventory_ids = {item.get('asset_id') for item in inventory}
+
+    removed = []
+    listed = []
+    unlisted = []
+    for asset_id, (listing_id, price) in local.items():
+        stall_item = stall_by_asset.get(asset_id)
+        if stall_item is None:
+            if asset_id not in inventory_ids:
+                removed.append(asset_id)  # Продан или выведен
+            elif listing_id:
+                unlisted.append(asset_id)
+        elif stall_item['id'] != listing_id or stall_item['price'] != price:
+            listed.append(stall_item)
+
+    added = [item for item in inventory if item.get('asset_id') not in local]
+    return AccountDelta(removed, added, listed, unlisted, stall)
+
+
+class AutoSync(QObject):
+    """
+    Периодическая синхронизация аккаунтов в фоновой полосе планировщика.
+
+    Каждый цикл запрашивает stall аккаунта; инвентарь запрашивается, только если stall изменился
+    или подошла очередь inventory_every. Если ничего не изменилось, сравнение не выполняется.
+    """
+    delta_ready = pyqtSignal(str, object)  # api_key, AccountDelta
+
+    TICK_MS = 1000
+
+    def __init__(self, scheduler, settings, snapshot, steam_id_for, parent=None, engine=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.engine = engine  # DataEngine: запросы и сравнение выполняются в процессе данных
+        if engine is not None:
+            engine.sync_ready.connect(self.handle_result)
+        self.settings = settings
+        self.snapshot = snapshot  # api_key -> {asset_id: (listing_id, price)}
+        self.steam_id_for = steam_id_for  # api_key -> steam_id или None
+
+        self.next_due = {}
+        self.in_flight = set()
+        self.fingerprints = {}
+        self.sync_counts = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.TICK_MS)
+        self.timer.timeout.connect(self.tick)
+
+    def next_delay(self):
+        return self.settings.interval + random.uniform(-self.settings.jitter, self.settings.jitter)
+
+    def start(self, api_keys):
+        """Запуск; первые синхронизации аккаунтов равномерно распределяются по интервалу."""
+        if self.timer.isActive():
+            return
+        now = time.monotonic()
+        for api_key in api_keys:
+            self.next_due[api_key] = now + random.uniform(self.settings.jitter, self.settings.interval)
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    @pyqtSlot()
+    def tick(self):
+        now = time.monotonic()
+        for api_key, due in self.next_due.items():
+            if due > now or api_key in self.in_flight:
+                continue
+            self.next_due[api_key] = now + self.next_delay()
+            steam_id = self.steam_id_for(api_key)
+            if not steam_id:
+                continue
+
+            count = self.sync_counts.get(api_key, 0) + 1
+            self.sync_counts[api_key] = count
+            self.in_flight.add(api_key)
+            inventory_due = count % self.settings.inventory_every == 0
+            if self.engine is not None and self.engine.start():
+                self.engine.sync(api_key, steam_id, self.snapshot(api_key), self.fingerprints.get(api_key),
+                                 inventory_due)
+                continue
+            self.scheduler.run(self.sync_account, api_key, steam_id, self.snapshot(api_key),
+                               self.fingerprints.get(api_key), inventory_due,
+                               lane=BACKGROUND, api_key=api_key,
+                               on_result=self.handle_result)
+
+    def sync_account(self, api_key, steam_id, local, fingerprint, inventory_due):
+        """Выполняется в потоке пула. Ошибки не прерывают синхронизацию: аккаунт повторится в следующем цикле."""
+        try:
+            delta, fingerprint = self.fetch_delta(api_key, steam_id, local, fingerprint, inventory_due)
+        except Exception as e:
+            logging.error(f"Sync Error: {str(e)}")
+            delta = None
+        return {'api_key': api_key, 'delta': delta, 'fingerprint': fingerprint}
+
+    @staticmethod
+    def fetch_delta(api_key, steam_id, local, fingerprint, inventory_due):
+        """Запросы и сравнение. Возвращает (delta или None, отпечаток stall)."""
+        stall = get_stall_data(api_key, steam_id)
+        if stall is None:
+            return None, fingerprint
+
+        new_fingerprint = stall_fingerprint(stall)
+        if new_fingerprint == fingerprint and not inventory_due:
+            return None, fingerprint
+
+        inventory = get_inventory_data(api_key)
+        if inventory is None:
+            return None, fingerprint
+
+        delta = compute_delta(local, inventory, stall)
+        if not (delta.removed or delta.added or delta.listed or delta.unlisted):
+            delta = None
+        return delta, new_fingerprint
+
+    @pyqtSlot(object)
+    def handle_result(self, result):
+        api_key = result['api_key']
+        self.in_flight.discard(api_key)
+        self.fingerprints[api_key] = result['fingerprint']
+        if result['delta'] is not None:
+            self.delta_ready.emit(api_key, result['delta'])
@@ -1,20 +1,45 @@
 # modules/ui.py
 import os
-from PyQt6.QtWidgets import QMainWindow, QApplication, QTabWidget
+from PyQt6.QtWidgets import QMainWindow, QApplication, QTabWidget, QWidget, QSystemTrayIcon
 from PyQt6.QtGui import QFont, QIcon
 from PyQt6.QtCore import QThreadPool, Qt  # Добавлен импорт Qt
 
+from modules.scheduler import TaskScheduler, VISIBLE, PREFETCH
+from modules.data_engine import DataEngine
+from modules.daemon import DaemonClient
+from modules.sync import AutoSync
+from modules.watcher import ListingWatcher, SOLD, DELISTED, PRICE_CHANGED, LISTED
 from modules.ui_tab1 import Tab1
 from modules.ui_tab2 import Tab2
 
 class SteamInventoryApp(QMainWindow):
-    def __init__(self, api_keys):
+    def __init__(self, api_keys, accounts=None, sync_settings=None, watcher_settings=None, engine_settings=None,
+                 daemon_settings=None):
         super().__init__()
         self.api_keys = api_keys
+        self.accounts = accounts
+        self.sync_settings = sync_settings
+        self.auto_sync = None
+        self.watcher_settings = watcher_settings
+        self.watcher = None
+        self.tray_icon = None
 
         # Инициализация пула потоков
         self.threadpool = QThreadPool()
 
+        # Планировщик с полосами приоритета: действия пользователя не ждут фоновую загрузку
+        self.scheduler = TaskScheduler(self.threadpool, parent=self)
+
+        # Необязательный процесс данных: загрузка и разбор данных вне процесса GUI
+        self.data_engine = None
+        if engine_settings and engine_settings.enabled:
+            self.data_engine = DataEngine(engine_settings, parent=self)
+
+        # Фоновый процесс синхронизации (--daemon), из которого окно сначала пробует загрузиться
+        self.daemon_client = None
+        if daemon_settings and daemon_settings.enabled:
+            self.daemon_client = DaemonClient(daemon_settings)
+
         # Путь к иконкам (убедитесь, что путь правильный)
         self.icon_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils', 'icons'))
 
@@ -33,12 +58,19 @@ class SteamInventoryApp(QMainWindow):
         # Создание вкладок
         self.tabs = QTabWidget(self)
 
-        # Инициализация вкладок
-        self.tab2 = Tab2(self.api_keys, self.icon_path, parent=self)
-        self.tab1 = Tab1(self.api_keys, self.icon_path, self.tab2, parent=self)
+        # Инициализация вкладок. Вкладка Buy Orders создаётся по требованию
+        # или после загрузки инвентаря, до этого на её месте заглушка
+        self.tab2 = None
+        self.tab1 = Tab1(self.api_keys, self.icon_path, self.tab2, parent=self, scheduler=self.scheduler,
+                         accounts=self.accounts, data_engine=self.data_engine,
+                         daemon_client=self.daemon_client)
+        self.tab1.inventory_loaded.connect(self.prefetch_tab2)
+        self.tab1.inventory_loaded.connect(self.start_auto_sync)
+        self.tab1.inventory_loaded.connect(self.start_watcher)
 
         self.tabs.addTab(self.tab1, "Inventory")
-        self.tabs.addTab(self.tab2, "Buy Orders")
+        self.tabs.addTab(QWidget(), "Buy Orders")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         self.setCentralWidget(self.tabs)
 
@@ -64,23 +96,105 @@ class SteamInventoryApp(QMainWindow):
         self.load_data()
 
     def load_data(self):
-        """Load data for all API keys."""
-        self.tab1.load_data(self.threadpool)  # Передача threadpool в Tab1
-        self.tab2.load_buy_orders(self.threadpool)  # Передача threadpool в Tab2
+        """Load data for all API keys. Buy orders are loaded later by ensure_tab2."""
+        self.tab1.load_data(self.scheduler)
+
+    def ensure_tab2(self, lane=VISIBLE):
+        """Создаёт вкладку Buy Orders и запускает загрузку ордеров, если это ещё не сделано."""
+        if self.tab2 is not None:
+            return self.tab2
+
+        self.tab2 = Tab2(self.api_keys, self.icon_path, parent=self, scheduler=self.scheduler,
+                         inventory=self.tab1.inventory, accounts=self.accounts,
+                         daemon_client=self.daemon_client)
+        self.tab1.tab2 = self.tab2
+
+        # Замена заглушки настоящей вкладкой без переключения текущей вкладки
+        current_index = self.tabs.currentIndex()
+        self.tabs.blockSignals(True)
+        placeholder = self.tabs.widget(1)
+        self.tabs.removeTab(1)
+        placeholder.deleteLater()
+        self.tabs.insertTab(1, self.tab2, "Buy Orders")
+        self.tabs.setCurrentIndex(current_index)
+        self.tabs.blockSignals(False)
+
+        self.tab2.load_column_widths()
+        self.tab2.load_buy_orders(self.scheduler, lane, use_daemon=True)
+        return self.tab2
+
+    def on_tab_changed(self, index):
+        """Пользователь открыл вкладку Buy Orders до фоновой загрузки."""
+        if index == 1:
+            self.ensure_tab2()
+
+    def prefetch_tab2(self):
+        """Фоновая загрузка ордеров в полосе предзагрузки после отрисовки инвентаря."""
+        self.ensure_tab2(lane=PREFETCH)
+
+    def start_auto_sync(self):
+        """Фоновая синхронизация аккаунтов после первой загрузки, если включена в конфигурации."""
+        if not self.sync_settings or not self.sync_settings.enabled:
+            return
+        if self.auto_sync is None:
+            self.auto_sync = AutoSync(self.scheduler, self.sync_settings, self.tab1.account_snapshot,
+                                      self.tab1.steam_id_for, parent=self, engine=self.data_engine)
+            self.auto_sync.delta_ready.connect(self.tab1.apply_account_delta)
+        self.auto_sync.start(self.api_keys)
+
+    def start_watcher(self):
+        """Наблюдатель за лотами после первой загрузки, если включён в конфигурации."""
+        if not self.watcher_settings or not self.watcher_settings.enabled:
+            return
+        if self.watcher is None:
+            self.watcher = ListingWatcher(self.scheduler, self.watcher_settings, self.tab1.steam_id_for, parent=self)
+            self.watcher.listings_changed.connect(self.tab1.apply_listing_events)
+            self.watcher.listings_changed.connect(self.notify_listing_events)
+            self.tab1.listings_edited.connect(self.watcher.apply_local_changes)
+        self.watcher.start({api_key: self.tab1.stalls.get(api_key) for api_key in self.api_keys})
+
+    def notify_listing_events(self, api_key, events, stall):
+        """Системное уведомление о событиях, перечисленных в настройке "notify"."""
+        events = [event for event in events if event.kind in self.watcher_settings.notify]
+        if not events or not QSystemTrayIcon.isSystemTrayAvailable():
+            return
+        if self.tray_icon is None:
+            self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+            self.tray_icon.show()
+
+        lines = []
+        for event in events[:5]:
+            if event.kind == SOLD:
+                lines.append(f"Sold: {event.name} for {event.old_price / 100:.2f}$")
+            elif event.kind == DELISTED:
+                lines.append(f"Delisted: {event.name}")
+            elif event.kind == PRICE_CHANGED:
+                lines.append(f"Price changed: {event.name} {event.old_price / 100:.2f}$ -> {event.new_price / 100:.2f}$")
+            elif event.kind == LISTED:
+                lines.append(f"Listed: {event.name} for {event.new_price / 100:.2f}$")
+        if len(events) > 5:
+            lines.append(f"...and {len(events) - 5} more")
+        self.tray_icon.showMessage("CSFloat Helper", "\n".join(lines), QSystemTrayIcon.MessageIcon.Information)
 
     def load_column_sizes(self):
         """Load column widths for both tabs."""
         self.tab1.load_column_widths()
-        self.tab2.load_column_widths()
+        if self.tab2 is not None:
+            self.tab2.load_column_widths()
 
     def save_column_sizes(self):
         """Save column widths for both tabs."""
         self.tab1.save_column_widths()
-        self.tab2.save_column_widths()
+        if self.tab2 is not None:
+            self.tab2.save_column_widths()
 
     def closeEvent(self, event):
         """Handle window close event to save column sizes."""
         self.save_column_sizes()
+        if self.tab2 is not None:
+            self.tab2.save_description_cache()
+        if self.data_engine is not None:
+            self.data_engine.stop()
         event.accept()
 
     # Опционально: Переопределение метода resizeEvent для предотвращения изменения размера
@@ -1,17 +1,26 @@
 # modules/ui_tab1.py
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox, QFormLayout, QDialog, QSpacerItem, QSizePolicy, QCompleter, QListWidget, QListView
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox, QFormLayout, QDialog, QSpacerItem, QSizePolicy, QCompleter, QListWidget, QListView, QProgressBar, QComboBox, QScrollArea, QDialogButtonBox
 from PyQt6.QtGui import QPixmap, QIcon, QColor, QBrush, QFont, QPainter
-from PyQt6.QtCore import Qt, QSettings, QPersistentModelIndex, QSize, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import Qt, QSettings, QSize, QTimer, pyqtSignal, pyqtSlot
 from datetime import datetime, timezone
-from collections import defaultdict
-
-from modules.api import get_user_info, get_inventory_data, get_stall_data, sell_item, delete_item, change_price
-from modules.utils import load_config, cache_image, calculate_days_on_sale
-from modules.workers import ApiWorker
+from collections import defaultdict, deque
+
+from modules.api import get_user_info, iter_inventory_data, get_stall_data, sell_item, delete_item, change_price
+from modules.accounts import accounts_from_keys, group_index
+from modules.catalog import get_catalog
+from modules.item_store import ItemStore
+from modules.utils import cache_image, cached_image_path, calculate_days_on_sale
+from modules.scheduler import TaskScheduler, INTERACTIVE, VISIBLE, BACKGROUND, PREFETCH
+from modules.sync import AccountDelta
+from modules.prices import PriceSuggestions
+from modules.repricing import Listing, parse_rules, reprice, to_cents, STATUS_OK, MIN_PRICE, MAX_PRICE
+from modules.watcher import SOLD, DELISTED, PRICE_CHANGED, LISTED
+from modules.inventory_delegates import StickerDelegate, PriceDelegate, STICKERS_ROLE, SUGGESTION_ROLE
 import os
 import logging
 import time
-import re
+import urllib.error
+import hashlib
 
 RARITY_COLOR_MAP = {
     1: QColor(176, 195, 217),  # Consumer Grade (Светло-серый)
@@ -28,8 +37,13 @@ RARITY_COLOR_MAP = {
 
 class Tab1(QWidget):
     api_key_changed = pyqtSignal(str)
-    max_price = 10000000
-    min_price = 3
+    inventory_loaded = pyqtSignal()  # Все аккаунты загружены и таблица заполнена
+    # Лоты, изменённые из вкладки: [(api_key, listing_id, цена или None, asset_id, название)], None - снят
+    listings_edited = pyqtSignal(object)
+    max_price = MAX_PRICE
+    min_price = MIN_PRICE
+    MAX_SUGGESTIONS = 500  # Предел выделенных строк для запроса подсказок цен
+    ROW_CHUNK_TIME = 0.02  # Сколько секунд GUI-потока занимает один пакет строк
 
     DEFAULT_COLUMN_WIDTHS = [
         275,  # 0: Name
@@ -47,25 +61,82 @@ class Tab1(QWidget):
         100  # 12: Wear Condition (скрытая)
     ]
 
-    def __init__(self, api_keys, icon_path, tab2, parent=None):
+    def __init__(self, api_keys, icon_path, tab2, parent=None, scheduler=None, accounts=None, data_engine=None,
+                 daemon_client=None):
         super().__init__(parent)
         self.api_keys = api_keys
+        self.accounts = accounts or accounts_from_keys(api_keys)
+        self.account_names = {account.api_key: account.name for account in self.accounts}
+        self.selected_api_keys = None  # Ключи выбранного аккаунта/группы; None - все аккаунты
         self.icon_path = icon_path
         self.tab2 = tab2
+        self.scheduler = scheduler or TaskScheduler(parent=self)
+        # Процесс данных (modules/data_engine.py); без него загрузка идёт в потоках планировщика
+        self.data_engine = data_engine
+        if data_engine is not None:
+            data_engine.user_info_ready.connect(self.handle_engine_user_info)
+            data_engine.rows_ready.connect(self.handle_engine_rows)
+            data_engine.stall_ready.connect(self.handle_engine_stall)
+            data_engine.account_loaded.connect(self.handle_engine_loaded)
+        self.daemon_client = daemon_client  # DaemonClient: данные, уже загруженные процессом --daemon
         self.settings = QSettings("MyCompany", "SteamInventoryApp")
         self.default_api_key = self.settings.value("default_api_key", api_keys[0])
-        self.user_infos = []
-        self.inventory = []
-        self.stall = []
+        self.user_infos = {}  # api_key -> информация о пользователе
+        self.inventory = ItemStore()  # Компактные записи предметов всех аккаунтов
+        self.stalls = {}  # api_key -> предметы на продаже
         self.selected_conditions = set()
         self.selected_rarities = set()  # Хранит выбранные редкости
 
+        # Общий с Tab2 справочник скинов и стикеров
+        self.catalog = get_catalog()
+
+        # Индекс asset_id / listing_id -> номер строки таблицы
+        self.asset_rows = {}
+        self.listing_rows = {}
+        self._row_index_dirty = True
+
+        # Очередь строк для поэтапного заполнения таблицы
+        self.pending_rows = deque()
+        self.stall_by_asset = {}  # asset_id -> лот на продаже, для строк, добавленных раньше данных о продаже
+        self.sold_assets = {}  # api_key -> asset_id проданных лотов, которые ещё возвращает инвентарь Steam
+        self.default_parts_left = 0
+        self.default_steam_id = ""
+        self.secondary_started = False
+        self.loading_api_keys = api_keys  # Аккаунты, загружаемые из API в текущей загрузке
+        self.accounts_loaded = 0
+        self.chunk_rows = 100  # Начальный размер пакета строк
+        self.last_chunk_end = 0.0
+        self.populate_timer = QTimer(self)
+        self.populate_timer.setInterval(0)
+        self.populate_timer.timeout.connect(self.populate_next_chunk)
+
+        # Текстовые фильтры применяются после паузы ввода, а не на каждый символ
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filters)
+
+        # Подсказки цен для выделенных предметов: запрос после паузы в выделении
+        self.price_suggestions = PriceSuggestions(self.api_keys, parent=self)
+        self.price_suggestions.price_ready.connect(self.show_price_suggestion)
+        self.suggestion_assets = defaultdict(list)  # market_hash_name -> asset_id ожидающих строк
+        self.suggestion_timer = QTimer(self)
+        self.suggestion_timer.setSingleShot(True)
+        self.suggestion_timer.setInterval(300)
+        self.suggestion_timer.timeout.connect(self.request_price_suggestions)
+
+        # Картинки стикеров догружаются в фоне: загружаемые url, url -> готовый QPixmap
+        self.pending_images = set()
+        self.sticker_pixmaps = {}
+        self.rarity_icons = {}  # Редкость -> цветная иконка строки
+
         # Определение основного шрифта
         self.app_font = QFont('Oswald')
         self.app_font.setPointSize(11)
         self.setFont(self.app_font)  # Устанавливаем шрифт на родительском виджете
 
         self.initUI()
+        self.inventory_table.selectionModel().selectionChanged.connect(self.suggestion_timer.start)
         # цветные иконки
         self.inventory_table.verticalHeader().setDefaultSectionSize(30)
         self.inventory_table.setIconSize(QSize(10, 30))
@@ -117,7 +188,7 @@ class Tab1(QWidget):
         self.name_filter.setPlaceholderText("Filter by Name")
         self.name_filter.move(20, 20)
         self.name_filter.setFixedSize(150, 24)
-        self.name_filter.textChanged.connect(self.apply_filters)
+        self.name_filter.textChanged.connect(self.filter_timer.start)
         self.name_filter.setStyleSheet("""
             QLineEdit {
                 border: 1px solid #D1B3FF;
@@ -137,7 +208,7 @@ class Tab1(QWidget):
         self.sticker_filter.setPlaceholderText("Filter by Sticker")
         self.sticker_filter.move(20, 54)
         self.sticker_filter.setFixedSize(150, 24)
-        self.sticker_filter.textChanged.connect(self.apply_filters)
+        self.sticker_filter.textChanged.connect(self.filter_timer.start)
         self.sticker_filter.setStyleSheet("""
             QLineEdit {
                 border: 1px solid #D1B3FF;
@@ -154,7 +225,7 @@ class Tab1(QWidget):
         self.float_min_filter.setPlaceholderText("Min Float")
         self.float_min_filter.move(200, 20)
         self.float_min_filter.setFixedSize(75, 24)
-        self.float_min_filter.textChanged.connect(self.apply_filters)
+        self.float_min_filter.textChanged.connect(self.filter_timer.start)
         self.float_min_filter.setStyleSheet("""
             QLineEdit {
                 border: 1px solid #D1B3FF;
@@ -170,7 +241,7 @@ class Tab1(QWidget):
         self.float_max_filter.setPlaceholderText("Max Float")
         self.float_max_filter.move(305, 20)
         self.float_max_filter.setFixedSize(75, 24)
-        self.float_max_filter.textChanged.connect(self.apply_filters)
+        self.float_max_filter.textChanged.connect(self.filter_timer.start)
         self.float_max_filter.setStyleSheet("""
             QLineEdit {
                 border: 1px solid #D1B3FF;
@@ -237,6 +308,33 @@ class Tab1(QWidget):
 
         self.update_avatar()
 
+        # Выбор аккаунта, группы или тега
+        self.account_selector = QComboBox(self)
+        self.account_selector.move(515, 88)
+        self.account_selector.setFixedSize(230, 24)
+        self.account_selector.setMaxVisibleItems(20)
+        self.account_selector.setToolTip("Show items of the selected account, group or tag")
+        self.account_selector.setStyleSheet("""
+            QComboBox {
+                border: 1px solid #D1B3FF;
+                border-radius: 5px;
+                padding: 2px 10px 2px 5px;
+            }
+            QComboBox:focus {
+                border: 1px solid #4147D5;
+            }
+        """)
+        self.populate_account_selector()
+        self.account_selector.currentIndexChanged.connect(self.on_account_selected)
+
+        # Индикатор загрузки аккаунтов
+        self.load_progress = QProgressBar(self)
+        self.load_progress.move(410, 54)
+        self.load_progress.setFixedSize(75, 24)
+        self.load_progress.setFormat("%v/%m")
+        self.load_progress.setToolTip("Accounts loaded")
+        self.load_progress.hide()
+
         # Настройка таблицы инвентаря
         self.inventory_table = QTableWidget(self)
         self.inventory_table.setColumnCount(13)  # Увеличено с 12 до 13
@@ -279,6 +377,11 @@ class Tab1(QWidget):
 
         self.inventory_table.horizontalHeader().sectionClicked.connect(self.handle_header_click)
 
+        # Стикеры и цена лота рисуются делегатами: виджеты в ячейках участвуют в раскладке каждой строки
+        self.inventory_table.setItemDelegateForColumn(1, StickerDelegate(self.sticker_pixmap, self.inventory_table))
+        self.inventory_table.setItemDelegateForColumn(4, PriceDelegate(self.inventory_table))
+        self.csfloat_icon = QIcon(QPixmap(os.path.join(self.icon_path, "csfloat_logo.png")))
+
         # Установка размера и позиции таблицы
         self.inventory_table.setFixedSize(730, 600)
         self.inventory_table.move(20, 132)  # Располагаем таблицу ниже кнопок редкости
@@ -295,6 +398,13 @@ class Tab1(QWidget):
 
         self.load_column_widths()
 
+        # Индекс строк становится неактуальным при сортировке и удалении строк
+        model = self.inventory_table.model()
+        model.layoutChanged.connect(self.invalidate_row_index)
+        model.modelReset.connect(self.invalidate_row_index)
+        model.rowsRemoved.connect(self.invalidate_row_index)
+        model.rowsInserted.connect(self.on_rows_inserted)
+
         # **Call the method to create condition buttons**
         self.create_condition_buttons()
 
@@ -372,7 +482,7 @@ class Tab1(QWidget):
         completer.activated.connect(self.on_item_selected)
 
         # Подключаем сигнал textChanged для обновления фильтров при изменении текста
-        self.test_line_edit.textChanged.connect(self.apply_filters)
+        self.test_line_edit.textChanged.connect(self.filter_timer.start)
 
         # Кнопка для открытия выпадающего списка
         self.dropdown_button = QPushButton("▼", self)
@@ -513,51 +623,281 @@ class Tab1(QWidget):
         self.test_line_edit.setText(item.text())
         self.dropdown_list.hide()
 
-    def load_data(self, threadpool):
-        """Асинхронная загрузка данных для всех API-ключей."""
-        self.user_infos = []
-        self.inventory = []
-        self.stall = []
+    def populate_account_selector(self):
+        """Пункты выбора: все аккаунты, группы, теги и отдельные аккаунты."""
+        groups, tags = group_index(self.accounts)
+        self.account_selector.addItem(f"All accounts ({len(self.accounts)})", None)
+        for group, api_keys in groups.items():
+            self.account_selector.addItem(f"Group: {group} ({len(api_keys)})", tuple(api_keys))
+        for tag, api_keys in tags.items():
+            self.account_selector.addItem(f"Tag: {tag} ({len(api_keys)})", tuple(api_keys))
+        for account in self.accounts:
+            self.account_selector.addItem(account.name, (account.api_key,))
+
+    @pyqtSlot(int)
+    def on_account_selected(self, index):
+        api_keys = self.account_selector.itemData(index)
+        self.selected_api_keys = set(api_keys) if api_keys else None
+        self.apply_filters()
+
+    def load_data(self, scheduler=None):
+        """
+        Асинхронная загрузка данных для всех API-ключей.
+        Сначала загружается аккаунт по умолчанию, остальные аккаунты - после его инвентаря.
+        """
+        if scheduler:
+            self.scheduler = scheduler
+        self.user_infos = {}
+        self.inventory.clear()
+        self.stalls = {}
+        self.stall_by_asset = {}
+        self.accounts_loaded = 0
+        self.populate_timer.stop()
+        self.pending_rows.clear()
+        self.clear_table_rows()
+
+        self.load_progress.setRange(0, len(self.api_keys))
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+
+        self.secondary_started = False
+        if self.daemon_client is not None:
+            # Один локальный запрос вместо запросов к API; при ошибке - обычная загрузка
+            self.scheduler.run(self.fetch_daemon_snapshot, lane=VISIBLE,
+                               on_result=self.handle_daemon_snapshot, on_error=self.handle_daemon_error)
+        else:
+            self.start_loading()
+
+    def start_loading(self, api_keys=None):
+        """Загрузка аккаунтов из API: через процесс данных или в потоках планировщика."""
+        self.loading_api_keys = self.api_keys if api_keys is None else api_keys
+        if self.data_engine is not None and self.data_engine.start():
+            self.load_with_engine(self.loading_api_keys)
+        elif self.default_api_key in self.loading_api_keys:
+            self.load_default_account()
+        else:
+            self.start_secondary_accounts()
+
+    def fetch_daemon_snapshot(self):
+        """Выполняется в потоке пула: данные процесса --daemon с инвентарём в виде записей таблицы."""
+        snapshot = self.daemon_client.snapshot(list(self.api_keys))
+        for entry in snapshot.values():
+            if entry.get('inventory') is not None:
+                entry['inventory'] = ItemStore.make_rows(entry['inventory'])
+        return snapshot
 
+    @pyqtSlot(object)
+    def handle_daemon_snapshot(self, snapshot):
+        """Аккаунты, уже загруженные процессом --daemon, добавляются сразу; остальные загружаются из API."""
         for api_key in self.api_keys:
-            worker = ApiWorker(self.fetch_user_and_inventory, api_key)
-            worker.signals.result.connect(self.handle_api_result)
-            worker.signals.error.connect(self.handle_api_error)
-            threadpool.start(worker)
+            entry = snapshot.get(api_key)
+            if entry is None or not entry.get('user_info'):
+                continue
+            steam_id = entry['user_info'].get("steam_id")
+            if steam_id:
+                self.settings.setValue(self.steam_id_setting(api_key), steam_id)
+            self.handle_api_result({'api_key': api_key, 'user_info': entry['user_info'],
+                                    'inventory': entry.get('inventory'), 'stall': entry.get('stall')})
+        self.update_avatar()
+
+        missing = [api_key for api_key in self.api_keys if api_key not in self.user_infos]
+        if missing:
+            self.start_loading(missing)
+
+    @pyqtSlot(tuple)
+    def handle_daemon_error(self, error):
+        e, _ = error
+        logging.error(f"Daemon Error: {str(e)}")
+        self.start_loading()
+
+    def refresh_daemon(self):
+        """После действий с лотами процесс --daemon перечитывает аккаунты, чтобы не отдавать устаревшие данные."""
+        if self.daemon_client is not None:
+            self.scheduler.run(self.daemon_client.refresh, list(self.api_keys), lane=PREFETCH)
+
+    def load_with_engine(self, api_keys):
+        """Загрузка аккаунтов через процесс данных; аккаунт по умолчанию ставится в очередь первым."""
+        api_keys = sorted(api_keys, key=lambda api_key: api_key != self.default_api_key)
+        self.data_engine.load_accounts(
+            [(api_key, self.settings.value(self.steam_id_setting(api_key), "")) for api_key in api_keys])
+
+    @pyqtSlot(str, object)
+    def handle_engine_user_info(self, api_key, user_info):
+        if not user_info:
+            return
+        user_info['api_key'] = api_key
+        self.user_infos[api_key] = user_info
+        if user_info.get("steam_id"):
+            self.settings.setValue(self.steam_id_setting(api_key), user_info["steam_id"])
+        if api_key == self.default_api_key:
+            self.update_avatar()
+
+    @pyqtSlot(str, object)
+    def handle_engine_rows(self, api_key, rows):
+        """Пакет готовых записей инвентаря: в потоке GUI остаётся только создание строк таблицы."""
+        self.enqueue_inventory_rows(self.inventory.add_rows(self.unsold_rows(api_key, rows), api_key))
+
+    @pyqtSlot(str, object)
+    def handle_engine_stall(self, api_key, stall):
+        self.stalls[api_key] = stall
+        self.apply_stall(stall)
+
+    @pyqtSlot(str, object)
+    def handle_engine_loaded(self, api_key, error):
+        if error:
+            QMessageBox.critical(self, "API Error", f"An error occurred while fetching data: {error}")
+        self.mark_account_loaded()
+
+    def load_default_account(self):
+        """
+        Информация о пользователе, инвентарь и лоты аккаунта по умолчанию запрашиваются параллельно,
+        чтобы таблица заполнилась за один сетевой запрос. Steam ID для лотов берётся из QSettings.
+        """
+        api_key = self.default_api_key
+        steam_id = self.settings.value(self.steam_id_setting(api_key), "")
+        self.default_steam_id = steam_id
+        self.default_parts_left = 3
+
+        # Лимит на ключ не применяется: три запроса аккаунта по умолчанию идут одновременно
+        self.fetch_default_part("user_info")
+        self.fetch_default_part("inventory")
+        if steam_id:
+            self.fetch_default_part("stall", steam_id)
+
+    def fetch_default_part(self, part, steam_id=None):
+        self.scheduler.run(self.fetch_account_part, self.default_api_key, part, steam_id, lane=VISIBLE,
+                           on_result=self.handle_default_part)
+
+    @staticmethod
+    def steam_id_setting(api_key):
+        """Ключ QSettings для Steam ID аккаунта; сам API-ключ в имени настройки не хранится."""
+        return f"steam_id/{hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:16]}"
+
+    def fetch_account_part(self, api_key, part, steam_id=None):
+        """Выполняется в потоке пула: один запрос аккаунта (user_info, inventory или stall)."""
+        try:
+            if part == "user_info":
+                data = get_user_info(api_key)
+            elif part == "inventory":
+                # Записи таблицы строятся в потоке пула по мере получения ответа
+                items = iter_inventory_data(api_key)
+                data = ItemStore.make_rows(items) if items is not None else None
+            else:
+                data = get_stall_data(api_key, steam_id)
+            return {'api_key': api_key, 'part': part, 'data': data, 'steam_id': steam_id, 'error': None}
+        except Exception as e:
+            logging.error(f"API Error ({part}): {str(e)}")
+            return {'api_key': api_key, 'part': part, 'data': None, 'steam_id': steam_id, 'error': str(e)}
+
+    @pyqtSlot(object)
+    def handle_default_part(self, result):
+        """Обработка очередной части данных аккаунта по умолчанию."""
+        api_key = result['api_key']
+        part = result['part']
+        data = result['data']
+        if api_key != self.default_api_key:
+            return
+
+        if part == "user_info":
+            if data:
+                data['api_key'] = api_key
+                self.user_infos[api_key] = data
+                self.update_avatar()
+                steam_id = data.get("steam_id")
+                if steam_id and steam_id != self.default_steam_id:
+                    # Steam ID ещё не сохранён или аккаунт сменился - лоты запрашиваются сейчас
+                    self.settings.setValue(self.steam_id_setting(api_key), steam_id)
+                    if self.default_steam_id:
+                        self.default_parts_left += 1
+                    self.default_steam_id = steam_id
+                    self.fetch_default_part("stall", steam_id)
+                elif not steam_id and not self.default_steam_id:
+                    self.default_parts_left -= 1  # Лоты загрузить нельзя
+            elif not self.default_steam_id:
+                self.default_parts_left -= 1
+
+        elif part == "inventory":
+            if data:
+                self.enqueue_inventory_rows(self.inventory.add_rows(self.unsold_rows(api_key, data), api_key))
+            # Остальные аккаунты загружаются после того, как виден основной
+            self.start_secondary_accounts()
+
+        elif part == "stall":
+            if data and result['steam_id'] == self.default_steam_id:
+                self.stalls[api_key] = data
+                self.apply_stall(data)
+
+        if result['error']:
+            QMessageBox.critical(self, "API Error", f"An error occurred while fetching data: {result['error']}")
+
+        self.default_parts_left -= 1
+        if self.default_parts_left == 0:
+            self.mark_account_loaded()
+
+    def start_secondary_accounts(self):
+        """Запуск загрузки остальных аккаунтов в фоновой полосе."""
+        if self.secondary_started:
+            return
+        self.secondary_started = True
+        for api_key in self.loading_api_keys:
+            if api_key == self.default_api_key:
+                continue
+            self.scheduler.run(self.fetch_user_and_inventory, api_key, lane=BACKGROUND, api_key=api_key,
+                               on_result=self.handle_api_result, on_error=self.handle_api_error)
 
     def fetch_user_and_inventory(self, api_key):
-        """Получение информации о пользователе и инвентаре."""
+        """Получение информации о пользователе, инвентаре и предметах на продаже."""
         user_info = get_user_info(api_key)
-        inventory = get_inventory_data(api_key)
-        return {'api_key': api_key, 'user_info': user_info, 'inventory': inventory}
+        items = iter_inventory_data(api_key)
+        inventory = ItemStore.make_rows(items) if items is not None else None
+        stall = None
+        if user_info and user_info.get("steam_id"):
+            stall = get_stall_data(api_key, user_info["steam_id"])
+        return {'api_key': api_key, 'user_info': user_info, 'inventory': inventory, 'stall': stall}
 
     @pyqtSlot(object)
     def handle_api_result(self, result):
-        """Обработка результатов API-запросов."""
+        """Обработка результатов API-запросов: строки аккаунта добавляются сразу, не дожидаясь остальных."""
         api_key = result.get('api_key')
         user_info = result.get('user_info')
         inventory = result.get('inventory')
+        stall = result.get('stall') or []
 
         if user_info:
             user_info['api_key'] = api_key
-            self.user_infos.append(user_info)
+            self.user_infos[api_key] = user_info
+            self.stalls[api_key] = stall
+
+            self.apply_stall(stall)
 
             if inventory:
-                for item in inventory:
-                    item['api_key'] = api_key
-                    self.inventory.append(item)
+                self.enqueue_inventory_rows(self.inventory.add_rows(self.unsold_rows(api_key, inventory), api_key))
 
-        if len(self.user_infos) == len(self.api_keys):
-            self.load_stall_data()
-            self.populate_inventory_table()
+        self.mark_account_loaded()
 
     @pyqtSlot(tuple)
     def handle_api_error(self, error):
         """Обработка ошибок API-запросов."""
         e, traceback_str = error
         logging.error(f"API Error: {str(e)}\n{traceback_str}")
+        self.mark_account_loaded()
         QMessageBox.critical(self, "API Error", f"An error occurred while fetching data: {str(e)}")
 
+    def mark_account_loaded(self):
+        """Учитывает завершение загрузки одного аккаунта."""
+        self.accounts_loaded += 1
+        self.load_progress.setValue(self.accounts_loaded)
+        if self.accounts_loaded >= len(self.api_keys) and not self.pending_rows:
+            self.finish_loading()
+
+    def finish_loading(self):
+        """Вызывается, когда все аккаунты загружены и все строки добавлены."""
+        self.load_progress.hide()
+        self.inventory_table.setSortingEnabled(True)
+        self.apply_filters()
+        self.apply_last_sort()
+        self.inventory_loaded.emit()
+
     def create_color_icon(self, color: QColor, width: int = 5, height: int = 30) -> QIcon:
         """
         Создает иконку с цветным прямоугольником.
@@ -643,39 +983,11 @@ class Tab1(QWidget):
             self.apply_filters()
 
     def clear_data(self):
-        self.inventory = []  # Очищаем список инвентаря
-        self.stall = []  # Очищаем список предметов на продаже
+        self.inventory.clear()  # Очищаем список инвентаря
+        self.stalls = {}  # Очищаем списки предметов на продаже
+        self.stall_by_asset = {}
         self.inventory_table.clearContents()  # Очищаем таблицу инвентаря
 
-    def load_stall_data(self):
-        """Load stall data for all API keys."""
-        self.stall = []  # Clear the previous stall data
-
-        # Fetch stall data for each API key
-        for api_key in self.api_keys:
-            user_info = next((info for info in self.user_infos if info['api_key'] == api_key), None)
-            if user_info:
-                steam_id = user_info.get("steam_id")
-                if steam_id:
-                    stall_data = get_stall_data(api_key, steam_id)  # Fetch stall data from the API
-                    if stall_data:
-                        self.stall.extend(stall_data)  # Add stall data to the combined list
-
-    def load_inventory(self):
-        # Отключаем сортировку на время загрузки данных
-        self.inventory_table.setSortingEnabled(False)
-
-        # Загружаем данные
-        self.inventory = get_inventory_data(self.default_api_key)
-        if self.inventory is None:
-            self.inventory = []  # Если инвентарь не был загружен, создаем пустой список
-
-        # Загружаем информацию о продаже для текущего ключа
-        self.load_stall_data()
-
-        # Включаем сортировку после загрузки данных
-        self.inventory_table.setSortingEnabled(True)
-
     def handle_header_click(self, logicalIndex):
         if logicalIndex == 0:
             self.name_sort_order = Qt.SortOrder.DescendingOrder if self.name_sort_order == Qt.SortOrder.AscendingOrder else Qt.SortOrder.AscendingOrder
@@ -702,159 +1014,273 @@ class Tab1(QWidget):
         if self.last_sorted_column is not None and self.last_sort_order is not None:
             self.inventory_table.sortItems(self.last_sorted_column, self.last_sort_order)
 
+    def invalidate_row_index(self, *args):
+        """Помечает индекс строк устаревшим (сортировка, удаление строк)."""
+        self._row_index_dirty = True
+
+    def on_rows_inserted(self, parent, first, last):
+        """Вставка в конец таблицы не сдвигает существующие строки."""
+        if last < self.inventory_table.rowCount() - 1:
+            self._row_index_dirty = True
+
+    def rebuild_row_index(self):
+        """Перестраивает индекс asset_id/listing_id -> строка за один проход по таблице."""
+        self.asset_rows = {}
+        self.listing_rows = {}
+        for row in range(self.inventory_table.rowCount()):
+            asset_id_item = self.inventory_table.item(row, 6)
+            if asset_id_item and asset_id_item.text():
+                self.asset_rows[asset_id_item.text()] = row
+            listing_id_item = self.inventory_table.item(row, 5)
+            if listing_id_item and listing_id_item.text():
+                self.listing_rows[listing_id_item.text()] = row
+        self._row_index_dirty = False
+
+    def register_row(self, row, asset_id=None, listing_id=None):
+        """Регистрирует строку в индексе без полного перестроения."""
+        if self._row_index_dirty:
+            return
+        if asset_id:
+            self.asset_rows[asset_id] = row
+        if listing_id:
+            self.listing_rows[listing_id] = row
+
+    def row_for_asset(self, asset_id):
+        """Текущий номер строки для asset_id или None."""
+        if self._row_index_dirty:
+            self.rebuild_row_index()
+        return self.asset_rows.get(asset_id)
+
+    def row_for_listing(self, listing_id):
+        """Текущий номер строки для listing_id или None."""
+        if self._row_index_dirty:
+            self.rebuild_row_index()
+        return self.listing_rows.get(listing_id)
+
+    def api_key_for_asset(self, asset_id):
+        """API-ключ аккаунта предмета из хранилища, либо None."""
+        item = self.inventory.get(asset_id)
+        return self.inventory.api_key(item) if item else None
+
+    def selected_asset_ids(self):
+        """asset_id выделенных видимых строк в порядке выделения."""
+        asset_ids = []
+        for index in self.inventory_table.selectionModel().selectedRows():
+            row = index.row()
+            if not self.inventory_table.isRowHidden(row):
+                asset_id_item = self.inventory_table.item(row, 6)  # Asset ID in column 6
+                if asset_id_item and asset_id_item.text():
+                    asset_ids.append(asset_id_item.text())
+        return asset_ids
+
     def populate_inventory_table(self):
         """Populate the inventory table with combined data from all API keys."""
-        self.inventory_table.setRowCount(0)  # Очищаем таблицу перед добавлением новых строк
+        self.populate_timer.stop()
+        self.pending_rows.clear()
+
+        # Сортировка отключается на время заполнения, иначе строки перемещаются при каждом setItem
+        self.inventory_table.setUpdatesEnabled(False)
+        self.inventory_table.setSortingEnabled(False)
+        self.clear_table_rows()
+
+        # Все строки выделяются одним вызовом: insertRow по одной пересчитывает геометрию виджетов ячеек
+        self.inventory_table.setRowCount(len(self.inventory))
+        for row_position, item in enumerate(self.inventory):
+            self.add_inventory_row(item, self.stall_by_asset.get(item.asset_id), row_position)
+
+        self.inventory_table.setSortingEnabled(True)
+        self.inventory_table.setUpdatesEnabled(True)
+        self.apply_last_sort()
 
-        # Создаем словарь для быстрого поиска данных о продаже
-        stall_dict = {item['item']['asset_id']: item for item in self.stall} if self.stall else {}
+    def clear_table_rows(self):
+        """Очищает строки таблицы и индекс строк."""
+        self.inventory_table.setRowCount(0)
+        self.asset_rows = {}
+        self.listing_rows = {}
+        self._row_index_dirty = False
+
+    def enqueue_inventory_rows(self, items):
+        """Ставит строки в очередь на добавление пакетами по таймеру."""
+        self.pending_rows.extend(items)
+        if not self.populate_timer.isActive():
+            self.populate_timer.start()
+
+    def apply_stall(self, stall):
+        """Запоминает лоты на продаже; строки, уже добавленные в таблицу, обновляются сразу."""
+        sorting_enabled = self.inventory_table.isSortingEnabled()
+        self.inventory_table.setSortingEnabled(False)
+        try:
+            for stall_item in stall:
+                asset_id = stall_item['item']['asset_id']
+                self.stall_by_asset[asset_id] = stall_item
+                row = self.row_for_asset(asset_id)
+                if row is not None:
+                    self.set_listing_cells(row, stall_item)
+        finally:
+            self.inventory_table.setSortingEnabled(sorting_enabled)
+        if sorting_enabled:
+            self.apply_last_sort()
 
-        for item in self.inventory:
+    @pyqtSlot()
+    def populate_next_chunk(self):
+        """Добавляет в таблицу очередной пакет строк; размер пакета подстраивается под ROW_CHUNK_TIME."""
+        started = time.perf_counter()
+        # Время между пакетами - перерисовка и раскладка виджетов ячеек в цикле событий Qt
+        gap = started - self.last_chunk_end if self.last_chunk_end else 0.0
+        count = min(self.chunk_rows, len(self.pending_rows))
+        first_row = self.inventory_table.rowCount()
+
+        self.inventory_table.setUpdatesEnabled(False)
+        self.inventory_table.setSortingEnabled(False)
+        try:
+            self.inventory_table.setRowCount(first_row + count)
+            for row_position in range(first_row, first_row + count):
+                item = self.pending_rows.popleft()
+                self.add_inventory_row(item, self.stall_by_asset.get(item.asset_id), row_position)
+        finally:
+            self.inventory_table.setUpdatesEnabled(True)
+
+        # Раскладка между пакетами растёт с числом строк, поэтому при её преобладании пакет увеличивается
+        elapsed = time.perf_counter() - started
+        if elapsed < self.ROW_CHUNK_TIME / 2 or gap > elapsed:
+            self.chunk_rows = min(self.chunk_rows * 2, 5000)
+        elif elapsed > self.ROW_CHUNK_TIME:
+            self.chunk_rows = max(self.chunk_rows // 2, 20)
+        self.last_chunk_end = time.perf_counter()
+
+        if not self.pending_rows:
+            self.populate_timer.stop()
+            self.last_chunk_end = 0.0
+            if self.accounts_loaded >= len(self.api_keys):
+                self.finish_loading()
+
+    def sticker_pixmap(self, url):
+        """
+        Картинка стикера для StickerDelegate: из памяти или дискового кэша, иначе None и загрузка
+        в полосе PREFETCH. Вызывается при отрисовке, поэтому скачиваются только картинки видимых строк.
+        """
+        pixmap = self.sticker_pixmaps.get(url)
+        if pixmap is not None or url in self.pending_images:
+            return pixmap
+        path = cached_image_path(url)
+        if path:
+            pixmap = QPixmap(path).scaled(20, 20, Qt.AspectRatioMode.KeepAspectRatio)
+            self.sticker_pixmaps[url] = pixmap
+            return pixmap
+        self.pending_images.add(url)
+        self.scheduler.run(self.download_image, url, lane=PREFETCH, on_result=self.handle_image_result)
+        return None
+
+    def download_image(self, url):
+        return url, cache_image(url)
+
+    @pyqtSlot(object)
+    def handle_image_result(self, result):
+        url, path = result
+        if not path:
+            return  # url остаётся в pending_images: неудачная загрузка не повторяется при каждой перерисовке
+        self.pending_images.discard(url)
+        self.sticker_pixmaps[url] = QPixmap(path).scaled(20, 20, Qt.AspectRatioMode.KeepAspectRatio)
+        self.inventory_table.viewport().update()
+
+    def add_inventory_row(self, item, stall_item=None, row_position=None):
+        """Заполняет строку предмета (по умолчанию новую в конце таблицы) и возвращает её номер."""
+        if row_position is None:
             row_position = self.inventory_table.rowCount()
             self.inventory_table.insertRow(row_position)
 
-            asset_id = item.get("asset_id")
-            market_hash_name = item.get("market_hash_name", "")
-
-            # Получение значения Rarity
-            rarity_value = int(item.get("rarity", 1))  # Предполагаем, что 1 - минимальное значение
-            color = RARITY_COLOR_MAP.get(rarity_value, QColor("white"))  # По умолчанию белый
-
-            # Создание иконки цвета
-            color_icon = self.create_color_icon(color)  # Прямоугольная иконка
-
-            # Создание QTableWidgetItem с иконкой и текстом
-            name_item = QTableWidgetItem(market_hash_name)
-            name_item.setIcon(color_icon)
-            name_item.setFont(self.font())  # Используем наследуемый шрифт
-            name_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)  # Выравнивание текста влево
-
-            self.inventory_table.setItem(row_position, 0, name_item)
-
-            # Stickers (колонка 1: Stickers)
-            stickers = item.get("stickers", [])
-            sticker_widgets = []
-            for sticker in stickers:
-                sticker_icon_url = sticker.get("icon_url")
-                sticker_path = cache_image(sticker_icon_url)
-                if sticker_path:
-                    pixmap = QPixmap(sticker_path)
-                    sticker_label = QLabel(self)
-                    sticker_label.setPixmap(pixmap.scaled(20, 20, Qt.AspectRatioMode.KeepAspectRatio))
-                    sticker_label.setToolTip(sticker.get("name", "Unknown"))
-                    sticker_widgets.append(sticker_label)
-
-            sticker_layout = QHBoxLayout()
-            for widget in sticker_widgets:
-                sticker_layout.addWidget(widget)
-            sticker_layout.addStretch()
-            sticker_widget = QWidget()
-            sticker_widget.setLayout(sticker_layout)
-            self.inventory_table.setCellWidget(row_position, 1, sticker_widget)
-
-            # Float Value (колонка 2: Float Value)
-            float_value = item.get('float_value')
-            float_value_text = f"{float_value:.14f}" if float_value is not None else ""
-            float_value_item = QTableWidgetItem(float_value_text)
-            float_value_item.setFont(self.font())  # Применяем шрифт
-            self.inventory_table.setItem(row_position, 2, float_value_item)
-
-            # Добавление данных о продаже, если доступны
-            stall_item = stall_dict.get(asset_id)
-            if stall_item:
-                # Days on Sale (колонка 3: Days on Sale)
-                days_on_sale = calculate_days_on_sale(stall_item['created_at'])
-                days_on_sale_item = QTableWidgetItem(days_on_sale)
-                days_on_sale_item.setFont(self.font())  # Применяем шрифт
-                self.inventory_table.setItem(row_position, 3, days_on_sale_item)
-
-                # Price (колонка 4: Price)
-                price = f"{stall_item['price'] / 100:.2f}$"
-                price_widget = QWidget()
-                price_layout = QHBoxLayout(price_widget)
-                price_layout.setContentsMargins(0, 0, 0, 0)
-
-                csfloat_logo = QLabel()
-                csfloat_logo.setPixmap(QPixmap(os.path.join(self.icon_path, "csfloat_logo.png")).scaled(20, 20,
-                                                                                                        Qt.AspectRatioMode.KeepAspectRatio))
-                price_layout.addWidget(csfloat_logo)
-
-                price_label = QLabel(f" {price}")
-                price_label.setFont(self.font())  # Применяем шрифт
-                price_layout.addWidget(price_label)
-
-                price_layout.addStretch()
-                self.inventory_table.setCellWidget(row_position, 4, price_widget)
-
-                # Listing ID (колонка 5: Listing ID)
-                listing_id_item = QTableWidgetItem(stall_item['id'])
-                listing_id_item.setFont(self.font())  # Применяем шрифт
-                self.inventory_table.setItem(row_position, 5, listing_id_item)
-                self.inventory_table.setColumnHidden(5, True)  # Скрываем колонку Listing ID
-
-                # Created At (колонка 7: Created At)
-                created_at_item = QTableWidgetItem(stall_item['created_at'])
-                created_at_item.setFont(self.font())  # Применяем шрифт
-                self.inventory_table.setItem(row_position, 7, created_at_item)
-
-                # Price Value (колонка 8: Price Value)
-                price_value_item = QTableWidgetItem()
-                price_value_item.setData(Qt.ItemDataRole.DisplayRole, stall_item['price'])
-                price_value_item.setData(Qt.ItemDataRole.UserRole, stall_item['price'])
-                price_value_item.setFont(self.font())  # Применяем шрифт
-                self.inventory_table.setItem(row_position, 8, price_value_item)
-            else:
-                # Заполняем пустыми ячейками, если данных о продаже нет
-                empty_item = QTableWidgetItem("")
-                empty_item.setFont(self.font())  # Применяем шрифт
-                self.inventory_table.setItem(row_position, 3, empty_item)
-                self.inventory_table.setItem(row_position, 4, QTableWidgetItem(""))
-                self.inventory_table.setItem(row_position, 5, QTableWidgetItem(""))
-                self.inventory_table.setColumnHidden(5, True)  # Скрываем колонку Listing ID
-
-            # API Key (колонка 9: API Key)
-            api_key = item.get("api_key", "N/A")
-            api_key_item = QTableWidgetItem(api_key)
-            api_key_item.setFont(self.font())  # Применяем шрифт
-            self.inventory_table.setItem(row_position, 9, api_key_item)
-
-            # Присваиваем значение переменной collection
-            collection = item.get("collection", "N/A")
-
-            # Удаляем префикс "The ", если он присутствует
-            collection = re.sub(r'^The\s+', '', collection)
-
-            # Создаем элемент таблицы с обновленным значением collection
-            collection_item = QTableWidgetItem(collection)
-            collection_item.setFont(self.font())  # Применяем шрифт
-            self.inventory_table.setItem(row_position, 10, collection_item)
-
-            # Rarity (колонка 11: Rarity)
-            rarity = str(item.get("rarity", "N/A"))
-            rarity_item = QTableWidgetItem(rarity)
-            rarity_item.setFont(self.font())  # Применяем шрифт
-            self.inventory_table.setItem(row_position, 11, rarity_item)
-
-            # Добавление Wear Condition (колонка 12: Wear Condition)
-            # Опция 1: Извлечение из поля 'wear_name'
-            wear_name = item.get("wear_name", "N/A")
-
-            # Опция 2: Парсинг из названия предмета, если 'wear_name' отсутствует
-            if wear_name == "N/A":
-                match = re.search(r'\((.*?)\)', market_hash_name)
-                wear_name = match.group(1) if match else "N/A"
-
-            wear_condition_item = QTableWidgetItem(wear_name)
-            wear_condition_item.setFont(self.font())  # Применяем шрифт
-            self.inventory_table.setItem(row_position, 12, wear_condition_item)
-            self.inventory_table.setColumnHidden(12, True)  # Скрываем колонку Wear Condition
-
-            # Asset ID (колонка 6: Asset ID, скрытая)
-            asset_id_item = QTableWidgetItem(asset_id)
-            asset_id_item.setFont(self.font())  # Применяем шрифт
-            self.inventory_table.setItem(row_position, 6, asset_id_item)
-            self.inventory_table.setColumnHidden(6, True)  # Скрываем колонку Asset ID
+        asset_id = item.asset_id
+        market_hash_name = item.name
+
+        # Получение значения Rarity
+        rarity_value = item.rarity
+        color = RARITY_COLOR_MAP.get(rarity_value, QColor("white"))  # По умолчанию белый
+
+        # Создание иконки цвета, одной на редкость
+        color_icon = self.rarity_icons.get(rarity_value)
+        if color_icon is None:
+            color_icon = self.rarity_icons[rarity_value] = self.create_color_icon(color)  # Прямоугольная иконка
+
+        # Создание QTableWidgetItem с иконкой и текстом
+        name_item = QTableWidgetItem(market_hash_name)
+        name_item.setIcon(color_icon)
+        name_item.setFont(self.font())  # Используем наследуемый шрифт
+        name_item.setTextAlignment(
+            Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)  # Выравнивание текста влево
+
+        self.inventory_table.setItem(row_position, 0, name_item)
+
+        # Stickers (колонка 1: Stickers): картинки рисует StickerDelegate
+        stickers = tuple((sticker_name, sticker_icon_url)
+                         for _, _, sticker_name, sticker_icon_url in item.stickers if sticker_icon_url)
+        if stickers:
+            sticker_item = QTableWidgetItem()
+            sticker_item.setData(STICKERS_ROLE, stickers)
+            self.inventory_table.setItem(row_position, 1, sticker_item)
+
+        # Float Value (колонка 2: Float Value)
+        float_value = item.float_value
+        float_value_text = f"{float_value:.14f}" if float_value is not None else ""
+        float_value_item = QTableWidgetItem(float_value_text)
+        float_value_item.setFont(self.font())  # Применяем шрифт
+
+        # Диапазон float скина из справочника
+        skin = self.catalog.skin(item.def_index, item.paint_index)
+        if skin:
+            float_value_item.setToolTip(f"Float range: {skin.min_float} - {skin.max_float}")
+        self.inventory_table.setItem(row_position, 2, float_value_item)
+
+        # Добавление данных о продаже, если доступны
+        if stall_item:
+            self.set_listing_cells(row_position, stall_item, register=False)
+        else:
+            # Заполняем пустыми ячейками, если данных о продаже нет
+            empty_item = QTableWidgetItem("")
+            empty_item.setFont(self.font())  # Применяем шрифт
+            self.inventory_table.setItem(row_position, 3, empty_item)
+            self.inventory_table.setItem(row_position, 4, QTableWidgetItem(""))
+            self.inventory_table.setItem(row_position, 5, QTableWidgetItem(""))
+
+        # API Key, Collection, Rarity и Wear (колонки 9-12) не заполняются: значения берутся из ItemStore
+
+        # Asset ID (колонка 6: Asset ID, скрытая)
+        asset_id_item = QTableWidgetItem(asset_id)
+        asset_id_item.setFont(self.font())  # Применяем шрифт
+        self.inventory_table.setItem(row_position, 6, asset_id_item)
+
+        self.register_row(row_position, asset_id, stall_item['id'] if stall_item else None)
+        return row_position
+
+    def set_listing_cells(self, row_position, stall_item, register=True):
+        """Заполняет колонки продажи (3, 4, 5, 7, 8) строки данными лота."""
+        # Days on Sale (колонка 3: Days on Sale)
+        days_on_sale = calculate_days_on_sale(stall_item['created_at'])
+        days_on_sale_item = QTableWidgetItem(days_on_sale)
+        days_on_sale_item.setFont(self.font())  # Применяем шрифт
+        self.inventory_table.setItem(row_position, 3, days_on_sale_item)
+
+        # Price (колонка 4: Price)
+        self.inventory_table.setItem(row_position, 4, self.create_price_item(stall_item['price']))
+
+        # Listing ID (колонка 5: Listing ID)
+        listing_id_item = QTableWidgetItem(stall_item['id'])
+        listing_id_item.setFont(self.font())  # Применяем шрифт
+        self.inventory_table.setItem(row_position, 5, listing_id_item)
+
+        # Created At (колонка 7: Created At)
+        created_at_item = QTableWidgetItem(stall_item['created_at'])
+        created_at_item.setFont(self.font())  # Применяем шрифт
+        self.inventory_table.setItem(row_position, 7, created_at_item)
+
+        # Price Value (колонка 8: Price Value)
+        price_value_item = QTableWidgetItem()
+        price_value_item.setData(Qt.ItemDataRole.DisplayRole, stall_item['price'])
+        price_value_item.setData(Qt.ItemDataRole.UserRole, stall_item['price'])
+        price_value_item.setFont(self.font())  # Применяем шрифт
+        self.inventory_table.setItem(row_position, 8, price_value_item)
+
+        if register:
+            self.register_row(row_position, listing_id=stall_item['id'])
 
     def load_column_widths(self):
         for i in range(self.inventory_table.columnCount()):
@@ -876,6 +1302,26 @@ class Tab1(QWidget):
 
     @pyqtSlot()
     def apply_filters(self):
+        if self._row_index_dirty:
+            self.rebuild_row_index()
+        self.filter_rows(self.asset_rows)
+        # Скрытие строк не меняет их порядок, поэтому пересортировка после фильтрации не нужна
+
+    def filter_rows(self, asset_ids):
+        """Применяет текущие фильтры к строкам указанных asset_id."""
+        arguments = self.filter_arguments()
+        self.inventory_table.setUpdatesEnabled(False)
+        try:
+            for asset_id in asset_ids:
+                row = self.row_for_asset(asset_id)
+                item = self.inventory.get(asset_id)
+                if row is not None and item is not None:
+                    self.set_row_visible(row, self.item_matches(item, *arguments))
+        finally:
+            self.inventory_table.setUpdatesEnabled(True)
+
+    def filter_arguments(self):
+        """Значения фильтров в порядке аргументов item_matches."""
         name_filter = self.name_filter.text().lower()
         sticker_filter = self.sticker_filter.text().lower()
         selected_rarities = self.selected_rarities  # Хранит выбранные редкости
@@ -891,72 +1337,52 @@ class Tab1(QWidget):
             min_float = None
             max_float = None
 
-        for row in range(self.inventory_table.rowCount()):
-            # Получаем значения из таблицы
-            name_item = self.inventory_table.item(row, 0).text().lower()
-            float_value_text = self.inventory_table.item(row, 2).text()
-            float_value = float(float_value_text) if float_value_text else None
-
-            # Получение редкости из скрытой колонки 11
-            rarity_item = self.inventory_table.item(row, 11)
-            rarity = int(rarity_item.text()) if rarity_item and rarity_item.text().isdigit() else None
-
-            # Получение wear_condition из скрытой колонки 12
-            wear_condition_item = self.inventory_table.item(row, 12)
-            wear_condition = wear_condition_item.text() if wear_condition_item else "N/A"
-
-            # Фильтрация по редкости
-            if selected_rarities:
-                matches_rarity = rarity in selected_rarities
-            else:
-                matches_rarity = True  # Если ничего не выбрано, не фильтруем по редкости
+        # Фильтр по аккаунту, группе или тегу
+        allowed_accounts = None
+        if self.selected_api_keys is not None:
+            allowed_accounts = {self.inventory.account_code(api_key) for api_key in self.selected_api_keys}
 
-            # Фильтрация по состоянию
-            if selected_conditions:
-                matches_condition = wear_condition in selected_conditions
-            else:
-                matches_condition = True  # Если ничего не выбрано, не фильтруем по состоянию
-
-            # Фильтрация по стикерам
-            stickers_widget = self.inventory_table.cellWidget(row, 1)
-            sticker_names = ""
-            if stickers_widget:
-                for i in range(stickers_widget.layout().count()):
-                    sticker_label = stickers_widget.layout().itemAt(i).widget()
-                    if sticker_label and sticker_label.toolTip():
-                        sticker_names += sticker_label.toolTip().lower()
-
-            matches_name = name_filter in name_item
-            matches_sticker = sticker_filter in sticker_names
-
-            matches_float = (
-                    (min_float is None or (float_value is not None and float_value >= min_float)) and
-                    (max_float is None or (float_value is not None and float_value <= max_float))
-            )
-
-            # Фильтрация по коллекции
-            if collection_filter:
-                collection_item = self.inventory_table.item(row, 10).text().lower()
-                matches_collection = (collection_item == collection_filter)
-            else:
-                matches_collection = True  # Если фильтр коллекции не задан, не фильтруем по ней
-
-            # Установка видимости строки на основе всех фильтров
-            self.inventory_table.setRowHidden(row, not (
-                    matches_name and
-                    matches_sticker and
-                    matches_float and
-                    matches_rarity and
-                    matches_collection and
-                    matches_condition
-            ))
-
-            # Отладочное сообщение
-            # print(f"Row {row}: collection_filter='{collection_filter}', collection_item='{collection_item}', matches_collection={matches_collection}")
-
-        # Переустанавливаем сортировку после фильтрации
-        if self.last_sorted_column is not None and self.last_sort_order is not None:
-            self.inventory_table.sortItems(self.last_sorted_column, self.last_sort_order)
+        return (name_filter, sticker_filter, min_float, max_float, selected_rarities,
+                selected_conditions, collection_filter, allowed_accounts)
+
+    def set_row_visible(self, row, visible):
+        # setRowHidden вызывается только при смене состояния: на сотнях тысяч строк это основная стоимость
+        if self.inventory_table.isRowHidden(row) == visible:
+            self.inventory_table.setRowHidden(row, not visible)
+
+    @staticmethod
+    def item_matches(item, name_filter, sticker_filter, min_float, max_float, selected_rarities,
+                     selected_conditions, collection_filter, allowed_accounts):
+        """Проверка записи предмета по всем фильтрам."""
+        if allowed_accounts is not None and item.account not in allowed_accounts:
+            return False
+
+        float_value = item.float_value
+
+        # Фильтрация по редкости (если ничего не выбрано, не фильтруем)
+        if selected_rarities and item.rarity not in selected_rarities:
+            return False
+
+        # Фильтрация по состоянию
+        if selected_conditions and item.wear not in selected_conditions:
+            return False
+
+        if name_filter not in item.name.lower():
+            return False
+
+        # Фильтрация по стикерам
+        if sticker_filter and sticker_filter not in item.sticker_names().lower():
+            return False
+
+        if min_float is not None and (float_value is None or float_value < min_float):
+            return False
+        if max_float is not None and (float_value is None or float_value > max_float):
+            return False
+
+        # Фильтрация по коллекции
+        if collection_filter and item.collection.lower() != collection_filter:
+            return False
+        return True
 
     def show_confirmation_dialog(self, message):
         reply = QMessageBox.question(self, "Confirmation", message,
@@ -975,21 +1401,12 @@ class Tab1(QWidget):
             QMessageBox.warning(self, "Warning", "Please select items to sell.")
             return
 
-        successful_sales = []
         already_listed_items = []
-        selected_asset_ids = set()
-
-        for index in selected_indexes:
-            row = index.row()
-            if not self.inventory_table.isRowHidden(row):
-                asset_id_item = self.inventory_table.item(row, 6)  # Asset ID in column 6
-                if asset_id_item and asset_id_item.text():
-                    selected_asset_ids.add(asset_id_item.text())
 
         items_to_sell = []
-        for row in range(self.inventory_table.rowCount()):
-            asset_id_item = self.inventory_table.item(row, 6)  # Asset ID in column 6
-            if asset_id_item and asset_id_item.text() in selected_asset_ids:
+        for asset_id in self.selected_asset_ids():
+            row = self.row_for_asset(asset_id)
+            if row is not None:
                 item_name = self.inventory_table.item(row, 0).text()
 
                 # Check if the item is already listed
@@ -1004,27 +1421,25 @@ class Tab1(QWidget):
                     return
 
                 try:
-                    price = float(price_input)
-                    if price < self.min_price / 100:
-                        QMessageBox.warning(self, "Warning", f"Price cannot be lower than ${self.min_price / 100:.2f}.")
-                        return
-                    if price * 100 > self.max_price:
-                        QMessageBox.warning(self, "Warning",
-                                            f"Maximum allowed price is ${self.max_price / 100:.2f} USD")
-                        return
-                    price = int(price * 100)
-                except ValueError as e:
-                    QMessageBox.warning(self, "Error", f"Invalid price input: {e}")
+                    # Центы из текста без float: 0.29 -> 29, а не 28
+                    price = to_cents(price_input)
+                except ValueError:
+                    QMessageBox.warning(self, "Error", f"Invalid price input: {price_input}")
+                    return
+                if price < self.min_price:
+                    QMessageBox.warning(self, "Warning", f"Price cannot be lower than ${self.min_price / 100:.2f}.")
+                    return
+                if price > self.max_price:
+                    QMessageBox.warning(self, "Warning", f"Maximum allowed price is ${self.max_price / 100:.2f} USD")
                     return
 
-                api_key_item = self.inventory_table.item(row, 9)  # Fetch the API key from column 9
-                if api_key_item:
-                    api_key = api_key_item.text()
-                    items_to_sell.append((row, asset_id_item.text(), item_name, price, api_key))
+                api_key = self.api_key_for_asset(asset_id)
+                if api_key:
+                    items_to_sell.append((asset_id, item_name, price, api_key))
 
         if items_to_sell:
             grouped_operations = defaultdict(int)
-            for _, _, item_name, price, _ in items_to_sell:
+            for _, item_name, price, _ in items_to_sell:
                 grouped_operations[(item_name, price)] += 1
 
             confirm_message = "You are about to sell the following items:\n"
@@ -1037,30 +1452,84 @@ class Tab1(QWidget):
             if not self.show_confirmation_dialog(confirm_message.strip()):
                 return
 
-        for row, asset_id, item_name, price, api_key in items_to_sell:
+        if not items_to_sell:
+            if already_listed_items:
+                QMessageBox.warning(self, "Warning",
+                                    "The following items are already listed:\n" + "\n".join(already_listed_items))
+            return
+
+        # Запросы уходят в интерактивную полосу планировщика и не блокируют интерфейс
+        self.set_actions_enabled(False)
+        self.scheduler.run(self.run_sell_batch, items_to_sell, already_listed_items, lane=INTERACTIVE,
+                           on_result=self.handle_sell_result, on_error=self.handle_action_error)
+
+    def run_sell_batch(self, items_to_sell, already_listed_items):
+        """Выполняется в потоке пула: выставление предметов на продажу до первой ошибки."""
+        successful_sales = []
+        error = None
+        for asset_id, item_name, price, api_key in items_to_sell:
             try:
                 response = sell_item(api_key, asset_id, price)  # Pass the correct API key
                 listing_id = response.get("id") if response else None
                 if listing_id:
-                    successful_sales.append((item_name, price / 100))
-                    self.update_item_as_sold(row, price, listing_id)
+                    successful_sales.append((asset_id, item_name, price, listing_id))
                     time.sleep(0.1)
             except ValueError as ve:
-                QMessageBox.warning(self, "Warning", str(ve))
-                return
+                error = ("Warning", str(ve))
+                break
             except urllib.error.HTTPError as http_err:
-                QMessageBox.warning(self, "Error", f"HTTP error occurred: {http_err}")
-                return
+                error = ("Error", f"HTTP error occurred: {http_err}")
+                break
             except Exception as e:
-                QMessageBox.warning(self, "Error", f"{str(e)}")
-                return
+                error = ("Error", f"{str(e)}")
+                break
+        return {'sold': successful_sales, 'error': error, 'already_listed': already_listed_items}
+
+    @pyqtSlot(object)
+    def handle_sell_result(self, result):
+        """Обновление строк проданных предметов и вывод итогов."""
+        self.set_actions_enabled(True)
+        self.refresh_daemon()
+        successful_sales = []
+        edited = []
+
+        # Строки не должны перемещаться, пока обновляется пакет
+        self.inventory_table.setSortingEnabled(False)
+        try:
+            for asset_id, item_name, price, listing_id in result['sold']:
+                successful_sales.append((item_name, price / 100))
+                edited.append((self.api_key_for_asset(asset_id), listing_id, price, asset_id, item_name))
+                row = self.row_for_asset(asset_id)
+                if row is not None:
+                    self.update_item_as_sold(row, price, listing_id)
+        finally:
+            self.inventory_table.setSortingEnabled(True)
+            self.apply_last_sort()
+        if edited:
+            self.listings_edited.emit(edited)
+
+        if result['error']:
+            QMessageBox.warning(self, *result['error'])
 
         if successful_sales:
             self.show_grouped_operations(successful_sales)
 
-        if already_listed_items:
+        if result['already_listed']:
             QMessageBox.warning(self, "Warning",
-                                "The following items are already listed:\n" + "\n".join(already_listed_items))
+                                "The following items are already listed:\n" + "\n".join(result['already_listed']))
+
+    @pyqtSlot(tuple)
+    def handle_action_error(self, error):
+        """Непредвиденная ошибка в пакетной операции."""
+        self.set_actions_enabled(True)
+        e, traceback_str = error
+        logging.error(f"Action Error: {str(e)}\n{traceback_str}")
+        QMessageBox.warning(self, "Error", f"An unexpected error occurred: {str(e)}")
+
+    def set_actions_enabled(self, enabled):
+        """Блокирует кнопки действий, пока пакет запросов не завершится."""
+        for button in (self.sell_button, self.change_price_button, self.delist_button):
+            button.setEnabled(enabled)
 
     def change_item_price(self):
         selected_indexes = self.inventory_table.selectionModel().selectedRows()
@@ -1068,157 +1537,186 @@ class Tab1(QWidget):
             QMessageBox.warning(self, "Warning", "Please select items to change the price.")
             return
 
-        items_to_change = []
-
-        selected_asset_ids = set()
-        for index in selected_indexes:
-            row = index.row()
-            if not self.inventory_table.isRowHidden(row):
-                asset_id_item = self.inventory_table.item(row, 6)
-                if asset_id_item and asset_id_item.text():
-                    selected_asset_ids.add(asset_id_item.text())
-
-        for row in range(self.inventory_table.rowCount()):
-            asset_id_item = self.inventory_table.item(row, 6)
-            if asset_id_item and asset_id_item.text() in selected_asset_ids:
-                listing_id = self.inventory_table.item(row, 5).text()
-                if not listing_id:
-                    QMessageBox.warning(self, "Warning", "Price can only be changed for listed items.")
-                    continue
+        # Поле цены принимает правила: "12.5", "+1", "-5%", "-2%; min 10; round .x9", "rarity:6 *0.95"
+        try:
+            steps = parse_rules(self.price_input.text().strip())
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
 
-                item_name = self.inventory_table.item(row, 0).text()
-                current_price_widget = self.inventory_table.cellWidget(row, 4)
-                if not current_price_widget:
-                    QMessageBox.warning(self, "Warning", "Unable to retrieve current price widget.")
-                    continue
+        # Цены берутся из колонки 8 в центах, а не из текста виджета
+        listings = []
+        skipped = []
+        for asset_id in self.selected_asset_ids():
+            row = self.row_for_asset(asset_id)
+            if row is None:
+                continue
+            item_name = self.inventory_table.item(row, 0).text()
+            listing_id_item = self.inventory_table.item(row, 5)
+            price_value_item = self.inventory_table.item(row, 8)
+            price = price_value_item.data(Qt.ItemDataRole.UserRole) if price_value_item else None
+            if not listing_id_item or not listing_id_item.text() or price is None:
+                skipped.append((item_name, "Not listed"))
+                continue
+            api_key = self.api_key_for_asset(asset_id)
+            if not api_key:
+                skipped.append((item_name, "API key is missing"))
+                continue
+            item = self.inventory.get(asset_id)
+            listings.append(Listing(listing_id_item.text(), asset_id, item_name, api_key, int(price),
+                                    item.collection if item else "", item.rarity if item else 0))
+
+        changes = reprice(listings, steps)
+        if not self.show_repricing_preview(changes, skipped):
+            return
 
-                # Get current price
-                current_price = float(current_price_widget.layout().itemAt(1).widget().text().strip().replace("$", ""))
+        items_to_change = [(change.listing_id, change.asset_id, change.name, change.old_price, change.new_price,
+                            change.api_key)
+                           for change in changes if change.status == STATUS_OK]
+        if not items_to_change:
+            return
 
-                try:
-                    price_input = self.price_input.text().strip()
-                    if not price_input:
-                        QMessageBox.warning(self, "Warning", "Price field must be filled.")
-                        return
-
-                    # Handle percentage change
-                    if price_input.endswith('%'):
-                        percentage_str = price_input[:-1].strip()
-
-                        if not percentage_str:
-                            QMessageBox.warning(self, "Warning", "Please enter a number before the '%' symbol.")
-                            return
-
-                        try:
-                            percentage_change = float(percentage_str)
-                        except ValueError:
-                            QMessageBox.warning(self, "Warning", "Only numbers are accepted for percentage changes.")
-                            return
-
-                        if percentage_change == 0:
-                            QMessageBox.warning(self, "Warning", "Price will not change.")
-                            return
-
-                        is_increase = percentage_change > 0
-
-                        if is_increase:
-                            new_price = current_price * (1 + percentage_change / 100)
-                        else:
-                            new_price = current_price * (1 + percentage_change / 100)
-
-                        new_price_cents = int(round(new_price * 100))
-
-                        if new_price_cents == int(current_price * 100):
-                            QMessageBox.warning(self, "Warning", "Price will not change.")
-                            return
-
-                    # Handle direct numeric changes (e.g., "+1" or "-2")
-                    elif price_input.startswith('+') or price_input.startswith('-'):
-                        try:
-                            change_value = float(price_input)
-                        except ValueError:
-                            QMessageBox.warning(self, "Error",
-                                                "Only valid numeric values are accepted for price changes.")
-                            return
-
-                        new_price = current_price + change_value
-                        new_price_cents = int(round(new_price * 100))
-
-                        if new_price_cents == int(current_price * 100):
-                            QMessageBox.warning(self, "Warning", "Price will not change.")
-                            return
-
-                    # Handle exact price input
-                    else:
-                        try:
-                            new_price = float(price_input)
-                        except ValueError:
-                            QMessageBox.warning(self, "Error", "Only numbers or percentage changes are accepted.")
-                            return
-
-                    # Ensure the new price is within valid bounds
-                    if new_price * 100 < self.min_price:
-                        QMessageBox.warning(self, "Warning", f"Price cannot be lower than ${self.min_price / 100:.2f}.")
-                        return
-                    if new_price * 100 > self.max_price:
-                        QMessageBox.warning(self, "Warning",
-                                            f"Maximum allowed price is ${self.max_price / 100:.2f} USD")
-                        return
-
-                    # Round new price to nearest cent
-                    new_price = int(round(new_price * 100))
-
-                except ValueError as e:
-                    QMessageBox.warning(self, "Error", f"Invalid price input: {e}")
-                    return
+        self.set_actions_enabled(False)
+        self.scheduler.run(self.run_price_batch, items_to_change, lane=INTERACTIVE,
+                           on_result=self.handle_price_result, on_error=self.handle_action_error)
 
-                # Fetch API key from column 9
-                api_key_item = self.inventory_table.item(row, 9)
-                if api_key_item:
-                    api_key = api_key_item.text()
-                else:
-                    QMessageBox.warning(self, "Error", "API key is missing for the selected item.")
-                    continue
+    @pyqtSlot()
+    def request_price_suggestions(self):
+        """Запрашивает самые низкие цены для выделенных предметов; одинаковые названия - одним запросом."""
+        asset_ids = self.selected_asset_ids()[:self.MAX_SUGGESTIONS]
+        self.suggestion_assets = defaultdict(list)
+        for asset_id in asset_ids:
+            item = self.inventory.get(asset_id)
+            if item is not None:
+                self.suggestion_assets[item.name].append(asset_id)
+
+        names = list(self.suggestion_assets)
+        self.price_input.setPlaceholderText("Price")
+        self.price_suggestions.request(names)
 
-                # Add to the list of items to change price
-                items_to_change.append((row, asset_id_item.text(), item_name, current_price, new_price / 100, api_key))
+    @pyqtSlot(str, object)
+    def show_price_suggestion(self, name, price):
+        """Подсказка в колонке Price; у выставленных предметов - серым текстом после цены лота (PriceDelegate)."""
+        asset_ids = self.suggestion_assets.get(name)
+        if not asset_ids or price is None:
+            return
 
-        # Confirm changes
-        if items_to_change:
-            grouped_operations = defaultdict(int)
-            for _, _, item_name, current_price, new_price, _ in items_to_change:
-                grouped_operations[(item_name, current_price, new_price)] += 1
+        text = f"≈ {price / 100:.2f}$"
+        for asset_id in asset_ids:
+            row = self.row_for_asset(asset_id)
+            if row is None:
+                continue
+            price_item = self.inventory_table.item(row, 4)
+            if price_item is None:
+                price_item = QTableWidgetItem()
+                price_item.setFont(self.app_font)
+                self.inventory_table.setItem(row, 4, price_item)
+            price_item.setData(SUGGESTION_ROLE, text)
+            price_item.setToolTip("Lowest CSFloat listing")
+
+        # Если выделены предметы одного названия, цена подставляется подсказкой в поле цены
+        if len(self.suggestion_assets) == 1:
+            self.price_input.setPlaceholderText(f"{price / 100:.2f}")
+
+    def create_price_item(self, price):
+        """Ячейка цены лота: логотип CSFloat и цена в долларах; рядом PriceDelegate рисует подсказку."""
+        price_item = QTableWidgetItem(f"{price / 100:.2f}$")
+        price_item.setIcon(self.csfloat_icon)
+        price_item.setFont(self.app_font)
+        return price_item
+
+    def show_repricing_preview(self, changes, skipped):
+        """Одна таблица со всеми новыми ценами и результатами проверки. True - применить изменения."""
+        applicable = sum(1 for change in changes if change.status == STATUS_OK)
 
-            confirm_message = "You are about to change the price for the following items:\n"
-            for (item_name, current_price, new_price), count in grouped_operations.items():
-                if count > 1:
-                    confirm_message += f"{count}x {item_name} {current_price:.2f}$ → {new_price:.2f}$\n"
-                else:
-                    confirm_message += f"{item_name} {current_price:.2f}$ → {new_price:.2f}$\n"
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Price Change Preview")
+        dialog.resize(640, 480)
+        layout = QVBoxLayout(dialog)
 
-            if not self.show_confirmation_dialog(confirm_message.strip()):
-                return
+        summary_label = QLabel(f"{applicable} of {len(changes) + len(skipped)} items will change price.")
+        summary_label.setFont(self.app_font)
+        layout.addWidget(summary_label)
+
+        table = QTableWidget(len(changes) + len(skipped), 4, dialog)
+        table.setHorizontalHeaderLabels(["Item", "Current", "New", "Status"])
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        warning_brush = QBrush(QColor("#FF6347"))
+        row = 0
+        for change in changes:
+            values = (change.name, f"{change.old_price / 100:.2f}$", f"{change.new_price / 100:.2f}$", change.status)
+            for column, value in enumerate(values):
+                cell = QTableWidgetItem(value)
+                if change.status != STATUS_OK:
+                    cell.setForeground(warning_brush)
+                table.setItem(row, column, cell)
+            row += 1
+        for item_name, reason in skipped:
+            for column, value in enumerate((item_name, "", "", reason)):
+                cell = QTableWidgetItem(value)
+                cell.setForeground(warning_brush)
+                table.setItem(row, column, cell)
+            row += 1
+        layout.addWidget(table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        ok_button = buttons.button(QDialogButtonBox.StandardButton.Ok)
+        ok_button.setText(f"Apply {applicable} changes")
+        ok_button.setEnabled(applicable > 0)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        return dialog.exec() == QDialog.DialogCode.Accepted
+
+    def run_price_batch(self, items_to_change):
+        """Выполняется в потоке пула: смена цен до первой ошибки. Цены в центах."""
+        successful_changes = []
+        error = None
+        for listing_id, asset_id, item_name, current_price, new_price, api_key in items_to_change:
+            try:
+                response = change_price(api_key, listing_id, new_price)  # Use the correct API key
+                if response:
+                    successful_changes.append((listing_id, asset_id, item_name, current_price, new_price, api_key))
+                    time.sleep(0.1)
+            except ValueError as ve:
+                error = ("Warning", str(ve))
+                break
+            except urllib.error.HTTPError as http_err:
+                error = ("Error", f"HTTP error occurred: {http_err}")
+                break
+            except Exception as e:
+                error = ("Error", f"An unexpected error occurred: {str(e)}")
+                break
+        return {'changed': successful_changes, 'error': error}
 
-        # Process successful changes
+    @pyqtSlot(object)
+    def handle_price_result(self, result):
+        """Обновление цен в таблице и вывод итогов."""
+        self.set_actions_enabled(True)
+        self.refresh_daemon()
         successful_changes = []
-        for row, asset_id, item_name, current_price, new_price, api_key in items_to_change:
-            listing_id = self.inventory_table.item(row, 5).text()
-            if listing_id:
-                try:
-                    response = change_price(api_key, listing_id, int(new_price * 100))  # Use the correct API key
-                    if response:
-                        successful_changes.append((item_name, current_price, new_price))
-                        self.update_item_price(row, int(new_price * 100))
-                        time.sleep(0.1)
-                except ValueError as ve:
-                    QMessageBox.warning(self, "Warning", str(ve))
-                    return
-                except urllib.error.HTTPError as http_err:
-                    QMessageBox.warning(self, "Error", f"HTTP error occurred: {http_err}")
-                    return
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", f"An unexpected error occurred: {str(e)}")
-                    return
+        edited = []
+
+        self.inventory_table.setSortingEnabled(False)
+        try:
+            for listing_id, asset_id, item_name, current_price, new_price, api_key in result['changed']:
+                successful_changes.append((item_name, current_price, new_price))
+                edited.append((api_key, listing_id, new_price, asset_id, item_name))
+                row = self.row_for_listing(listing_id)
+                if row is not None:
+                    self.update_item_price(row, new_price)
+        finally:
+            self.inventory_table.setSortingEnabled(True)
+            self.apply_last_sort()
+        if edited:
+            self.listings_edited.emit(edited)
+
+        if result['error']:
+            QMessageBox.warning(self, *result['error'])
 
         if successful_changes:
             self.show_price_change_operations(successful_changes)
@@ -1246,31 +1744,15 @@ class Tab1(QWidget):
         days_on_sale_item.setTextAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
         self.inventory_table.setItem(row, 3, days_on_sale_item)
 
-        # Создание виджета для Price (колонка 4)
-        price_widget = QWidget()
-        price_layout = QHBoxLayout(price_widget)
-        price_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Добавление иконки CSFloat
-        csfloat_logo = QLabel()
-        csfloat_logo.setPixmap(QPixmap(os.path.join(self.icon_path, "csfloat_logo.png")).scaled(20, 20,
-                                                                                                Qt.AspectRatioMode.KeepAspectRatio))
-        price_layout.addWidget(csfloat_logo)
-
-        # Создание и установка QLabel для цены с установленным шрифтом
-        price_label = QLabel(f" {price / 100:.2f}$")
-        price_label.setFont(self.app_font)  # Устанавливаем стандартный шрифт
-        price_layout.addWidget(price_label)
-
-        price_layout.addStretch()
-        self.inventory_table.setCellWidget(row, 4, price_widget)
+        # Price (колонка 4)
+        self.inventory_table.setItem(row, 4, self.create_price_item(price))
 
         # Создание и установка элемента Listing ID (колонка 5)
         listing_id_item = QTableWidgetItem(listing_id)
         listing_id_item.setFont(self.app_font)  # Устанавливаем стандартный шрифт
         listing_id_item.setTextAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
         self.inventory_table.setItem(row, 5, listing_id_item)
-        self.inventory_table.setColumnHidden(5, True)  # Скрываем колонку Listing ID
+        self.register_row(row, listing_id=listing_id)
 
         # Создание и установка элемента Created At (колонка 7)
         created_at_item = QTableWidgetItem(datetime.now(timezone.utc).isoformat())
@@ -1285,30 +1767,9 @@ class Tab1(QWidget):
         price_value_item.setFont(self.app_font)  # Устанавливаем стандартный шрифт
         self.inventory_table.setItem(row, 8, price_value_item)
 
-        # Применение сортировки после обновления
-        if self.last_sorted_column is not None and self.last_sort_order is not None:
-            self.inventory_table.sortItems(self.last_sorted_column, self.last_sort_order)
-        self.apply_last_sort()
-
     def update_item_price(self, row, new_price):
-        # Создание виджета для Price (колонка 4)
-        price_widget = QWidget()
-        price_layout = QHBoxLayout(price_widget)
-        price_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Добавление иконки CSFloat
-        csfloat_logo = QLabel()
-        csfloat_logo.setPixmap(QPixmap(os.path.join(self.icon_path, "csfloat_logo.png")).scaled(20, 20,
-                                                                                                Qt.AspectRatioMode.KeepAspectRatio))
-        price_layout.addWidget(csfloat_logo)
-
-        # Создание и установка QLabel для новой цены с установленным шрифтом
-        price_label = QLabel(f" {new_price / 100:.2f}$")
-        price_label.setFont(self.app_font)  # Устанавливаем стандартный шрифт
-        price_layout.addWidget(price_label)
-
-        price_layout.addStretch()
-        self.inventory_table.setCellWidget(row, 4, price_widget)
+        # Price (колонка 4)
+        self.inventory_table.setItem(row, 4, self.create_price_item(new_price))
 
         # Создание и установка элемента Created At (колонка 7)
         created_at_item = QTableWidgetItem(datetime.now(timezone.utc).isoformat())
@@ -1323,11 +1784,6 @@ class Tab1(QWidget):
         price_value_item.setFont(self.app_font)  # Устанавливаем стандартный шрифт
         self.inventory_table.setItem(row, 8, price_value_item)
 
-        # Применение сортировки после обновления
-        if self.last_sorted_column is not None and self.last_sort_order is not None:
-            self.inventory_table.sortItems(self.last_sorted_column, self.last_sort_order)
-        self.apply_last_sort()
-
     def delist_items(self):
         selected_indexes = self.inventory_table.selectionModel().selectedRows()
         if not selected_indexes:
@@ -1335,14 +1791,10 @@ class Tab1(QWidget):
             return
 
         items_to_delist = []
-        persistent_indexes = []
-
-        for index in selected_indexes:
-            row = index.row()
-            if not self.inventory_table.isRowHidden(row):
-                persistent_index = QPersistentModelIndex(self.inventory_table.model().index(row, 0))
-                persistent_indexes.append(persistent_index)
 
+        for asset_id in self.selected_asset_ids():
+            row = self.row_for_asset(asset_id)
+            if row is not None:
                 # Fetch listing ID (column 5)
                 listing_id = self.inventory_table.item(row, 5).text()
                 # Check if listing_id exists (item is being sold)
@@ -1353,20 +1805,18 @@ class Tab1(QWidget):
                 # Fetch the item name (column 0)
                 item_name = self.inventory_table.item(row, 0).text()
 
-                # Fetch the API key from column 9
-                api_key_item = self.inventory_table.item(row, 9)
-                if api_key_item:
-                    api_key = api_key_item.text()
-                else:
+                # API-ключ аккаунта из хранилища предметов
+                api_key = self.api_key_for_asset(asset_id)
+                if not api_key:
                     QMessageBox.warning(self, "Error", "API key is missing for the selected item.")
                     continue
 
                 # Add to the list of items to delist
-                items_to_delist.append((persistent_index, listing_id, item_name, api_key))
+                items_to_delist.append((listing_id, item_name, api_key))
 
         if items_to_delist:
             grouped_items = defaultdict(int)
-            for _, _, item_name, _ in items_to_delist:
+            for _, item_name, _ in items_to_delist:
                 grouped_items[item_name] += 1
 
             confirm_message = "You are about to delist the following items:\n"
@@ -1379,41 +1829,75 @@ class Tab1(QWidget):
             if not self.show_confirmation_dialog(confirm_message.strip()):
                 return
 
-        self.inventory_table.setSortingEnabled(False)
+        if not items_to_delist:
+            return
 
-        items_delisted = []
-        for persistent_index, listing_id, item_name, api_key in items_to_delist:
-            row = persistent_index.row()
+        self.set_actions_enabled(False)
+        self.scheduler.run(self.run_delist_batch, items_to_delist, lane=INTERACTIVE,
+                           on_result=self.handle_delist_result, on_error=self.handle_action_error)
+
+    def run_delist_batch(self, items_to_delist):
+        """Выполняется в потоке пула: снятие предметов с продажи до первой ошибки."""
+        delisted = []
+        failed = []
+        error = None
+        for listing_id, item_name, api_key in items_to_delist:
             try:
                 # Send delist request with the correct API key
                 response = delete_item(api_key, listing_id)
                 if response:
-                    items_delisted.append(item_name)
-                    self.update_item_as_unsold(row)  # Mark item as unsold in the table
+                    delisted.append((listing_id, item_name, api_key))
                     time.sleep(0.1)
                 else:
-                    QMessageBox.warning(self, "Error", f"Failed to delist item {item_name}.")
+                    failed.append(item_name)
             except ValueError as ve:
-                QMessageBox.warning(self, "Warning", str(ve))
-                return
+                error = ("Warning", str(ve))
+                break
             except urllib.error.HTTPError as http_err:
-                QMessageBox.warning(self, "Error", f"HTTP error occurred: {http_err}")
-                return
+                error = ("Error", f"HTTP error occurred: {http_err}")
+                break
             except Exception as e:
-                QMessageBox.warning(self, "Error", f"An unexpected error occurred: {str(e)}")
-                return
+                error = ("Error", f"An unexpected error occurred: {str(e)}")
+                break
+        return {'delisted': delisted, 'failed': failed, 'error': error}
 
-        if items_delisted:
-            self.show_delisted_items(items_delisted)
+    @pyqtSlot(object)
+    def handle_delist_result(self, result):
+        """Возврат снятых предметов в инвентарь и вывод итогов."""
+        self.set_actions_enabled(True)
+        self.refresh_daemon()
+        items_delisted = []
+        edited = []
 
-        self.inventory_table.setSortingEnabled(True)
-        self.inventory_table.model().layoutChanged.emit()
+        self.inventory_table.setSortingEnabled(False)
+        try:
+            for listing_id, item_name, api_key in result['delisted']:
+                items_delisted.append(item_name)
+                edited.append((api_key, listing_id, None, None, item_name))
+                row = self.row_for_listing(listing_id)
+                if row is not None:
+                    self.update_item_as_unsold(row)  # Mark item as unsold in the table
+        finally:
+            self.inventory_table.setSortingEnabled(True)
+            self.apply_last_sort()
+        if edited:
+            self.listings_edited.emit(edited)
 
-        self.apply_last_sort()
+        for item_name in result['failed']:
+            QMessageBox.warning(self, "Error", f"Failed to delist item {item_name}.")
+
+        if result['error']:
+            QMessageBox.warning(self, *result['error'])
+
+        if items_delisted:
+            self.show_delisted_items(items_delisted)
 
     def update_item_as_unsold(self, row):
+        listing_id_item = self.inventory_table.item(row, 5)
+        if listing_id_item and listing_id_item.text():
+            self.listing_rows.pop(listing_id_item.text(), None)
         self.inventory_table.setItem(row, 3, QTableWidgetItem(""))
-        self.inventory_table.setCellWidget(row, 4, QWidget())
+        self.inventory_table.setItem(row, 4, QTableWidgetItem(""))  # Вместе с ценой убирается и подсказка
         self.inventory_table.setItem(row, 5, QTableWidgetItem(""))
         self.inventory_table.setItem(row, 7, QTableWidgetItem(""))
         self.inventory_table.setItem(row, 8, QTableWidgetItem(""))
@@ -1445,23 +1929,133 @@ class Tab1(QWidget):
         messages = []
         for (item_name, old_price, new_price), count in grouped_operations.items():
             if count > 1:
-                messages.append(f"{count}x {item_name} {old_price:.2f}$ → {new_price:.2f}$")
+                messages.append(f"{count}x {item_name} {old_price / 100:.2f}$ → {new_price / 100:.2f}$")
             else:
-                messages.append(f"{item_name} {old_price:.2f}$ → {new_price:.2f}$")
+                messages.append(f"{item_name} {old_price / 100:.2f}$ → {new_price / 100:.2f}$")
 
         final_message = "\n".join(messages)
         QMessageBox.information(self, "Price Change Confirmation", f"Price changed for items:\n{final_message}")
 
+    def unsold_rows(self, api_key, rows):
+        """Записи инвентаря без проданных лотов, которые Steam ещё не передал покупателю."""
+        sold = self.sold_assets.get(api_key)
+        return [row for row in rows if row[0] not in sold] if sold else rows
+
+    def steam_id_for(self, api_key):
+        user_info = self.user_infos.get(api_key)
+        return user_info.get("steam_id") if user_info else None
+
+    def account_snapshot(self, api_key):
+        """Состояние аккаунта для синхронизации: asset_id -> (listing_id, цена в центах)."""
+        snapshot = {}
+        for asset_id in self.inventory.account_assets(api_key):
+            listing_id = price = None
+            row = self.row_for_asset(asset_id)
+            if row is not None:
+                listing_id_item = self.inventory_table.item(row, 5)
+                price_value_item = self.inventory_table.item(row, 8)
+                if listing_id_item and listing_id_item.text():
+                    listing_id = listing_id_item.text()
+                    price = price_value_item.data(Qt.ItemDataRole.UserRole) if price_value_item else None
+            snapshot[asset_id] = (listing_id, price)
+        # Проданные предметы остаются в инвентаре до завершения обмена: без строки и лота, но и не новые
+        for asset_id in self.sold_assets.get(api_key, ()):
+            snapshot.setdefault(asset_id, (None, None))
+        return snapshot
+
+    @pyqtSlot(str, object)
+    def apply_account_delta(self, api_key, delta):
+        """Применяет к таблице только изменения аккаунта, найденные фоновой синхронизацией."""
+        self.stalls[api_key] = delta.stall
+        # Проданный предмет ушёл из инвентаря - отмечать его больше не нужно
+        self.sold_assets.get(api_key, set()).difference_update(delta.removed)
+        sorting_enabled = self.inventory_table.isSortingEnabled()
+        self.inventory_table.setSortingEnabled(False)
+        try:
+            # Проданные предметы: строки удаляются снизу вверх, чтобы номера не сдвигались
+            rows = [self.row_for_asset(asset_id) for asset_id in delta.removed]
+            for row in sorted((row for row in rows if row is not None), reverse=True):
+                self.inventory_table.removeRow(row)
+            for asset_id in delta.removed:
+                self.inventory.remove(asset_id)
+                self.stall_by_asset.pop(asset_id, None)
+
+            for asset_id in delta.unlisted:
+                self.stall_by_asset.pop(asset_id, None)
+                row = self.row_for_asset(asset_id)
+                if row is not None:
+                    self.update_item_as_unsold(row)
+
+            for stall_item in delta.listed:
+                asset_id = stall_item['item']['asset_id']
+                self.stall_by_asset[asset_id] = stall_item
+                row = self.row_for_asset(asset_id)
+                if row is not None:
+                    old_listing_item = self.inventory_table.item(row, 5)
+                    if old_listing_item and old_listing_item.text():
+                        self.listing_rows.pop(old_listing_item.text(), None)
+                    self.set_listing_cells(row, stall_item)
+
+            # Предметы, уже добавленные перезагрузкой таблицы, повторно не вставляются
+            added = self.inventory.add_items(
+                [raw for raw in delta.added if self.inventory.get(raw.get('asset_id')) is None], api_key)
+            for item in added:
+                self.add_inventory_row(item, self.stall_by_asset.get(item.asset_id))
+
+            self.refresh_days_on_sale(api_key)
+        finally:
+            self.inventory_table.setSortingEnabled(sorting_enabled)
+
+        self.filter_rows([item.asset_id for item in added] + [s['item']['asset_id'] for s in delta.listed] +
+                         list(delta.unlisted))
+        if sorting_enabled:
+            self.apply_last_sort()
+
+    @pyqtSlot(str, object, object)
+    def apply_listing_events(self, api_key, events, stall):
+        """Применяет события наблюдателя за лотами как изменения аккаунта."""
+        delta = AccountDelta(
+            removed=[event.asset_id for event in events if event.kind == SOLD],
+            added=[],
+            listed=[event.listing for event in events if event.kind in (PRICE_CHANGED, LISTED)],
+            unlisted=[event.asset_id for event in events if event.kind == DELISTED],
+            stall=stall,
+        )
+        self.apply_account_delta(api_key, delta)
+        # Запись удалена, но инвентарь вернёт предмет до завершения обмена; синхронизация не должна его добавить
+        self.sold_assets.setdefault(api_key, set()).update(delta.removed)
+
+    def refresh_days_on_sale(self, api_key):
+        """Пересчёт колонки "On sale" для лотов аккаунта."""
+        for asset_id in self.inventory.account_assets(api_key):
+            row = self.row_for_asset(asset_id)
+            if row is None:
+                continue
+            created_at_item = self.inventory_table.item(row, 7)
+            days_on_sale_item = self.inventory_table.item(row, 3)
+            if created_at_item and created_at_item.text() and days_on_sale_item:
+                days_on_sale_item.setText(calculate_days_on_sale(created_at_item.text()))
+
     def update_avatar(self):
         if not self.user_infos:
             return
 
         # Используем информацию из первого элемента списка, который соответствует дефолтному API ключу
-        user_info = next(info for info in self.user_infos if info['api_key'] == self.default_api_key)
-        avatar_url = user_info.get("avatar")
-        avatar_path = cache_image(avatar_url) if avatar_url else None
+        user_info = self.user_infos.get(self.default_api_key)
+        avatar_url = user_info.get("avatar") if user_info else None
+        if not avatar_url:
+            return
+        avatar_path = cached_image_path(avatar_url)
         if avatar_path:
-            self.avatar_info_button.setIcon(QIcon(avatar_path))
+            self.user_info_button.setIcon(QIcon(avatar_path))
+        else:
+            self.scheduler.run(self.download_image, avatar_url, lane=VISIBLE, on_result=self.handle_avatar_result)
+
+    @pyqtSlot(object)
+    def handle_avatar_result(self, result):
+        _, avatar_path = result
+        if avatar_path:
+            self.user_info_button.setIcon(QIcon(avatar_path))
 
     def show_user_info_dialog(self, title="Account Information"):
         dialog = QDialog(self)
@@ -1472,12 +2066,17 @@ class Tab1(QWidget):
 
         outer_layout = QHBoxLayout()
 
-        for user_info in self.user_infos:
+        # Показываются аккаунты, выбранные в списке аккаунтов
+        api_keys = [api_key for api_key in self.user_infos
+                    if self.selected_api_keys is None or api_key in self.selected_api_keys]
+
+        for api_key in api_keys:
+            user_info = self.user_infos[api_key]
             vertical_layout = QVBoxLayout()
 
-            # Аватар пользователя
+            # Аватар пользователя; не скачивается здесь, чтобы окно с сотнями аккаунтов открывалось сразу
             avatar_url = user_info.get("avatar")
-            avatar_path = cache_image(avatar_url) if avatar_url else None
+            avatar_path = cached_image_path(avatar_url)
             if avatar_path:
                 avatar_label = QLabel(self)
                 avatar_label.setFixedSize(100, 100)
@@ -1496,6 +2095,7 @@ class Tab1(QWidget):
                 value.setFont(label_font)
                 form_layout.addRow(label, value)
 
+            create_labeled_row("Account:", self.account_names.get(api_key, "N/A"))
             create_labeled_row("Steam ID:", user_info.get("steam_id", "N/A"))
             create_labeled_row("Username:", user_info.get("username", "N/A"))
             create_labeled_row("KYC:", user_info.get("know_your_customer", "N/A"))
@@ -1511,13 +2111,23 @@ class Tab1(QWidget):
             create_labeled_row("Total Verified Trades:", str(statistics.get("total_verified_trades", 0)))
             create_labeled_row("Total Trades:", str(statistics.get("total_trades", 0)))
 
-            total_exhibited = f"{sum(item['price'] for item in self.stall if item.get('user_id') == user_info.get('steam_id')) / 100:.2f}$"
+            total_exhibited = f"{sum(item['price'] for item in self.stalls.get(api_key, [])) / 100:.2f}$"
             create_labeled_row("Total Exhibited:", total_exhibited)
 
             vertical_layout.addLayout(form_layout)
             outer_layout.addLayout(vertical_layout)
 
-        layout.addLayout(outer_layout)
+        if len(api_keys) > 4:
+            # Много аккаунтов - горизонтальная прокрутка вместо окна шире экрана
+            container = QWidget()
+            container.setLayout(outer_layout)
+            scroll_area = QScrollArea(dialog)
+            scroll_area.setWidget(container)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setMinimumSize(900, container.sizeHint().height() + 30)
+            layout.addWidget(scroll_area)
+        else:
+            layout.addLayout(outer_layout)
         dialog.setLayout(layout)
         dialog.exec()
 
@@ -1,37 +1,26 @@
 # modules/ui_tab2.py
-from PyQt6.QtCore import Qt, QSettings, QSize, pyqtSlot
-from PyQt6.QtGui import QIcon, QPixmap
-from PyQt6.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QPushButton, QAbstractItemView, QHeaderView, QLabel, QCheckBox, QMessageBox, QHBoxLayout
+from PyQt6.QtCore import QSettings, QTimer, pyqtSlot
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QWidget, QTableView, QPushButton, QAbstractItemView, QHeaderView, QMessageBox, QFileDialog
 from modules.api import get_buy_orders, delete_order_by_id
-from modules.workers import ApiWorker
+from modules.accounts import accounts_from_keys
+from modules.bulk_orders import BulkOrderJob, read_order_file, validate_orders, write_report, job_paths
+from modules.buy_orders_model import BuyOrderRow, BuyOrdersModel
+from modules.catalog import get_catalog
+from modules.expressions import DescriptionCache, ExpressionError, summarize
+from modules.order_matcher import match_orders
+from modules.scheduler import TaskScheduler, INTERACTIVE, BACKGROUND, PREFETCH
 
 import os
-import re
+import csv
 import logging
 from datetime import datetime, timezone
-import pandas as pd
 from collections import defaultdict
 
 # Настройка логирования
 logging.basicConfig(filename='app.log', level=logging.ERROR,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Получение текущего каталога скрипта
-script_dir = os.path.dirname(os.path.abspath(__file__))
-
-# Конструирование путей к CSV файлам относительно каталога скрипта
-skins_csv_path = os.path.join(script_dir, '..', 'utils', 'skins_base.csv')
-stickers_csv_path = os.path.join(script_dir, '..', 'utils', 'stickers_base.csv')
-
-# Загрузка CSV файлов
-try:
-    skins_df = pd.read_csv(skins_csv_path)
-    stickers_df = pd.read_csv(stickers_csv_path)
-except Exception as e:
-    logging.error(f"Error loading CSV files: {str(e)}")
-    skins_df = pd.DataFrame()
-    stickers_df = pd.DataFrame()
-
 # Карта соответствия редкости
 rarity_map = {
     0: "Consumer (Common)",
@@ -44,17 +33,30 @@ rarity_map = {
 }
 
 class Tab2(QWidget):
-    def __init__(self, api_keys, icon_path, parent=None):
+    def __init__(self, api_keys, icon_path, parent=None, scheduler=None, inventory=None, accounts=None,
+                 daemon_client=None):
         super().__init__(parent)
         self.api_keys = api_keys
+        self.accounts = accounts or accounts_from_keys(api_keys)
         self.icon_path = icon_path
+        self.scheduler = scheduler or TaskScheduler(parent=self)
+        self.inventory = inventory  # ItemStore вкладки Inventory для сопоставления ордеров
+        self.daemon_client = daemon_client  # DaemonClient: ордера, уже загруженные процессом --daemon
 
         # Инициализация QSettings для хранения предпочтений
         self.settings = QSettings("MyCompany", "SteamInventoryApp")
 
-        # Загрузка CSV файлов в экземпляр класса
-        self.skins_df = skins_df
-        self.stickers_df = stickers_df
+        # Общий справочник скинов и стикеров
+        self.catalog = get_catalog()
+
+        # Описания ордеров, сохранённые между запусками; версия привязана к справочникам
+        self.description_cache = DescriptionCache(self.catalog.version)
+
+        # Кэш описаний записывается один раз после загрузки всех аккаунтов, а не после каждого
+        self.cache_save_timer = QTimer(self)
+        self.cache_save_timer.setSingleShot(True)
+        self.cache_save_timer.setInterval(2000)
+        self.cache_save_timer.timeout.connect(self.save_description_cache)
 
         # Инициализация UI
         self.initUI()
@@ -92,14 +94,60 @@ class Tab2(QWidget):
             }
         """)
 
+        # Создание и позиционирование кнопки "Match Inventory"
+        self.match_button = QPushButton("Match Inventory", self)
+        self.match_button.setFixedSize(150, 40)
+        self.match_button.move(380, 20)
+        self.match_button.clicked.connect(self.match_inventory)
+        self.match_button.setToolTip("Count inventory items on all accounts that match each order")
+        self.match_button.setStyleSheet("""
+            QPushButton {
+                border: 1px solid #D1B3FF;
+                border-radius: 5px;
+                background-color: #F0F0F0;
+            }
+            QPushButton:pressed {
+                background-color: #D1B3FF;
+            }
+        """)
+
+        # Создание и позиционирование кнопки "Import Orders"
+        self.import_button = QPushButton("Import Orders", self)
+        self.import_button.setFixedSize(150, 40)
+        self.import_button.move(560, 20)
+        self.import_button.clicked.connect(self.import_orders)
+        self.import_button.setToolTip("Create buy orders from a CSV or JSON file")
+        self.import_button.setStyleSheet("""
+            QPushButton {
+                border: 1px solid #D1B3FF;
+                border-radius: 5px;
+                background-color: #F0F0F0;
+            }
+            QPushButton:pressed {
+                background-color: #D1B3FF;
+            }
+        """)
+
+        # Иконка для колонки Lock
+        lock_icon_path = os.path.join(self.icon_path, 'lock.png')
+        lock_icon = None
+        if os.path.exists(lock_icon_path):
+            lock_icon = QIcon(lock_icon_path)
+        else:
+            logging.error(f"Lock icon not found at path: {lock_icon_path}")
+
+        # Модель ордеров (сортирует строки сама, по числовым ключам)
+        self.model = BuyOrdersModel(lock_icon, self)
+
         # Настройка таблицы и позиционирование её на форме
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["", "Order", "Qty", "Price", "Time", "Order ID", "API Key"])
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.setSortingEnabled(True)
         self.table.horizontalHeader().setSectionsClickable(True)
         self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.verticalHeader().setDefaultSectionSize(30)
 
         # Установка размера и позиции таблицы
         self.table.setFixedSize(730, 600)
@@ -109,21 +157,14 @@ class Tab2(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
         self.table.setColumnWidth(0, 24)  # Ширина колонки Lock (для чекбокса)
 
-        # Установка иконки для колонки Lock
-        lock_icon_path = os.path.join(self.icon_path, 'lock.png')
-        if os.path.exists(lock_icon_path):
-            lock_icon = QIcon(lock_icon_path)
-            self.table.horizontalHeaderItem(0).setIcon(lock_icon)
-        else:
-            logging.error(f"Lock icon not found at path: {lock_icon_path}")
-
         # Установка ширины остальных колонок
-        self.table.setColumnWidth(1, 530)  # Order
+        self.table.setColumnWidth(1, 480)  # Order
         self.table.setColumnWidth(2, 40)   # Qty
         self.table.setColumnWidth(3, 60)  # Price
         self.table.setColumnWidth(4, 50)  # Time
         self.table.setColumnWidth(5, 100)  # Order ID
         self.table.setColumnWidth(6, 100)  # API Key
+        self.table.setColumnWidth(7, 50)  # Matches
 
         # Скрытие колонок Order ID и API Key
         self.table.setColumnHidden(5, True)  # Order ID
@@ -133,66 +174,73 @@ class Tab2(QWidget):
         self.load_column_widths()
 
     def create_order_row(self, order, api_key):
-        """Создание строки ордера для таблицы."""
-        row = []
-
-        # Чекбокс блокировки
-        lock_checkbox = QCheckBox(self)
-        lock_checkbox.setStyleSheet("margin-left: 5px; margin-right: auto;")  # Выравнивание чекбокса влево
-        cell_widget = QWidget()
-        cell_layout = QHBoxLayout(cell_widget)
-        cell_layout.addWidget(lock_checkbox)
-        cell_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        cell_layout.setContentsMargins(0, 0, 0, 0)
-        row.append(cell_widget)
-
-        # Описание ордера
+        """Создание строки ордера для модели таблицы."""
+        has_error = False
         if 'expression' in order and order['expression']:
-            order_description = self.generate_item_name(order.get('expression'))
+            order_description, has_error = self.generate_item_name(order.get('expression'))
         elif 'market_hash_name' in order and order['market_hash_name']:
-            # Создание QLabel с [market_hash_name]
-            order_description = QLabel(f"[{order['market_hash_name']}]")
-            order_description.setFont(self.font())
-        else:
-            order_description = QLabel("Unknown Order")
-            order_description.setFont(self.font())
-
-        if isinstance(order_description, QWidget):
-            row.append(order_description)
+            order_description = f"[{order['market_hash_name']}]"
         else:
-            row.append(order_description)
+            order_description = "Unknown Order"
 
-        # Количество
-        qty = str(order.get("qty", 1))
-        row.append(qty)
-
-        # Цена
-        price = f"{order.get('price', 0) / 100:.2f}$"
-        row.append(price)
-
-        # Время
         created_at = order.get("created_at", "")
-        formatted_date = self.calculate_time_passed(created_at)
-        row.append(formatted_date)
+        age_seconds = self.calculate_age_seconds(created_at)
+
+        return BuyOrderRow(
+            description=order_description,
+            has_error=has_error,
+            qty=int(order.get("qty", 1)),
+            price=int(order.get('price', 0)),
+            age_seconds=age_seconds,
+            age_text=self.format_age(age_seconds),
+            order_id=order.get("id", ""),
+            api_key=api_key,
+            expression=order.get('expression') or "",
+            market_hash_name=order.get('market_hash_name') or ""
+        )
 
-        # Order ID (скрытый)
-        order_id = order.get("id", "")
-        row.append(order_id)
+    def load_buy_orders(self, scheduler=None, lane=BACKGROUND, use_daemon=False):
+        """
+        Асинхронная загрузка buy orders для всех API-ключей в указанной полосе планировщика.
+        use_daemon - сначала взять ордера из процесса --daemon (только при открытии вкладки:
+        после изменений ордера перечитываются из API).
+        """
+        if scheduler:
+            self.scheduler = scheduler
+        self.model.clear()  # Очистка таблицы перед добавлением новых строк
+
+        if use_daemon and self.daemon_client is not None:
+            self.scheduler.run(self.daemon_client.snapshot, list(self.api_keys), ["buy_orders"], lane=lane,
+                               on_result=self.handle_daemon_snapshot, on_error=self.handle_daemon_error)
+            return
+        self.fetch_accounts(self.api_keys, lane)
 
-        # API Key (скрытый)
-        row.append(api_key)
+    def fetch_accounts(self, api_keys, lane=BACKGROUND):
+        for api_key in api_keys:
+            self.scheduler.run(self.fetch_buy_orders, api_key, lane=lane, api_key=api_key,
+                               on_result=self.handle_buy_orders_result, on_error=self.handle_buy_orders_error)
 
-        return row
+    @pyqtSlot(object)
+    def handle_daemon_snapshot(self, snapshot):
+        missing = []
+        for api_key in self.api_keys:
+            buy_orders = (snapshot.get(api_key) or {}).get('buy_orders')
+            if buy_orders is None:
+                missing.append(api_key)
+            else:
+                self.handle_buy_orders_result({'api_key': api_key, 'buy_orders': buy_orders})
+        self.fetch_accounts(missing)
 
-    def load_buy_orders(self, threadpool):
-        """Асинхронная загрузка buy orders для всех API-ключей."""
-        self.table.setRowCount(0)  # Очистка таблицы перед добавлением новых строк
+    @pyqtSlot(tuple)
+    def handle_daemon_error(self, error):
+        e, _ = error
+        logging.error(f"Daemon Error: {str(e)}")
+        self.fetch_accounts(self.api_keys)
 
-        for api_key in self.api_keys:
-            worker = ApiWorker(self.fetch_buy_orders, api_key)
-            worker.signals.result.connect(self.handle_buy_orders_result)
-            worker.signals.error.connect(self.handle_buy_orders_error)
-            threadpool.start(worker)
+    def refresh_daemon(self):
+        """После изменения ордеров процесс --daemon перечитывает аккаунты."""
+        if self.daemon_client is not None:
+            self.scheduler.run(self.daemon_client.refresh, list(self.api_keys), lane=PREFETCH)
 
     def fetch_buy_orders(self, api_key):
         """Получение buy orders через API."""
@@ -206,27 +254,11 @@ class Tab2(QWidget):
         buy_orders = result.get('buy_orders')
 
         if buy_orders:
-            for order in buy_orders:
-                row = self.create_order_row(order, api_key)
-                self.table.insertRow(self.table.rowCount())
-                for j, cell in enumerate(row):
-                    if isinstance(cell, QWidget):
-                        self.table.setCellWidget(self.table.rowCount() - 1, j, cell)
-                    elif isinstance(cell, QLabel):
-                        # Для QLabel создаём отдельный QWidget и добавляем в ячейку
-                        container = QWidget()
-                        layout = QHBoxLayout(container)
-                        layout.addWidget(cell)
-                        layout.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                        layout.setContentsMargins(0, 0, 0, 0)
-                        self.table.setCellWidget(self.table.rowCount() - 1, j, container)
-                    else:
-                        item = QTableWidgetItem(cell)
-                        item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                        item.setFlags(item.flags() ^ Qt.ItemFlag.ItemIsEditable)  # Сделать ячейки только для чтения
-                        self.table.setItem(self.table.rowCount() - 1, j, item)
-                # Установка высоты строки
-                self.table.setRowHeight(self.table.rowCount() - 1, 30)
+            # Все строки аккаунта вставляются в модель одной операцией
+            rows = [self.create_order_row(order, api_key) for order in buy_orders]
+            self.model.append_orders(rows)
+            if self.description_cache.dirty:
+                self.cache_save_timer.start()
 
     @pyqtSlot(tuple)
     def handle_buy_orders_error(self, error):
@@ -253,44 +285,59 @@ class Tab2(QWidget):
         if confirm_delete == QMessageBox.StandardButton.No:
             return  # Отмена удаления пользователем
 
-        # Сбор индексов строк для удаления, отсортированных в обратном порядке
-        rows_to_delete = sorted([row.row() for row in selected_rows], reverse=True)
-
-        # Списки для отслеживания удаленных и защищенных ордеров
-        deleted_orders = []
+        orders_to_delete = []
         protected_orders = []
-
-        for row_index in rows_to_delete:
+        for index in selected_rows:
+            order = self.model.order_at(index.row())
+            if order.locked:
+                protected_orders.append(order.description)
+                logging.info(f"Order '{order.description}' is protected and cannot be deleted.")
+                continue  # Пропуск защищенного ордера
+            orders_to_delete.append((order.order_id, order.api_key))
+
+        self.start_deletion(orders_to_delete, self.handle_delete_selected_result, protected_orders)
+
+    def start_deletion(self, orders, on_result, skipped):
+        """Удаление ордеров в интерактивной полосе планировщика, без блокировки интерфейса."""
+        self.set_delete_buttons_enabled(False)
+        self.scheduler.run(self.run_delete_batch, orders, skipped, lane=INTERACTIVE,
+                           on_result=on_result, on_error=self.handle_delete_error)
+
+    def run_delete_batch(self, orders, skipped):
+        """Выполняется в потоке пула: удаление ордеров через API."""
+        deleted_orders = []
+        for order_id, api_key in orders:
             try:
-                # Получение чекбокса блокировки из колонки 0
-                lock_widget = self.table.cellWidget(row_index, 0)
-                lock_checkbox = None
-                if lock_widget:
-                    layout = lock_widget.layout()
-                    if layout:
-                        lock_checkbox = layout.itemAt(0).widget()
-
-                if lock_checkbox and lock_checkbox.isChecked():
-                    order_name = self.get_order_name(row_index)
-                    protected_orders.append(order_name)
-                    logging.info(f"Order '{order_name}' is protected and cannot be deleted.")
-                    continue  # Пропуск защищенного ордера
-
-                # Получение Order ID и API Key из скрытых колонок
-                order_id = self.table.item(row_index, 5).text()
-                api_key = self.table.item(row_index, 6).text()
-
                 # Пытаемся удалить ордер через API
                 success = delete_order_by_id(order_id, api_key)
 
                 if success:
                     deleted_orders.append(order_id)
-                    self.table.removeRow(row_index)
                     logging.info(f"Order '{order_id}' deleted successfully.")
                 else:
                     logging.error(f"Failed to delete order '{order_id}'.")
             except Exception as e:
-                logging.error(f"Error deleting order at row {row_index}: {str(e)}")
+                logging.error(f"Error deleting order '{order_id}': {str(e)}")
+        return {'deleted': deleted_orders, 'skipped': skipped}
+
+    def set_delete_buttons_enabled(self, enabled):
+        self.delete_button.setEnabled(enabled)
+        self.delete_all_button.setEnabled(enabled)
+
+    @pyqtSlot(tuple)
+    def handle_delete_error(self, error):
+        self.set_delete_buttons_enabled(True)
+        e, traceback_str = error
+        logging.error(f"Delete Error: {str(e)}\n{traceback_str}")
+        QMessageBox.critical(self, "Error", f"An error occurred while deleting orders: {str(e)}")
+
+    @pyqtSlot(object)
+    def handle_delete_selected_result(self, result):
+        self.set_delete_buttons_enabled(True)
+        self.refresh_daemon()
+        deleted_orders = result['deleted']
+        protected_orders = result['skipped']
+        self.model.remove_orders(deleted_orders)
 
         # Подготовка сообщений для пользователя
         if deleted_orders:
@@ -311,7 +358,7 @@ class Tab2(QWidget):
             QMessageBox.information(self, 'Deletion Result', 'No orders were deleted.')
 
     def delete_all_orders(self):
-        row_count = self.table.rowCount()
+        row_count = self.model.rowCount()
 
         # Проверка наличия ордеров
         if row_count == 0:
@@ -330,42 +377,25 @@ class Tab2(QWidget):
         if confirm_delete == QMessageBox.StandardButton.No:
             return  # Отмена удаления пользователем
 
-        # Списки для отслеживания удаленных и пропущенных ордеров
-        deleted_orders = []
+        # Проход по всем строкам модели
+        orders_to_delete = []
         skipped_orders = []
+        for order in self.model.rows:
+            if order.locked:
+                skipped_orders.append(order.description)
+                logging.info(f"Order '{order.description}' is locked, skipping deletion.")
+                continue
+            orders_to_delete.append((order.order_id, order.api_key))
 
-        # Проход по всем строкам таблицы с конца к началу
-        for row in range(row_count - 1, -1, -1):
-            try:
-                # Получение чекбокса блокировки из колонки 0
-                lock_widget = self.table.cellWidget(row, 0)
-                lock_checkbox = None
-                if lock_widget:
-                    layout = lock_widget.layout()
-                    if layout:
-                        lock_checkbox = layout.itemAt(0).widget()
-
-                if lock_checkbox and lock_checkbox.isChecked():
-                    order_name = self.get_order_name(row)
-                    skipped_orders.append(order_name)
-                    logging.info(f"Order '{order_name}' is locked, skipping deletion.")
-                    continue
-
-                # Получение Order ID и API Key из скрытых колонок
-                order_id = self.table.item(row, 5).text()
-                api_key = self.table.item(row, 6).text()
-
-                # Пытаемся удалить ордер через API
-                success = delete_order_by_id(order_id, api_key)
+        self.start_deletion(orders_to_delete, self.handle_delete_all_result, skipped_orders)
 
-                if success:
-                    deleted_orders.append(order_id)
-                    self.table.removeRow(row)
-                    logging.info(f"Order '{order_id}' deleted successfully.")
-                else:
-                    logging.error(f"Failed to delete order '{order_id}'.")
-            except Exception as e:
-                logging.error(f"Error deleting order at row {row}: {str(e)}")
+    @pyqtSlot(object)
+    def handle_delete_all_result(self, result):
+        self.set_delete_buttons_enabled(True)
+        self.refresh_daemon()
+        deleted_orders = result['deleted']
+        skipped_orders = result['skipped']
+        self.model.remove_orders(deleted_orders)
 
         # Подготовка сообщения для пользователя
         message = ""
@@ -379,65 +409,134 @@ class Tab2(QWidget):
         else:
             QMessageBox.information(self, 'Deletion Result', 'No orders were deleted.')
 
+    def import_orders(self):
+        """Массовое создание ордеров из файла: проверка, подтверждение и отправка в интерактивной полосе."""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Buy Orders", "", "Order files (*.csv *.json)")
+        if not path:
+            return
+        try:
+            rows = read_order_file(path)
+        except (OSError, ValueError, csv.Error) as e:
+            QMessageBox.critical(self, "Import Error", f"Unable to read {os.path.basename(path)}: {str(e)}")
+            return
+
+        requests, errors = validate_orders(rows, self.accounts, self.catalog)
+        state_path, report_path = job_paths(path)
+        job = BulkOrderJob(requests, state_path)
+        pending = sum(1 for request in requests if request.key not in job.created)
+
+        message = f"{pending} orders will be created."
+        if len(requests) > pending:
+            message += f"\n{len(requests) - pending} orders were created in a previous run and will be skipped."
+        if errors:
+            message += f"\n{len(errors)} rows are invalid and will be skipped:\n"
+            message += "\n".join(f"Line {line}: {error}" for line, error in errors[:10])
+            if len(errors) > 10:
+                message += f"\n...and {len(errors) - 10} more (see the report)"
+
+        # Без новых ордеров подтверждение не нужно: отчёт о пропусках пишется в потоке пула, как и при создании
+        if pending:
+            reply = QMessageBox.question(self, "Import Orders", message,
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+
+        self.import_button.setEnabled(False)
+        self.scheduler.run(self.run_import, job, errors, report_path, lane=INTERACTIVE,
+                           on_result=self.handle_import_result, on_error=self.handle_import_error)
+
+    def run_import(self, job, errors, report_path):
+        """Выполняется в потоке пула."""
+        results = job.run()
+        write_report(report_path, results, errors)
+        return {'results': results, 'invalid': len(errors), 'report_path': report_path}
+
+    @pyqtSlot(object)
+    def handle_import_result(self, result):
+        self.import_button.setEnabled(True)
+        self.refresh_daemon()
+        statuses = defaultdict(int)
+        for order_result in result['results']:
+            statuses[order_result.status] += 1
+
+        message = (f"Created: {statuses['created']}\nFailed: {statuses['failed']}\n"
+                   f"Skipped (already created): {statuses['skipped']}\nInvalid rows: {result['invalid']}\n\n"
+                   f"Report: {result['report_path']}")
+        if statuses['failed']:
+            message += "\n\nRun the import again with the same file to retry failed orders."
+        QMessageBox.information(self, "Import Orders", message)
+
+        if statuses['created']:
+            self.load_buy_orders()
+
+    @pyqtSlot(tuple)
+    def handle_import_error(self, error):
+        self.import_button.setEnabled(True)
+        e, traceback_str = error
+        logging.error(f"Import Orders Error: {str(e)}\n{traceback_str}")
+        QMessageBox.critical(self, "Import Orders Error", f"An error occurred while creating orders: {str(e)}")
+
+    def match_inventory(self):
+        """Сопоставление всех ордеров с инвентарём всех аккаунтов в интерактивной полосе."""
+        if self.inventory is None or not len(self.inventory):
+            QMessageBox.information(self, "Match Inventory", "Inventory is not loaded yet.")
+            return
+        if not self.model.rows:
+            return
+
+        orders = [(order.order_id, order.expression, order.market_hash_name) for order in self.model.rows]
+        items = list(self.inventory)
+        self.match_button.setEnabled(False)
+        self.scheduler.run(self.run_match, orders, items, lane=INTERACTIVE,
+                           on_result=self.handle_match_result, on_error=self.handle_match_error)
+
+    def run_match(self, orders, items):
+        """Выполняется в потоке пула."""
+        matches = match_orders(orders, items)
+        return {order_id: None if matched is None else (len(matched), tuple(item.name for item in matched))
+                for order_id, matched in matches.items()}
+
+    @pyqtSlot(object)
+    def handle_match_result(self, result):
+        self.match_button.setEnabled(True)
+        self.model.set_matches(result)
+
+    @pyqtSlot(tuple)
+    def handle_match_error(self, error):
+        self.match_button.setEnabled(True)
+        e, traceback_str = error
+        logging.error(f"Match Inventory Error: {str(e)}\n{traceback_str}")
+        QMessageBox.critical(self, "Match Inventory Error", f"An error occurred while matching orders: {str(e)}")
+
     def parse_expression(self, expression):
-        float_value_conditions = []
-        conditions = []
-        sticker_conditions = []
+        """Разбор выражения ордера за один проход (modules.expressions) в кортеж условий для описания."""
+        summary = summarize(expression)
         has_error = False
 
-        # Парсинг условий для FloatValue
-        float_value_match = re.findall(r"FloatValue\s*(<=?|>=?)\s*([\d.]+)", expression)
-        min_value = None
-        max_value = None
-        for operator, value in float_value_match:
-            value = float(value)
-            if operator in ('<', '<='):
-                max_value = value if max_value is None else min(max_value, value)
-            elif operator in ('>', '>='):
-                min_value = value if min_value is None else max(min_value, value)
-        if min_value is not None or max_value is not None:
-            float_value_conditions = [f"Float {min_value or 0} - {max_value or 1}"]
+        # Условия для FloatValue
+        if summary.float_min is not None or summary.float_max is not None:
+            float_value_conditions = [f"Float {summary.float_min or 0} - {summary.float_max or 1}"]
         else:
             float_value_conditions = []
 
-        # Парсинг условий для Item
-        item_matches = re.findall(r'Item\s*==\s*"([^"]+)"', expression)
-        if item_matches:
-            conditions.extend(item_matches)
-
-        # Парсинг пар DefIndex и PaintIndex
-        condition_matches = re.findall(r"\(DefIndex\s*==\s*(\d+)\s+and\s+PaintIndex\s*==\s*(\d+)\)", expression)
-        for def_index, paint_index in condition_matches:
-            conditions.append((int(def_index), int(paint_index)))
-
-        # Парсинг условий для стикеров
-        sticker_match = re.findall(r"HasSticker\((\d+),\s*(-?\d+),\s*(\d+)\)", expression)
-        if sticker_match:
-            for sticker_id, slot, qty in sticker_match:
-                sticker_name, _ = self.find_sticker_info(sticker_id)
-                if sticker_name:
-                    sticker_str = sticker_name
-                    if slot != '-1':
-                        sticker_str += f" Slot: {slot}"
-                    if int(qty) > 1:
-                        sticker_str += f" x {qty}"
-                    sticker_conditions.append(sticker_str)
-
-        # Парсинг условий для PaintSeed
-        seed_match = re.search(r"PaintSeed\s*==\s*(\d+)", expression)
-        seed_value = seed_match.group(1) if seed_match else None
-
-        # Парсинг условий для StatTrak
-        stattrak_match = re.search(r"StatTrak\s*==\s*true", expression)
-        stattrak_value = True if stattrak_match else False
-
-        # Парсинг условий для Souvenir
-        souvenir_match = re.search(r"Souvenir\s*==\s*true", expression)
-        souvenir_value = True if souvenir_match else False
-
-        # Парсинг условий для Rarity
-        rarity_match = re.search(r"Rarity\s*==\s*(\d+)", expression)
-        rarity_value = int(rarity_match.group(1)) if rarity_match else None
+        # Условия для Item и пары DefIndex/PaintIndex
+        conditions = list(summary.items) + list(summary.skins)
+
+        # Условия для стикеров
+        sticker_conditions = []
+        for sticker_id, slot, qty in summary.stickers:
+            sticker_name, _ = self.find_sticker_info(sticker_id)
+            if sticker_name:
+                sticker_str = sticker_name
+                if slot != -1:
+                    sticker_str += f" Slot: {slot}"
+                if qty > 1:
+                    sticker_str += f" x {qty}"
+                sticker_conditions.append(sticker_str)
+
+        stattrak_value = summary.stattrak
+        souvenir_value = summary.souvenir
+        rarity_value = summary.rarity
 
         # Проверка на противоречия
         if stattrak_value and souvenir_value:
@@ -446,33 +545,28 @@ class Tab2(QWidget):
             has_error = True
 
         return (float_value_conditions, conditions, sticker_conditions,
-                seed_value, stattrak_value, souvenir_value, rarity_value, has_error)
-
-    def generate_error_indicator(self, text):
-        """Генерация индикатора ошибки для некорректных ордеров."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-
-        error_label = QLabel("⚠️")
-        error_label.setStyleSheet("color: red;")
-        error_label.setToolTip("Order has conflicting attributes.")
+                summary.paint_seed, stattrak_value, souvenir_value, rarity_value, has_error)
 
-        description_label = QLabel(text)
-        description_label.setStyleSheet("color: red;")
-        description_label.setFont(self.font())
+    def generate_item_name(self, expression):
+        """Генерация описания предмета на основе выражения. Возвращает (описание, есть ли ошибка)."""
+        if not expression:
+            return None, False
 
-        layout.addWidget(error_label)
-        layout.addWidget(description_label)
+        cached = self.description_cache.get(expression)
+        if cached:
+            return cached
 
-        return widget
+        try:
+            description = self.build_item_name(expression)
+        except (ExpressionError, ValueError, TypeError) as e:
+            logging.error(f"Error parsing expression '{expression}': {str(e)}")
+            description = (expression, True)
 
-    def generate_item_name(self, expression):
-        """Генерация имени предмета на основе выражения"""
-        if not expression:
-            return None
+        self.description_cache.put(expression, *description)
+        return description
 
+    def build_item_name(self, expression):
+        """Построение описания (описание, есть ли ошибка) по разобранному выражению."""
         (float_value_conditions, conditions, sticker_conditions,
          seed_value, stattrak_value, souvenir_value,
          rarity_value, has_error) = self.parse_expression(expression)
@@ -514,84 +608,59 @@ class Tab2(QWidget):
 
         final_description = ' + '.join(filter(None, [header, item_part, sticker_part]))
 
-        if has_error:
-            return self.generate_error_indicator(final_description)
-
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-
-        app_font = self.font()
-
-        description_label = QLabel(final_description)
-        description_label.setFont(app_font)
-        layout.addWidget(description_label)
-
-        return widget
+        return final_description, has_error
 
     def find_skin_name(self, def_index=None, paint_index=None):
         """Поиск имени скина по DefIndex и PaintIndex."""
-        try:
-            if def_index is not None and paint_index is not None:
-                match = self.skins_df[(self.skins_df['DefIndex'] == def_index) &
-                                      (self.skins_df['PaintIndex'] == paint_index)]
-            elif def_index is not None:
-                match = self.skins_df[self.skins_df['DefIndex'] == def_index]
-            else:
-                match = pd.DataFrame()
-            if not match.empty:
-                return match.iloc[0]['Name']
-        except Exception as e:
-            logging.error(f"Error finding skin name with DefIndex={def_index} PaintIndex={paint_index}: {str(e)}")
-        return None
+        skin = self.catalog.skin(def_index, paint_index)
+        return skin.name if skin else None
 
     def find_sticker_info(self, sticker_id):
         """Поиск информации о стикере по его ID."""
-        try:
-            result = self.stickers_df[self.stickers_df['id'] == int(sticker_id)]
-            if not result.empty:
-                return result.iloc[0]['name'], result.iloc[0]['image']
-        except Exception as e:
-            logging.error(f"Error finding sticker info for ID={sticker_id}: {str(e)}")
+        sticker = self.catalog.sticker(sticker_id)
+        if sticker:
+            return sticker.name, sticker.image
         return None, None
 
     def get_order_name(self, row_index):
-        """Получение имени ордера из колонки 'Order'."""
-        order_widget = self.table.cellWidget(row_index, 1)
-        if order_widget:
-            # Предполагается, что виджет содержит QLabel с описанием
-            layout = order_widget.layout()
-            if layout:
-                label = layout.itemAt(0).widget()
-                if isinstance(label, QLabel):
-                    return label.text()
-        # Если виджет не используется, получить текст из QTableWidgetItem
-        order_item = self.table.item(row_index, 1)
-        return order_item.text() if order_item else "Unknown Order"
-
-    def calculate_time_passed(self, iso_date):
-        """Вычисление времени, прошедшего с момента создания ордера."""
+        """Получение имени ордера по строке модели."""
+        if 0 <= row_index < self.model.rowCount():
+            return self.model.order_at(row_index).description
+        return "Unknown Order"
+
+    def calculate_age_seconds(self, iso_date):
+        """Возраст ордера в секундах (ключ сортировки колонки Time), -1 если дата некорректна."""
         try:
             dt = datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-            delta = now - dt
-            return f"{delta.days}d {delta.seconds // 3600}h"
+            return int((datetime.now(timezone.utc) - dt).total_seconds())
         except Exception as e:
             logging.error(f"Error calculating time passed for date '{iso_date}': {str(e)}")
+            return -1
+
+    def format_age(self, age_seconds):
+        """Форматирование возраста в виде 'Xd Yh'."""
+        if age_seconds < 0:
             return "Unknown Time"
+        days, remainder = divmod(age_seconds, 86400)
+        return f"{days}d {remainder // 3600}h"
 
     def load_column_widths(self):
         """Load the saved column widths."""
-        for i in range(1, self.table.columnCount()):  # Start from 1 to skip the locked column
+        for i in range(1, self.model.columnCount()):  # Start from 1 to skip the locked column
             width = self.settings.value(f"tab2_column_width_{i}", type=int)
             if width:
                 self.table.setColumnWidth(i, width)
 
     def save_column_widths(self):
-        for i in range(self.table.columnCount()):
+        for i in range(self.model.columnCount()):
             self.settings.setValue(f"tab2_column_width_{i}", self.table.columnWidth(i))
 
+    def save_description_cache(self):
+        """Запись кэша описаний ордеров на диск (если есть новые описания)."""
+        self.cache_save_timer.stop()
+        self.description_cache.save()
+
     def closeEvent(self, event):
         self.save_column_widths()
+        self.save_description_cache()
         event.accept()
@@ -9,14 +9,21 @@ CACHE_DIR = "cache"
 if not os.path.exists(CACHE_DIR):
     os.makedirs(CACHE_DIR)
 
-def load_config():
+def load_config(path="config.json"):
     try:
-        with open("config.json", 'r') as file:
+        with open(path, 'r') as file:
             return json.load(file)
     except FileNotFoundError:
         print("Config file not found!")
         return None
 
+def cached_image_path(url):
+    """Путь к уже скачанной картинке или None, без обращения к сети."""
+    if not url:
+        return None
+    file_path = os.path.join(CACHE_DIR, url.split("/")[-1])
+    return file_path if os.path.exists(file_path) else None
+
 def cache_image(url):
     if not url:
         return None
@@ -0,0 +1,282 @@
+# modules/watcher.py
+import time
+import random
+import hashlib
+import logging
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from modules.api import get_stall_page, get_stall_data, get_listing
+from modules.scheduler import BACKGROUND
+
+WatcherSettings = namedtuple('WatcherSettings', 'enabled min_interval max_interval page_size full_every notify')
+
+# Событие изменения лота. listing - новый JSON лота (для LISTED и PRICE_CHANGED), иначе None
+ListingEvent = namedtuple('ListingEvent', 'kind api_key listing_id asset_id name old_price new_price listing')
+
+SOLD = "sold"
+DELISTED = "delisted"
+PRICE_CHANGED = "price_changed"
+LISTED = "listed"
+EVENT_KINDS = (SOLD, DELISTED, PRICE_CHANGED, LISTED)
+
+DEFAULT_MIN_INTERVAL = 15  # Интервал опроса сразу после изменения, секунды
+DEFAULT_MAX_INTERVAL = 120  # Предел интервала, пока ничего не меняется
+DEFAULT_PAGE_SIZE = 5
+DEFAULT_FULL_EVERY = 20  # Полная проверка stall раз в N опросов, даже если первая страница не изменилась
+BACKOFF = 1.5
+MIN_POLL_INTERVAL = 5
+
+
+def load_watcher_settings(config):
+    """Настройки наблюдателя за лотами из секции "watcher" конфигурации. По умолчанию выключен."""
+    watcher = (config or {}).get("watcher") or {}
+    try:
+        min_interval = max(float(watcher.get("min_interval", DEFAULT_MIN_INTERVAL)), MIN_POLL_INTERVAL)
+        max_interval = max(float(watcher.get("max_interval", DEFAULT_MAX_INTERVAL)), min_interval)
+        page_size = min(max(int(watcher.get("page_size", DEFAULT_PAGE_SIZE)), 1), 50)
+        full_every = max(int(watcher.get("full_every", DEFAULT_FULL_EVERY)), 1)
+    except (TypeError, ValueError):
+        logging.error(f"Invalid watcher settings: {watcher}")
+        min_interval, max_interval = DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL
+        page_size, full_every = DEFAULT_PAGE_SIZE, DEFAULT_FULL_EVERY
+
+    # "notify": true - уведомления только о продажах, список - о перечисленных событиях
+    notify = watcher.get("notify", True)
+    if notify is True:
+        notify = (SOLD,)
+    elif isinstance(notify, (list, tuple)):
+        notify = tuple(kind for kind in notify if kind in EVENT_KINDS)
+    else:
+        notify = ()
+    return WatcherSettings(bool(watcher.get("enabled", False)), min_interval, max_interval,
+                           page_size, full_every, notify)
+
+
+def page_signature(page):
+    """Хэш первой страницы stall: общее число лотов и пары (id, цена)."""
+    digest = hashlib.sha1(f"{page.get('total_count')};".encode('utf-8'))
+    for item in page.get('data', []):
+        digest.update(f"{item['id']}:{item['price']};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def diff_listings(api_key, listings, stall, states):
+    """
+    События между прошлым (listing_id -> лот) и новым состоянием stall.
+    states: listing_id пропавшего лота -> его "state" из API; продан только лот в состоянии "sold",
+    остальные пропавшие сняты с продажи. Предмет проданного лота остаётся в инвентаре Steam до
+    отправки обмена, поэтому инвентарь для этого не подходит.
+    """
+    events = []
+    current = {item['id']: item for item in stall}
+    for listing_id, old in listings.items():
+        new = current.get(listing_id)
+        asset_id = old['item']['asset_id']
+        name = old['item'].get('market_hash_name', asset_id)
+        if new is None:
+            kind = SOLD if states.get(listing_id) == "sold" else DELISTED
+            events.append(ListingEvent(kind, api_key, listing_id, asset_id, name, old['price'], None, None))
+        elif new['price'] != old['price']:
+            events.append(ListingEvent(PRICE_CHANGED, api_key, listing_id, asset_id, name,
+                                       old['price'], new['price'], new))
+    for listing_id, new in current.items():
+        if listing_id not in listings:
+            asset_id = new['item']['asset_id']
+            events.append(ListingEvent(LISTED, api_key, listing_id, asset_id,
+                                       new['item'].get('market_hash_name', asset_id), None, new['price'], new))
+    return events
+
+
+class ListingWatcher(QObject):
+    """
+    Частый и дешёвый опрос лотов аккаунтов.
+
+    Каждый опрос запрашивает первую страницу stall минимального размера (с If-None-Match, если сервер
+    вернул ETag) и сравнивает её хэш с прошлым. Полный stall и состояние пропавших лотов запрашиваются,
+    только если страница изменилась или подошла очередь полной проверки. Интервал аккаунта сбрасывается до
+    min_interval после изменения и растёт до max_interval, пока изменений нет.
+    """
+    listings_changed = pyqtSignal(str, object, object)  # api_key, список ListingEvent, новый stall
+
+    TICK_MS = 1000
+
+    def __init__(self, scheduler, settings, steam_id_for, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.settings = settings
+        self.steam_id_for = steam_id_for  # api_key -> steam_id или None
+
+        self.listings = {}  # api_key -> {listing_id: лот}; None - базового состояния ещё нет
+        self.signatures = {}
+        self.etags = {}
+        self.intervals = {}
+        self.next_due = {}
+        self.poll_counts = {}
+        self.in_flight = set()
+        # api_key -> {listing_id: (ожидаемое событие, цена, номер последнего начатого опроса)}
+        self.local_changes = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.TICK_MS)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self, stalls):
+        """Запуск. stalls: api_key -> уже загруженный stall (или None), служит базовым состоянием."""
+        now = time.monotonic()
+        for api_key, stall in stalls.items():
+            self.listings[api_key] = {item['id']: item for item in stall} if stall is not None else None
+            self.intervals[api_key] = self.settings.min_interval
+            self.next_due[api_key] = now + random.uniform(0, self.settings.min_interval)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    @pyqtSlot()
+    def tick(self):
+        now = time.monotonic()
+        for api_key, due in self.next_due.items():
+            if due > now or api_key in self.in_flight:
+                continue
+            steam_id = self.steam_id_for(api_key)
+            if not steam_id:
+                self.next_due[api_key] = now + self.settings.max_interval
+                continue
+
+            count = self.poll_counts.get(api_key, 0) + 1
+            self.poll_counts[api_key] = count
+            self.in_flight.add(api_key)
+            self.scheduler.run(self.poll_account, api_key, steam_id, self.listings.get(api_key),
+                               self.signatures.get(api_key), self.etags.get(api_key),
+                               count % self.settings.full_every == 0, count,
+                               lane=BACKGROUND, api_key=api_key,
+                               on_result=self.handle_result)
+
+    def poll_account(self, api_key, steam_id, listings, signature, etag, full_due, poll):
+        """Выполняется в потоке пула. Ошибка откладывает аккаунт до следующего опроса."""
+        try:
+            result = self.check_account(api_key, steam_id, listings, signature, etag, full_due,
+                                        self.settings.page_size)
+        except Exception as e:
+            logging.error(f"Listing Watcher Error: {str(e)}")
+            result = None
+        if result is None:
+            result = {'error': True}
+        result['api_key'] = api_key
+        result['poll'] = poll
+        return result
+
+    @staticmethod
+    def check_account(api_key, steam_id, listings, signature, etag, full_due, page_size):
+        """Запросы и сравнение. None при ошибке запроса."""
+        page = get_stall_page(api_key, steam_id, limit=page_size, etag=etag)
+        if page is None:
+            return None
+        if page['not_modified']:
+            new_signature = signature
+        else:
+            new_signature = page_signature(page)
+            etag = page['etag']
+
+        if listings is not None and new_signature == signature and not full_due:
+            return {'changed': False, 'etag': etag}
+
+        stall = get_stall_data(api_key, steam_id)
+        if stall is None:
+            return None
+
+        events = []
+        if listings is not None:
+            # Состояние пропавших лотов отличает продажу от снятия с продажи
+            current_ids = {item['id'] for item in stall}
+            states = {}
+            for listing_id in listings:
+                if listing_id not in current_ids:
+                    listing = get_listing(api_key, listing_id)
+                    if listing is None:
+                        return None
+                    states[listing_id] = listing.get('state')
+            events = diff_listings(api_key, listings, stall, states)
+
+        return {
+            'changed': bool(events),
+            'etag': etag,
+            'signature': new_signature,
+            'listings': {item['id']: item for item in stall},
+            'stall': stall,
+            'events': events,
+        }
+
+    @pyqtSlot(object)
+    def handle_result(self, result):
+        api_key = result['api_key']
+        self.in_flight.discard(api_key)
+
+        if result.get('error'):
+            interval = self.settings.max_interval
+        else:
+            self.etags[api_key] = result['etag']
+            if 'listings' in result:
+                self.signatures[api_key] = result['signature']
+                self.listings[api_key] = result['listings']
+            if result['changed']:
+                interval = self.settings.min_interval
+            else:
+                interval = min(self.intervals.get(api_key, self.settings.min_interval) * BACKOFF,
+                               self.settings.max_interval)
+        self.intervals[api_key] = interval
+        self.next_due[api_key] = time.monotonic() + interval
+
+        events = self.drop_local_events(api_key, result.get('events') or [], result['poll'])
+        if events:
+            self.listings_changed.emit(api_key, events, result['stall'])
+
+    @pyqtSlot(object)
+    def apply_local_changes(self, changes):
+        """
+        Лоты, изменённые самим приложением: [(api_key, listing_id, цена или None, asset_id, название)],
+        None - лот снят. Базовое состояние обновляется сразу, а события опросов об этих изменениях
+        не выдаются.
+        """
+        for api_key, listing_id, price, asset_id, name in changes:
+            listings = self.listings.get(api_key)
+            if listings is None:
+                continue  # Базовое состояние возьмётся из первого опроса
+            # Копия: прошлый словарь может читать поток опроса
+            listings = dict(listings)
+            old = listings.get(listing_id)
+            if price is None:
+                listings.pop(listing_id, None)
+                kind = DELISTED
+            elif old is not None:
+                listings[listing_id] = dict(old, price=price)
+                kind = PRICE_CHANGED
+            else:
+                listings[listing_id] = {'id': listing_id, 'price': price,
+                                        'item': {'asset_id': asset_id, 'market_hash_name': name}}
+                kind = LISTED
+            self.listings[api_key] = listings
+            self.local_changes.setdefault(api_key, {})[listing_id] = (kind, price, self.poll_counts.get(api_key, 0))
+
+    def drop_local_events(self, api_key, events, poll):
+        """
+        Убирает события, совпадающие с изменениями самого приложения. Опрос, начатый до изменения,
+        возвращает stall без него и снова подменяет базовое состояние, поэтому изменение ожидается
+        до конца первого опроса, начатого после него.
+        """
+        changes = self.local_changes.get(api_key)
+        if not changes:
+            return events
+        kept = []
+        for event in events:
+            kind, price, _ = changes.get(event.listing_id, (None, None, None))
+            if event.kind == kind and (kind != PRICE_CHANGED or event.new_price == price):
+                continue
+            kept.append(event)
+        for listing_id, (_, _, started) in list(changes.items()):
+            if poll > started:
+                del changes[listing_id]
+        return kept
@@ -0,0 +1,125 @@
+# tests/test_bulk_orders.py
+import csv
+import json
+
+import pytest
+
+from modules import bulk_orders
+from modules.accounts import Account
+from modules.bulk_orders import BulkOrderJob, job_paths, read_order_file, validate_orders, write_report
+from modules.catalog import Catalog, SkinInfo, StickerInfo
+from modules.rate_limit import RateLimiter
+
+ACCOUNTS = [Account("key-1", "Main", "", ()), Account("key-2", "Alt", "", ())]
+CATALOG = Catalog([SkinInfo("AK-47 | Redline", 4, 0.1, 0.7, 7, 282)], [StickerInfo(76, "Sticker | Titan", "")])
+
+
+def rows(*entries):
+    return list(enumerate(entries, start=2))
+
+
+def test_validate_orders_accepts_and_converts():
+    requests, errors = validate_orders(rows(
+        {"account": "main", "expression": "DefIndex == 7 and PaintIndex == 282 and HasSticker(76)", "price": "0.29"},
+        {"account": "key-2", "market_hash_name": "AK-47 | Redline (Field-Tested)", "price": "12.5", "qty": "3"},
+    ), ACCOUNTS, CATALOG)
+    assert errors == []
+    assert [(request.line, request.api_key, request.price, request.qty) for request in requests] == [
+        (2, "key-1", 29, 1), (3, "key-2", 1250, 3)]
+
+
+@pytest.mark.parametrize("row, error", [
+    ({"account": "nobody", "market_hash_name": "X", "price": "1"}, "Unknown account: nobody"),
+    ({"account": "", "market_hash_name": "X", "price": "1"}, "Unknown account: (empty)"),
+    ({"account": "Main", "price": "1"}, "Exactly one of expression or market_hash_name is required"),
+    ({"account": "Main", "expression": "StatTrak", "market_hash_name": "X", "price": "1"},
+     "Exactly one of expression or market_hash_name is required"),
+    ({"account": "Main", "expression": "FloatValue <", "price": "1"}, "Invalid expression"),
+    ({"account": "Main", "expression": "DefIndex == 1 and PaintIndex == 2", "price": "1"}, "Unknown skin"),
+    ({"account": "Main", "expression": "HasSticker(85)", "price": "1"}, "Unknown sticker 85"),
+    ({"account": "Main", "expression": "DefIndex == 7 and PaintIndex == 282 and FloatValue < 0.05", "price": "1"},
+     "below the minimum float"),
+    ({"account": "Main", "expression": "FloatValue > 0.3 and FloatValue < 0.2", "price": "1"}, "Empty float range"),
+    ({"account": "Main", "expression": "StatTrak and Souvenir", "price": "1"}, "conflicting attributes"),
+    ({"account": "Main", "market_hash_name": "X", "price": "cheap"}, "Price and qty must be numbers"),
+    ({"account": "Main", "market_hash_name": "X", "price": "0.02"}, "Price must be between"),
+    ({"account": "Main", "market_hash_name": "X", "price": "1", "qty": "0"}, "Qty must be between"),
+])
+def test_validate_orders_errors(row, error):
+    requests, errors = validate_orders(rows(row), ACCOUNTS, CATALOG)
+    assert requests == []
+    assert len(errors) == 1 and errors[0][0] == 2 and error in errors[0][1]
+
+
+def test_validate_orders_duplicate_rows_get_distinct_keys():
+    row = {"account": "Main", "market_hash_name": "X", "price": "1"}
+    requests, _ = validate_orders(rows(row, dict(row), dict(row, price="2")), ACCOUNTS, CATALOG)
+    assert len({request.key for request in requests}) == 3
+    # Ключи не зависят от номеров строк: файл можно дополнить и запустить снова
+    again, _ = validate_orders(rows(dict(row, price="2"), row, row), ACCOUNTS, CATALOG)
+    assert {request.key for request in again} == {request.key for request in requests}
+
+
+def test_job_resumes_after_failures(tmp_path, monkeypatch):
+    requests, _ = validate_orders(rows(*({"account": "Main", "market_hash_name": f"Item {number}", "price": "1"}
+                                         for number in range(4))), ACCOUNTS, CATALOG)
+    state_path = str(tmp_path / "orders.state.json")
+    calls = []
+    failing = {"Item 1", "Item 3"}
+
+    def create_buy_order(api_key, price, qty, expression=None, market_hash_name=None):
+        calls.append(market_hash_name)
+        if market_hash_name in failing:
+            raise ValueError("Server error")
+        return {"id": f"order-{market_hash_name[-1]}"}
+
+    monkeypatch.setattr(bulk_orders, "create_buy_order", create_buy_order)
+    results = BulkOrderJob(requests, state_path, rate_limiter=RateLimiter(rate=100)).run()
+    assert [(result.status, result.order_id) for result in results] == [
+        ("created", "order-0"), ("failed", ""), ("created", "order-2"), ("failed", "")]
+    with open(state_path, encoding='utf-8') as file:
+        assert sorted(json.load(file)["created"].values()) == ["order-0", "order-2"]
+
+    calls.clear()
+    failing.clear()
+    progress = []
+    results = BulkOrderJob(requests, state_path, rate_limiter=RateLimiter(rate=100)).run(
+        lambda done, total: progress.append((done, total)))
+    assert sorted(calls) == ["Item 1", "Item 3"]
+    assert [(result.status, result.order_id) for result in results] == [
+        ("skipped", "order-0"), ("created", "order-1"), ("skipped", "order-2"), ("created", "order-3")]
+    assert progress == [(1, 2), (2, 2)]
+
+
+def test_job_retries_rate_limited_orders(tmp_path, monkeypatch):
+    requests, _ = validate_orders(rows({"account": "Main", "market_hash_name": "X", "price": "1"}),
+                                  ACCOUNTS, CATALOG)
+    responses = [ValueError("Rate limited"), {"id": 7}]
+
+    def create_buy_order(*args, **kwargs):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(bulk_orders, "create_buy_order", create_buy_order)
+    monkeypatch.setattr(bulk_orders, "RETRY_DELAY", 0)
+    results = BulkOrderJob(requests, str(tmp_path / "state.json"), rate_limiter=RateLimiter(rate=100)).run()
+    assert [(result.status, result.order_id) for result in results] == [("created", "7")]
+
+
+def test_read_order_file_and_report(tmp_path):
+    source = tmp_path / "orders.csv"
+    source.write_text("account,market_hash_name,price,qty\nMain,X,1.5,2\nAlt,,1,1\n", encoding='utf-8')
+    json_source = tmp_path / "orders.json"
+    json_source.write_text(json.dumps({"orders": [{"account": "Main"}, "skip"]}), encoding='utf-8')
+    assert read_order_file(str(json_source)) == [(1, {"account": "Main"})]
+
+    requests, errors = validate_orders(read_order_file(str(source)), ACCOUNTS, CATALOG)
+    state_path, report_path = job_paths(str(source))
+    assert state_path.endswith("orders.state.json") and report_path.endswith("orders.report.csv")
+    write_report(report_path, [bulk_orders.OrderResult(requests[0], "created", "9", "")], errors)
+    with open(report_path, encoding='utf-8', newline='') as file:
+        report = list(csv.DictReader(file))
+    assert [(row["line"], row["status"], row["price"]) for row in report] == [("2", "created", "1.50"),
+                                                                              ("3", "invalid", "")]
@@ -0,0 +1,114 @@
+# tests/test_expressions.py
+import pytest
+
+from types import SimpleNamespace
+
+from modules.expressions import (And, Call, Compare, Not, Or, ExpressionError, DescriptionCache, compile_expression,
+                                 parse, summarize, tokenize)
+
+
+def test_tokenize_aliases_and_literals():
+    assert tokenize('FloatValue<0.07 && !StatTrak || Item == "AK-47 | \\"Redline\\""') == [
+        ('name', 'FloatValue'), ('op', '<'), ('number', 0.07), ('keyword', 'and'), ('keyword', 'not'),
+        ('name', 'StatTrak'), ('keyword', 'or'), ('name', 'Item'), ('op', '=='), ('string', 'AK-47 | "Redline"'),
+    ]
+
+
+def test_tokenize_rejects_unknown_characters():
+    with pytest.raises(ExpressionError):
+        tokenize("FloatValue < 0.07 $")
+
+
+def test_parse_precedence_and_flattening():
+    node = parse("DefIndex == 7 and PaintIndex == 474 or not StatTrak and (Rarity == 5 and FloatValue < 0.1)")
+    assert node == Or((
+        And((Compare('DefIndex', '==', 7), Compare('PaintIndex', '==', 474))),
+        And((Not(Compare('StatTrak', '==', True)), Compare('Rarity', '==', 5), Compare('FloatValue', '<', 0.1))),
+    ))
+
+
+def test_parse_mirrored_comparison_and_call():
+    assert parse("0.07 > FloatValue") == Compare('FloatValue', '<', 0.07)
+    assert parse("HasSticker(3942, -1, 2)") == Call('HasSticker', (3942, -1, 2))
+
+
+@pytest.mark.parametrize("expression", ["", "FloatValue <", "(StatTrak", "StatTrak)", "HasSticker(1,", "and"])
+def test_parse_syntax_errors(expression):
+    with pytest.raises(ExpressionError):
+        parse(expression)
+
+
+def test_summarize_conditions():
+    summary = summarize('(DefIndex == 7 and PaintIndex == 474 or DefIndex == 9 and PaintIndex == 344) and '
+                        'FloatValue >= 0.01 and FloatValue < 0.07 and HasSticker(3942, 1, 2) and HasSticker(76) and '
+                        'PaintSeed == 661 and StatTrak and Rarity == 5 and Item == "AWP | Dragon Lore"')
+    assert summary.skins == ((7, 474), (9, 344))
+    assert (summary.float_min, summary.float_max) == (0.01, 0.07)
+    assert summary.stickers == ((3942, 1, 2), (76, -1, 1))
+    assert summary.paint_seed == "661"
+    assert summary.stattrak and not summary.souvenir
+    assert summary.rarity == 5
+    assert summary.items == ("AWP | Dragon Lore",)
+
+
+def test_summarize_negated_flags_are_not_required():
+    summary = summarize("not StatTrak and not Souvenir")
+    assert not summary.stattrak and not summary.souvenir
+    assert summarize("not not StatTrak").stattrak
+
+
+def test_summarize_negated_comparison_is_inverted():
+    summary = summarize("FloatValue < 0.07 and not (FloatValue < 0.01)")
+    assert (summary.float_min, summary.float_max) == (0.01, 0.07)
+
+
+def test_summarize_skips_negated_groups():
+    summary = summarize("HasSticker(76) and not (DefIndex == 7 and PaintIndex == 474 or HasSticker(85))")
+    assert summary.skins == ()
+    assert summary.stickers == ((76, -1, 1),)
+
+
+@pytest.mark.parametrize("expression", ['DefIndex == "x" and PaintIndex == 1', 'HasSticker("a")',
+                                        'Rarity == "z"', 'FloatValue < "q"'])
+def test_summarize_invalid_values_raise_expression_error(expression):
+    with pytest.raises(ExpressionError):
+        summarize(expression)
+
+
+@pytest.mark.parametrize("expression, expected", [('StatTrak == "false"', False), ('StatTrak == "True"', True),
+                                                  ("StatTrak == false", False), ("StatTrak == 1", True)])
+def test_compile_boolean_literals(expression, expected):
+    predicate = compile_expression(expression).predicate
+    assert predicate(SimpleNamespace(stattrak=True)) is expected
+    assert summarize(expression).stattrak is expected
+
+
+@pytest.mark.parametrize("expression", ['StatTrak == "yes"', "Souvenir == 2", 'Souvenir == ""'])
+def test_compile_invalid_boolean_literals(expression):
+    with pytest.raises(ExpressionError):
+        compile_expression(expression)
+
+
+def test_description_cache_evicts_least_recently_used(tmp_path):
+    cache = DescriptionCache("v1", str(tmp_path / "descriptions.json"), max_entries=2)
+    cache.put("StatTrak", "[StatTrak]", False)
+    cache.put("Souvenir", "[Souvenir]", False)
+    assert cache.get("StatTrak") == ("[StatTrak]", False)
+    cache.put("Rarity == 5", "", False)
+    assert cache.get("Souvenir") is None
+    assert cache.get("StatTrak") == ("[StatTrak]", False)
+    assert len(cache.entries) == 2
+
+
+def test_description_cache_round_trip_and_limit(tmp_path):
+    path = str(tmp_path / "descriptions.json")
+    cache = DescriptionCache("v1", path)
+    for number in range(5):
+        cache.put(f"PaintSeed == {number}", f"seed {number}", False)
+    cache.save()
+    assert not cache.dirty
+
+    reloaded = DescriptionCache("v1", path, max_entries=3)
+    assert reloaded.get("PaintSeed == 1") is None
+    assert reloaded.get("PaintSeed == 4") == ("seed 4", False)
+    assert DescriptionCache("v2", path).entries == {}
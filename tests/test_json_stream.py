@@ -0,0 +1,55 @@
+# tests/test_json_stream.py
+import io
+import json
+
+import pytest
+
+from modules import json_stream
+from modules.json_stream import iter_array
+
+
+def stream(value):
+    return io.BytesIO(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+ITEMS = [{"asset_id": str(number), "market_hash_name": "Наклейка | Ω", "float_value": 0.123456789 * number,
+          "stickers": [{"slot": slot} for slot in range(number % 4)]} for number in range(50)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_iter_array_root_array(chunk_size):
+    assert list(iter_array(stream(ITEMS), chunk_size=chunk_size)) == ITEMS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64 * 1024])
+def test_iter_array_key_of_root_object(chunk_size):
+    data = {"count": 12345, "skip": {"data": [1]}, "data": ITEMS, "cursor": None}
+    assert list(iter_array(stream(data), "data", chunk_size=chunk_size)) == ITEMS
+
+
+def test_iter_array_numbers_split_between_chunks():
+    assert list(iter_array(io.BytesIO(b" [ 123456 , -7.5e3 ,0] "), chunk_size=2)) == [123456, -7500.0, 0]
+
+
+@pytest.mark.parametrize("data, key", [(b"[]", None), (b'{"data": []}', "data"), (b'{"other": [1]}', "data"),
+                                       (b'{"data": 5}', "data"), (b"{}", "data"), (b'{"data": [1]}', None),
+                                       (b"", None)])
+def test_iter_array_without_items(data, key):
+    assert list(iter_array(io.BytesIO(data), key)) == []
+
+
+@pytest.mark.parametrize("data", [b"[1, 2", b"[1 2]", b'{"data": [1,', b"[{]"])
+def test_iter_array_malformed_raises_value_error(data):
+    with pytest.raises(ValueError):
+        list(iter_array(io.BytesIO(data), "data", chunk_size=3))
+
+
+def test_loads_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_stream, "orjson", None)
+    assert json_stream.loads(b'{"a": [1, "\xd0\xb6"]}') == {"a": [1, "ж"]}
+    assert json_stream.load(io.BytesIO(b"[1.5]")) == [1.5]
+
+
+def test_loads_with_orjson():
+    pytest.importorskip("orjson")
+    assert json_stream.loads(b'{"a": [1, "\xd0\xb6"]}') == json.loads(b'{"a": [1, "\xd0\xb6"]}')
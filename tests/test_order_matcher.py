@@ -0,0 +1,67 @@
+# tests/test_order_matcher.py
+from modules.expressions import compile_expression
+from modules.item_store import ItemStore
+from modules.order_matcher import InventoryIndex, match_orders
+
+
+def item(asset_id, def_index, paint_index, float_value, name="AK-47 | Redline (Field-Tested)", seed=1, rarity=4,
+         stattrak=False, stickers=()):
+    return ItemStore.make_item({
+        "asset_id": asset_id, "market_hash_name": name, "def_index": def_index, "paint_index": paint_index,
+        "float_value": float_value, "paint_seed": seed, "rarity": rarity, "is_stattrak": stattrak,
+        "stickers": [{"stickerId": sticker_id, "slot": slot, "name": str(sticker_id)} for sticker_id, slot in stickers],
+    }, 0)
+
+
+ITEMS = [
+    item("1", 7, 282, 0.20),
+    item("2", 7, 282, 0.05, name="AK-47 | Redline (Minimal Wear)", stattrak=True, stickers=((76, 0), (76, 1))),
+    item("3", 9, 344, 0.01, name="AWP | Dragon Lore (Factory New)", seed=661, rarity=6, stickers=((76, 2),)),
+    item("4", 7, 44, 0.30, name="AK-47 | Case Hardened (Field-Tested)", seed=661, rarity=5),
+    item("5", 7, 282, None, name="AK-47 | Redline (Field-Tested)"),
+]
+
+
+def matched(expression=None, market_hash_name=None):
+    result = match_orders([("order", expression, market_hash_name)], ITEMS)["order"]
+    return None if result is None else sorted(found.asset_id for found in result)
+
+
+def test_match_by_skin_and_float():
+    assert matched("DefIndex == 7 and PaintIndex == 282") == ["1", "2", "5"]
+    assert matched("DefIndex == 7 and PaintIndex == 282 and FloatValue < 0.1") == ["2"]
+    assert matched("DefIndex == 7 and not (PaintIndex == 282)") == ["4"]
+
+
+def test_match_alternatives_and_flags():
+    assert matched("(DefIndex == 9 and PaintIndex == 344) or PaintSeed == 661") == ["3", "4"]
+    assert matched("DefIndex == 7 and StatTrak") == ["2"]
+    assert matched("DefIndex == 7 and not StatTrak and Rarity == 4") == ["1", "5"]
+
+
+def test_match_stickers():
+    assert matched("HasSticker(76)") == ["2", "3"]
+    assert matched("HasSticker(76, -1, 2)") == ["2"]
+    assert matched("HasSticker(76, 2)") == ["3"]
+    assert matched("HasSticker(85)") == []
+
+
+def test_match_market_hash_name():
+    assert matched(market_hash_name="AK-47 | Redline (Field-Tested)") == ["1", "5"]
+    assert matched(market_hash_name="M4A4 | Howl (Factory New)") == []
+    assert matched() == []
+
+
+def test_invalid_expression_is_none():
+    assert matched("FloatValue <") is None
+    assert matched("Unknown == 1") is None
+    assert matched('StatTrak == "maybe"') is None
+
+
+def test_index_matches_full_scan():
+    index = InventoryIndex(ITEMS)
+    for expression in ("DefIndex == 7 or HasSticker(76)", "PaintSeed == 661 and Rarity == 5", "FloatValue > 0.1",
+                       'Item == "AWP | Dragon Lore (Factory New)"'):
+        predicate = compile_expression(expression).predicate
+        assert sorted(found.asset_id for found in index.match(expression)) == sorted(
+            found.asset_id for found in ITEMS if predicate(found))
@@ -0,0 +1,74 @@
+# tests/test_repricing.py
+import pytest
+
+from modules.repricing import (Listing, Step, STATUS_ABOVE_MAX, STATUS_BELOW_MIN, STATUS_OK, STATUS_UNCHANGED,
+                               collection_key, parse_rules, reprice, to_cents)
+
+
+def listing(price, collection="Dust 2 Collection", rarity=3, listing_id="1"):
+    return Listing(listing_id, "a" + listing_id, "AK-47 | Redline", "key", price, collection, rarity)
+
+
+def new_prices(rules, *listings):
+    return [change.new_price for change in reprice(list(listings), parse_rules(rules))]
+
+
+@pytest.mark.parametrize("text, cents", [("0.29", 29), ("1", 100), ("12.5", 1250), ("0.295", 30),
+                                         ("-0.5", -50), ("+1.01", 101), (".07", 7)])
+def test_to_cents(text, cents):
+    assert to_cents(text) == cents
+
+
+def test_parse_rules_steps():
+    assert parse_rules('-2%; round .x9; min 1; collection:"Dust 2" *1.1; rarity:6 x0.95') == [
+        Step('multiply', 9800, None),
+        Step('round', (None, 9), None),
+        Step('min', 100, None),
+        Step('multiply', 11000, ('collection', "Dust 2")),
+        Step('multiply', 9500, ('rarity', 6)),
+    ]
+
+
+@pytest.mark.parametrize("rules", ["", " ; ", "round .9", "collection:X +1", "rarity:high *2", "max", "abc"])
+def test_parse_rules_invalid(rules):
+    with pytest.raises(ValueError):
+        parse_rules(rules)
+
+
+def test_set_add_and_percent():
+    assert new_prices("12.50", listing(1000)) == [1250]
+    assert new_prices("+1; -0.25", listing(1000)) == [1075]
+    assert new_prices("-2%", listing(1000), listing(333)) == [980, 326]
+    assert new_prices("+5%", listing(1999)) == [2099]
+
+
+def test_round_endings():
+    assert new_prices("round .x9", listing(1234), listing(1239)) == [1229, 1239]
+    assert new_prices("round .99", listing(1250), listing(1099)) == [1199, 1099]
+    # Цена ниже окончания не округляется до нуля
+    assert new_prices("round .99", listing(50)) == [50]
+
+
+def test_min_and_max():
+    assert new_prices("min 10; max 20", listing(500), listing(1500), listing(3000)) == [1000, 1500, 2000]
+
+
+def test_condition_multipliers():
+    listings = [listing(1000, "The Dust 2 Collection"), listing(1000, "Dust 2 Collection", rarity=6),
+                listing(1000, "Arms Deal 2 Collection"), listing(1000, "Arms Deal Collection")]
+    assert new_prices('collection:"dust 2" *1.1', *listings) == [1100, 1100, 1000, 1000]
+    assert new_prices('collection:"Arms Deal" *2', *listings) == [1000, 1000, 1000, 2000]
+    assert new_prices("rarity:6 *0.5", *listings) == [1000, 500, 1000, 1000]
+
+
+def test_collection_key():
+    assert collection_key("The  Dust 2 Collection") == collection_key("dust 2") == "dust 2"
+
+
+def test_reprice_statuses():
+    changes = reprice([listing(1000, listing_id="1"), listing(2, listing_id="2")], parse_rules("-20"))
+    assert [(change.new_price, change.status) for change in changes] == [(-1000, STATUS_BELOW_MIN),
+                                                                         (-1998, STATUS_BELOW_MIN)]
+    changes = reprice([listing(500), listing(1000)], parse_rules("max 10; 10"))
+    assert [change.status for change in changes] == [STATUS_OK, STATUS_UNCHANGED]
+    assert reprice([listing(1000)], parse_rules("*100000"))[0].status == STATUS_ABOVE_MAX
@@ -0,0 +1,48 @@
+# tests/test_sync.py
+from modules.sync import (compute_delta, load_sync_settings, stall_fingerprint, DEFAULT_INTERVAL, DEFAULT_JITTER,
+                          DEFAULT_INVENTORY_EVERY, MIN_INTERVAL)
+
+
+def stall_item(listing_id, asset_id, price):
+    return {"id": listing_id, "price": price, "item": {"asset_id": asset_id}}
+
+
+def test_compute_delta():
+    local = {
+        "kept": (None, None),
+        "listed": ("L1", 500),
+        "repriced": ("L2", 500),
+        "unlisted": ("L3", 500),
+        "sold": ("L4", 500),
+        "withdrawn": (None, None),
+        "new_listing": (None, None),
+    }
+    inventory = [{"asset_id": asset_id} for asset_id in ("kept", "listed", "repriced", "unlisted", "new_listing",
+                                                          "fresh")]
+    stall = [stall_item("L1", "listed", 500), stall_item("L2", "repriced", 650), stall_item("L9", "new_listing", 99)]
+    delta = compute_delta(local, inventory, stall)
+    assert sorted(delta.removed) == ["sold", "withdrawn"]
+    assert delta.added == [{"asset_id": "fresh"}]
+    assert [item["id"] for item in delta.listed] == ["L2", "L9"]
+    assert delta.unlisted == ["unlisted"]
+    assert delta.stall is stall
+
+
+def test_compute_delta_sold_item_still_in_inventory_is_not_added():
+    # Проданный предмет без строки в таблице передаётся как (None, None), пока Steam его возвращает
+    delta = compute_delta({"sold": (None, None)}, [{"asset_id": "sold"}], [])
+    assert (delta.removed, delta.added, delta.listed, delta.unlisted) == ([], [], [], [])
+    assert compute_delta({"sold": (None, None)}, [], []).removed == ["sold"]
+
+
+def test_stall_fingerprint_ignores_order():
+    first = [stall_item("1", "a", 100), stall_item("2", "b", 200)]
+    assert stall_fingerprint(first) == stall_fingerprint(first[::-1])
+    assert stall_fingerprint(first) != stall_fingerprint([stall_item("1", "a", 101), stall_item("2", "b", 200)])
+
+
+def test_load_sync_settings():
+    assert load_sync_settings(None) == (False, DEFAULT_INTERVAL, DEFAULT_JITTER, DEFAULT_INVENTORY_EVERY)
+    settings = load_sync_settings({"sync": {"enabled": True, "interval": 1, "jitter": 100, "inventory_every": 0}})
+    assert settings == (True, MIN_INTERVAL, MIN_INTERVAL / 2, 1)
+    assert load_sync_settings({"sync": {"interval": "often"}}).interval == DEFAULT_INTERVAL
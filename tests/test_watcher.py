@@ -0,0 +1,48 @@
+# tests/test_watcher.py
+from modules.watcher import (diff_listings, load_watcher_settings, page_signature, DELISTED, LISTED, PRICE_CHANGED,
+                             SOLD, MIN_POLL_INTERVAL)
+
+
+def listing(listing_id, asset_id, price, name="AK-47 | Redline"):
+    return {"id": listing_id, "price": price, "item": {"asset_id": asset_id, "market_hash_name": name}}
+
+
+def test_diff_listings_events():
+    old = {"1": listing("1", "a", 100), "2": listing("2", "b", 200), "3": listing("3", "c", 300),
+           "4": listing("4", "d", 400)}
+    stall = [listing("2", "b", 250), listing("4", "d", 400), listing("5", "e", 500)]
+    events = diff_listings("key", old, stall, {"1": "sold", "3": "delisted"})
+    assert [(event.kind, event.listing_id, event.old_price, event.new_price) for event in events] == [
+        (SOLD, "1", 100, None), (PRICE_CHANGED, "2", 200, 250), (DELISTED, "3", 300, None), (LISTED, "5", None, 500)]
+    assert events[1].listing is stall[0] and events[3].listing is stall[2]
+    assert all(event.api_key == "key" for event in events)
+    assert events[0].asset_id == "a" and events[0].name == "AK-47 | Redline"
+
+
+def test_diff_listings_unknown_state_is_not_a_sale():
+    # Состояние не получено (ошибка запроса) или лот уже не найден: продажа не предполагается
+    events = diff_listings("key", {"1": listing("1", "a", 100), "2": listing("2", "b", 100)}, [], {"1": None})
+    assert [event.kind for event in events] == [DELISTED, DELISTED]
+
+
+def test_diff_listings_without_changes():
+    stall = [listing("1", "a", 100)]
+    assert diff_listings("key", {"1": listing("1", "a", 100)}, stall, {}) == []
+
+
+def test_page_signature():
+    page = {"total_count": 2, "data": [listing("1", "a", 100), listing("2", "b", 200)]}
+    assert page_signature(page) == page_signature(dict(page))
+    assert page_signature(page) != page_signature(dict(page, total_count=3))
+    assert page_signature(page) != page_signature(dict(page, data=[listing("1", "a", 101), listing("2", "b", 200)]))
+
+
+def test_load_watcher_settings():
+    settings = load_watcher_settings({"watcher": {"enabled": True, "min_interval": 1, "max_interval": 2,
+                                                  "page_size": 500, "notify": ["sold", "listed", "bogus"]}})
+    assert settings.enabled
+    assert (settings.min_interval, settings.max_interval, settings.page_size) == (MIN_POLL_INTERVAL,
+                                                                                  MIN_POLL_INTERVAL, 50)
+    assert settings.notify == (SOLD, LISTED)
+    assert load_watcher_settings(None).notify == (SOLD,)
+    assert load_watcher_settings({"watcher": {"notify": False}}).notify == ()